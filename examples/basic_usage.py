@@ -25,18 +25,20 @@ def main():
     print("\n1. Submitting example jobs...")
     submitted_jobs = []
     
-    for package, priority, deps, est_time in jobs:
-        try:
-            job = queue.submit_job(
-                package_name=package,
-                priority=priority,
-                dependencies=deps,
-                estimated_time=est_time
-            )
-            submitted_jobs.append(job)
-            print(f"   ✓ Submitted {package} (ID: {job.id})")
-        except ValueError as e:
-            print(f"   ✗ Failed to submit {package}: {e}")
+    try:
+        submitted_jobs = queue.submit_jobs_bulk([
+            {
+                "package_name": package,
+                "priority": priority,
+                "dependencies": deps,
+                "estimated_time": est_time
+            }
+            for package, priority, deps, est_time in jobs
+        ])
+        for job in submitted_jobs:
+            print(f"   ✓ Submitted {job['package_name']} (ID: {job['id']})")
+    except ValueError as e:
+        print(f"   ✗ Failed to submit jobs: {e}")
     
     # Show queue status
     print("\n2. Current queue status:")
@@ -48,8 +50,8 @@ def main():
     print("\n3. Optimized execution order:")
     optimized = queue.get_optimized_queue_order()
     for i, job in enumerate(optimized, 1):
-        deps = ", ".join(job.dependencies_list) if job.dependencies_list else "none"
-        print(f"   {i}. {job.package_name} (deps: {deps})")
+        deps = ", ".join(job['dependencies_list']) if job['dependencies_list'] else "none"
+        print(f"   {i}. {job['package_name']} (deps: {deps})")
     
     # Check for issues
     print("\n4. Dependency analysis:")
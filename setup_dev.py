@@ -8,10 +8,11 @@ import sys
 import os
 
 def run_command(cmd, description):
-    """Run a command and print status."""
+    """Run a command (given as an argv list) and print status."""
     print(f">>> {description}")
-    result = subprocess.run(cmd, shell=True)
-    if result.returncode != 0:
+    try:
+        subprocess.run(cmd, check=True)
+    except (subprocess.CalledProcessError, OSError):
         print(f"ERROR: {description} failed!")
         sys.exit(1)
     print()
@@ -20,11 +21,12 @@ def main():
     """Set up development environment."""
     print("=== Spack Installer API Development Setup ===\n")
     
-    # Install package in development mode
-    run_command("pip install -e .", "Installing package in development mode")
+    # Install package in development mode. The two pip runs resolve into
+    # the same site-packages, so they must not run at the same time.
+    run_command([sys.executable, "-m", "pip", "install", "-e", "."], "Installing package in development mode")
     
     # Install development dependencies
-    run_command("pip install -r requirements-dev.txt", "Installing development dependencies")
+    run_command([sys.executable, "-m", "pip", "install", "-r", "requirements-dev.txt"], "Installing development dependencies")
     
     # Create database directory
     db_dir = os.path.expanduser("~/.spack_installer")
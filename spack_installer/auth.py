@@ -8,25 +8,117 @@ import os
 import grp
 import pwd
 import sys
-from typing import List, Optional
+import time
+import functools
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-from colorama import Fore, Style
 
 from .config import config
 
 # The required Unix group for authorization
 REQUIRED_GROUP = "swinstaller"
 
+# Seconds a cached group lookup stays valid
+GROUP_CACHE_TTL = 60
 
+# Result of authenticate_user() for this process
+_auth_cache: Optional[bool] = None
+
+
+@functools.lru_cache(maxsize=1)
 def get_current_user() -> str:
     """Get the username of the current user.
     
+    The lookup is cached since a process's uid does not change.
+    
     Returns:
         The current username
     """
     return pwd.getpwuid(os.getuid()).pw_name
 
 
+@functools.lru_cache(maxsize=128)
+def _groups_for(username: str, ttl_bucket: int) -> tuple:
+    """Look up the groups for a user, cached per TTL bucket.
+    
+    Args:
+        username: The username to look up
+        ttl_bucket: Time bucket used to expire cached entries
+        
+    Returns:
+        Tuple of group names, primary group first
+    """
+    # Get the user's primary group
+    user_info = pwd.getpwnam(username)
+    primary_gid = user_info.pw_gid
+    primary_group = _group_name(primary_gid)
+    groups = [primary_group]
+    
+    # Ask NSS for the full membership list in one call
+    try:
+        gids = os.getgrouplist(username, primary_gid)
+    except OSError:
+        gids = None
+    
+    if gids is not None:
+        for gid in gids:
+            try:
+                name = _group_name(gid)
+            except KeyError:
+                # Group ID without a name entry
+                continue
+            if name not in groups:
+                groups.append(name)
+        return tuple(groups)
+    
+    # Fall back to the member index built from every group entry
+    for name in _member_index(ttl_bucket).get(username, ()):
+        if name not in groups:
+            groups.append(name)
+    
+    return tuple(groups)
+
+
+@functools.lru_cache(maxsize=1)
+def _member_index(ttl_bucket: int) -> Dict[str, Tuple[str, ...]]:
+    """Build a map of username to supplementary group names.
+    
+    Scans the group database once per TTL bucket so lookups for any
+    user are a single dict access.
+    
+    Args:
+        ttl_bucket: Time bucket used to expire the index
+        
+    Returns:
+        Dict mapping each listed member to the names of their groups
+    """
+    index: Dict[str, List[str]] = {}
+    for group in grp.getgrall():
+        for member in group.gr_mem:
+            index.setdefault(member, []).append(group.gr_name)
+    return {member: tuple(names) for member, names in index.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _group_name(gid: int) -> str:
+    """Resolve a group ID to its name.
+    
+    Args:
+        gid: The group ID
+        
+    Returns:
+        The group name
+    """
+    return grp.getgrgid(gid).gr_name
+
+
+def clear_group_cache() -> None:
+    """Drop all cached group lookups."""
+    _groups_for.cache_clear()
+    _group_name.cache_clear()
+    _member_index.cache_clear()
+
+
 def get_user_groups(username: Optional[str] = None) -> List[str]:
     """Get all groups a user belongs to.
     
@@ -39,18 +131,7 @@ def get_user_groups(username: Optional[str] = None) -> List[str]:
     if username is None:
         username = get_current_user()
     
-    # Get the user's primary group
-    user_info = pwd.getpwnam(username)
-    primary_gid = user_info.pw_gid
-    primary_group = grp.getgrgid(primary_gid).gr_name
-    
-    # Get all groups the user belongs to
-    groups = [primary_group]
-    for group in grp.getgrall():
-        if username in group.gr_mem and group.gr_name not in groups:
-            groups.append(group.gr_name)
-    
-    return groups
+    return list(_groups_for(username, int(time.time() // GROUP_CACHE_TTL)))
 
 
 def user_in_group(group_name: str, username: Optional[str] = None) -> bool:
@@ -63,8 +144,15 @@ def user_in_group(group_name: str, username: Optional[str] = None) -> bool:
     Returns:
         True if the user is in the group, False otherwise
     """
+    if username is None:
+        username = get_current_user()
+    
     try:
-        return group_name in get_user_groups(username)
+        group = grp.getgrnam(group_name)
+        if username in group.gr_mem:
+            return True
+        # Members whose primary group this is are not listed in gr_mem
+        return pwd.getpwnam(username).pw_gid == group.gr_gid
     except (KeyError, ValueError):
         return False
 
@@ -78,43 +166,91 @@ def user_has_db_access(username: Optional[str] = None) -> bool:
     Returns:
         True if the user has read/write access, False otherwise
     """
-    db_path = Path(config.get_multi_user_database_path())
+    return _check_db_access(Path(config.MULTI_USER_DATABASE_PATH))
+
+
+def _check_db_access(db_path: Path) -> bool:
+    """Check read/write access to the database at the given path.
+    
+    Uses access(), so the check is made for the real uid/gids and honours
+    ACLs and read-only mounts, exactly as the kernel would.
     
-    # Check if the database file exists
+    Args:
+        db_path: Path to the database file
+        
+    Returns:
+        True if the database is readable and writable, False otherwise
+    """
     if not db_path.exists():
         # Check if the parent directory exists and is writable
-        parent_dir = db_path.parent
-        if not parent_dir.exists():
-            return False
-        return os.access(parent_dir, os.W_OK)
+        return os.access(db_path.parent, os.W_OK)
     
     # If the database file exists, check if it's readable and writable
     return os.access(db_path, os.R_OK | os.W_OK)
 
 
+def invalidate_auth_cache() -> None:
+    """Forget the memoized authenticate_user() result."""
+    global _auth_cache
+    _auth_cache = None
+
+
 def authenticate_user() -> bool:
     """Authenticate the current user.
     
     Checks that the user is a member of the required group and has
-    access to the database.
+    access to the database. The result is memoized for the lifetime of
+    the process; call invalidate_auth_cache() to force a re-check.
     
     Returns:
         True if the user is authenticated, False otherwise
     """
+    global _auth_cache
+    if _auth_cache is not None:
+        return _auth_cache
+    
+    _auth_cache = _authenticate_user()
+    return _auth_cache
+
+
+def _authenticate_user() -> bool:
+    """Run the authentication checks for the current user."""
     username = get_current_user()
     
     # Check group membership
     if not user_in_group(REQUIRED_GROUP, username):
-        print(f"{Fore.RED}Error:{Style.RESET_ALL} User '{username}' is not a member of the required group '{REQUIRED_GROUP}'")
-        print(f"Please contact your system administrator to be added to the '{REQUIRED_GROUP}' group.")
+        print(_error_templates()[0].format(user=username))
         return False
     
     # Check database access
-    if not user_has_db_access(username):
-        db_path = config.get_multi_user_database_path()
-        print(f"{Fore.RED}Error:{Style.RESET_ALL} User '{username}' does not have read/write access to the database:")
-        print(f"  {db_path}")
-        print("Please contact your system administrator to fix permissions.")
+    db_path = Path(config.MULTI_USER_DATABASE_PATH)
+    if not _check_db_access(db_path):
+        print(_error_templates()[1].format(user=username, db_path=db_path))
         return False
     
     return True
+
+
+@functools.lru_cache(maxsize=1)
+def _error_templates() -> Tuple[str, str]:
+    """Build the authentication error messages once.
+    
+    colorama is imported here rather than at module load so successful
+    authentication never pays for it.
+    
+    Returns:
+        Tuple of (group error template, database access error template)
+    """
+    from colorama import Fore, Style
+    
+    prefix = f"{Fore.RED}Error:{Style.RESET_ALL}"
+    group_error = (
+        f"{prefix} User '{{user}}' is not a member of the required group '{REQUIRED_GROUP}'\n"
+        f"Please contact your system administrator to be added to the '{REQUIRED_GROUP}' group."
+    )
+    db_error = (
+        f"{prefix} User '{{user}}' does not have read/write access to the database:\n"
+        "  {db_path}\n"
+        "Please contact your system administrator to fix permissions."
+    )
+    return group_error, db_error
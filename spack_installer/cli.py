@@ -2,22 +2,60 @@
 
 import click
 import os
+import re
 import sys
-import os
-from datetime import datetime
-from tabulate import tabulate
+import subprocess
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 from colorama import init, Fore, Style
-from .queue_manager import QueueManager
-from .models import JobPriority, JobStatus
-from .worker import start_worker, stop_worker, get_worker_status
 from .config import config
 from .auth import authenticate_user, get_current_user, REQUIRED_GROUP
 
-# Initialize colorama for cross-platform colored output
-init()
+if TYPE_CHECKING:
+    from .enums import JobStatus
+    from .queue_manager import QueueManager
 
-# Global queue manager instance
-queue_manager = QueueManager()
+# Only color output going to a terminal, and honor https://no-color.org
+_USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+
+# Initialize colorama for cross-platform colored output
+init(strip=not _USE_COLOR)
+
+# Color codes used by the CLI, resolved once: the real escapes when color
+# is enabled, empty strings otherwise
+_C = SimpleNamespace(
+    RED=Fore.RED,
+    GREEN=Fore.GREEN,
+    YELLOW=Fore.YELLOW,
+    BLUE=Fore.BLUE,
+    MAGENTA=Fore.MAGENTA,
+    CYAN=Fore.CYAN,
+    RESET_ALL=Style.RESET_ALL
+) if _USE_COLOR else SimpleNamespace(
+    RED="", GREEN="", YELLOW="", BLUE="", MAGENTA="", CYAN="", RESET_ALL=""
+)
+
+# Global queue manager instance, created on first use so that commands
+# which never touch the database (--help, --version, completion) do not
+# pay for importing it
+queue_manager = None
+
+# Seconds between checks for new log entries with `logs --follow`
+LOG_FOLLOW_INTERVAL = 2.0
+
+# Job states in which `logs --follow` keeps waiting for more output
+_ACTIVE_STATUSES = frozenset({"pending", "running"})
+
+
+def get_queue_manager() -> "QueueManager":
+    """Return the shared queue manager, creating it on first use."""
+    global queue_manager
+    if queue_manager is None:
+        from .queue_manager import QueueManager
+        queue_manager = QueueManager()
+    return queue_manager
 
 
 def format_duration(seconds: float) -> str:
@@ -39,43 +77,142 @@ def format_timestamp(timestamp) -> str:
     if isinstance(timestamp, datetime):
         return timestamp.strftime("%Y-%m-%d %H:%M:%S")
     
-    # Handle ISO string timestamps from JSON
+    # Handle ISO string timestamps from JSON. The first 19 characters of an
+    # ISO-8601 timestamp are already the date and time we display, so slice
+    # them rather than parsing into a datetime and formatting back out.
     if isinstance(timestamp, str):
-        try:
-            # Parse ISO format string back to datetime
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except (ValueError, AttributeError):
-            # If parsing fails, return the string as-is
-            return str(timestamp)
+        return timestamp[:19].replace('T', ' ')
     
     return "N/A"
 
 
-def format_status(status: JobStatus) -> str:
+def format_dependencies(dependencies, width: int = 30) -> str:
+    """Format a dependency list for a table cell, truncated to ``width``."""
+    if not dependencies:
+        return "None"
+    deps = ", ".join(dependencies)
+    return deps[:width] + "..." if len(deps) > width else deps
+
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _visible_len(text: str) -> int:
+    """Length of a cell as displayed, ignoring ANSI color codes."""
+    if "\x1b" in text:
+        return len(_ANSI_ESCAPE.sub("", text))
+    return len(text)
+
+
+def _render_grid(headers, rows) -> str:
+    """Render rows as a boxed grid table.
+
+    Produces the same layout as ``tabulate(..., tablefmt="grid")`` for the
+    simple tables the CLI prints, in a single pass over the cells.
+
+    Args:
+        headers: Column titles
+        rows: List of rows, each a list of cell values
+
+    Returns:
+        The rendered table without a trailing newline
+    """
+    # Numeric columns are right-aligned, everything else left-aligned
+    numeric = [
+        bool(rows) and all(isinstance(row[i], (int, float)) for row in rows)
+        for i in range(len(headers))
+    ]
+    cells = [[str(cell) for cell in row] for row in rows]
+    widths = [len(header) for header in headers]
+    for row in cells:
+        for i, cell in enumerate(row):
+            cell_len = _visible_len(cell)
+            if cell_len > widths[i]:
+                widths[i] = cell_len
+    
+    def render_row(row):
+        parts = []
+        for cell, width, right in zip(row, widths, numeric):
+            pad = " " * (width - _visible_len(cell))
+            parts.append(f" {pad}{cell} " if right else f" {cell}{pad} ")
+        return "|" + "|".join(parts) + "|"
+    
+    sep = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    header_sep = "+" + "+".join("=" * (w + 2) for w in widths) + "+"
+    lines = [sep, render_row(headers), header_sep]
+    for row in cells:
+        lines.append(render_row(row))
+        lines.append(sep)
+    return "\n".join(lines)
+
+
+# Fully rendered, colored labels for each job status and log level
+_STATUS_COLORS = {
+    "pending": _C.YELLOW,
+    "running": _C.BLUE,
+    "completed": _C.GREEN,
+    "failed": _C.RED,
+    "cancelled": _C.MAGENTA
+}
+_STATUS_LABELS = {
+    status: f"{color}{status.upper()}{_C.RESET_ALL}"
+    for status, color in _STATUS_COLORS.items()
+}
+_LOG_LEVEL_LABELS = {
+    level: f"{color}[{level}]{_C.RESET_ALL}"
+    for level, color in (("INFO", _C.GREEN), ("WARNING", _C.YELLOW), ("ERROR", _C.RED))
+}
+
+
+def format_status(status: "JobStatus") -> str:
     """Format job status with colors."""
-    colors = {
-        JobStatus.PENDING: Fore.YELLOW,
-        JobStatus.RUNNING: Fore.BLUE,
-        JobStatus.COMPLETED: Fore.GREEN,
-        JobStatus.FAILED: Fore.RED,
-        JobStatus.CANCELLED: Fore.MAGENTA
-    }
-    color = colors.get(status, "")
-    return f"{color}{status.value.upper()}{Style.RESET_ALL}"
+    return format_status_string(status.value)
 
 
 def format_status_string(status_str: str) -> str:
     """Format job status string with colors."""
-    colors = {
-        "pending": Fore.YELLOW,
-        "running": Fore.BLUE,
-        "completed": Fore.GREEN,
-        "failed": Fore.RED,
-        "cancelled": Fore.MAGENTA
-    }
-    color = colors.get(status_str, "")
-    return f"{color}{status_str.upper()}{Style.RESET_ALL}"
+    label = _STATUS_LABELS.get(status_str)
+    if label is None:
+        label = f"{status_str.upper()}{_C.RESET_ALL}"
+    return label
+
+
+def format_log_level(level: str) -> str:
+    """Format a log level tag with colors."""
+    label = _LOG_LEVEL_LABELS.get(level)
+    if label is None:
+        label = f"[{level}]{_C.RESET_ALL}"
+    return label
+
+
+class OutputBuffer:
+    """Collect command output and write it with a single click.echo call.
+    
+    click.echo writes and flushes on every call; commands that print many
+    lines append them here instead so they reach stdout in one write.
+    Buffered output is flushed on exit from the ``with`` block, including
+    when an exception is raised, so it always precedes error messages.
+    """
+    
+    def __init__(self):
+        self.lines = []
+    
+    def echo(self, message: str = "") -> None:
+        """Queue a line of output."""
+        self.lines.append(message)
+    
+    def flush(self) -> None:
+        """Write all queued output."""
+        if self.lines:
+            lines, self.lines = self.lines, []
+            click.echo("\n".join(lines))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        return False
 
 
 @click.group()
@@ -100,7 +237,7 @@ def main():
 def auth_status():
     """Check your authentication status."""
     username = get_current_user()
-    click.echo(f"\n{Fore.CYAN}=== Authentication Status ==={Style.RESET_ALL}")
+    click.echo(f"\n{_C.CYAN}=== Authentication Status ==={_C.RESET_ALL}")
     click.echo(f"Current user: {username}")
     
     # Check group membership
@@ -108,28 +245,28 @@ def auth_status():
     is_in_group = user_in_group(REQUIRED_GROUP)
     
     if is_in_group:
-        click.echo(f"Group membership: {Fore.GREEN}✓{Style.RESET_ALL} User is a member of the required '{REQUIRED_GROUP}' group")
+        click.echo(f"Group membership: {_C.GREEN}✓{_C.RESET_ALL} User is a member of the required '{REQUIRED_GROUP}' group")
     else:
-        click.echo(f"Group membership: {Fore.RED}✗{Style.RESET_ALL} User is NOT a member of the required '{REQUIRED_GROUP}' group")
+        click.echo(f"Group membership: {_C.RED}✗{_C.RESET_ALL} User is NOT a member of the required '{REQUIRED_GROUP}' group")
         click.echo(f"  → Contact your system administrator to be added to the '{REQUIRED_GROUP}' group")
     
     # Check database access
     has_db_access = user_has_db_access()
-    db_path = config.get_multi_user_database_path()
+    db_path = config.MULTI_USER_DATABASE_PATH
     
     if has_db_access:
-        click.echo(f"Database access: {Fore.GREEN}✓{Style.RESET_ALL} User has read/write access to the database")
+        click.echo(f"Database access: {_C.GREEN}✓{_C.RESET_ALL} User has read/write access to the database")
     else:
-        click.echo(f"Database access: {Fore.RED}✗{Style.RESET_ALL} User does NOT have read/write access to the database:")
+        click.echo(f"Database access: {_C.RED}✗{_C.RESET_ALL} User does NOT have read/write access to the database:")
         click.echo(f"  Path: {db_path}")
         click.echo(f"  → Contact your system administrator to fix permissions")
     
     # Overall status
     if is_in_group and has_db_access:
-        click.echo(f"\n{Fore.GREEN}Authentication status: PASSED{Style.RESET_ALL}")
+        click.echo(f"\n{_C.GREEN}Authentication status: PASSED{_C.RESET_ALL}")
         click.echo("You are authorized to use all spack-installer commands.")
     else:
-        click.echo(f"\n{Fore.RED}Authentication status: FAILED{Style.RESET_ALL}")
+        click.echo(f"\n{_C.RED}Authentication status: FAILED{_C.RESET_ALL}")
         click.echo("You are NOT authorized to use spack-installer commands.")
         click.echo("Please resolve the issues mentioned above.")
 
@@ -156,9 +293,8 @@ def submit(package_name, priority, dependencies, estimated_time, spack_command,
         # Handle custom spack setup path
         if spack_setup:
             # If a custom spack setup is provided, modify the command to use it
-            import os
             if not os.path.isfile(spack_setup):
-                click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Spack setup script not found: {spack_setup}", err=True)
+                click.echo(f"{_C.RED}✗{_C.RESET_ALL} Spack setup script not found: {spack_setup}", err=True)
                 sys.exit(1)
             
             if spack_command:
@@ -178,7 +314,7 @@ def submit(package_name, priority, dependencies, estimated_time, spack_command,
         # Parse dependencies
         deps_list = []
         if dependencies:
-            deps_list = [dep.strip() for dep in dependencies.split(",") if dep.strip()]
+            deps_list = list(filter(None, (dep.strip() for dep in dependencies.split(","))))
         
         # Try to submit via socket server first
         try:
@@ -194,26 +330,27 @@ def submit(package_name, priority, dependencies, estimated_time, spack_command,
                     estimated_time=estimated_time,
                     spack_command=spack_command
                 )
-                click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Job submitted successfully to server!")
+                click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Job submitted successfully to server!")
             else:
                 raise ConnectionError("Server not running")
                 
         except (ConnectionError, RuntimeError) as e:
             # Fall back to direct database access
-            click.echo(f"{Fore.YELLOW}Server not available, using direct database access{Style.RESET_ALL}")
+            click.echo(f"{_C.YELLOW}Server not available, using direct database access{_C.RESET_ALL}")
             
             # Parse priority
+            from .enums import JobPriority
             job_priority = JobPriority(priority.lower())
             
             # Submit job directly
-            job_info = queue_manager.submit_job(
+            job_info = get_queue_manager().submit_job(
                 package_name=package_name,
                 priority=job_priority,
                 dependencies=deps_list,
                 estimated_time=estimated_time,
                 spack_command=spack_command
             )
-            click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Job submitted successfully!")
+            click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Job submitted successfully!")
         
         # Display job information
         click.echo(f"Job ID: {job_info['id']}")
@@ -224,10 +361,10 @@ def submit(package_name, priority, dependencies, estimated_time, spack_command,
             click.echo(f"Dependencies: {', '.join(deps_list)}")
         
     except ValueError as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error: {e}", err=True)
         sys.exit(1)
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Unexpected error: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Unexpected error: {e}", err=True)
         sys.exit(1)
 
 
@@ -236,7 +373,8 @@ def submit(package_name, priority, dependencies, estimated_time, spack_command,
               type=click.Choice(["pending", "running", "completed", "failed", "cancelled"]),
               help="Filter jobs by status")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information")
-def status(status, verbose):
+@click.option("--no-cache", is_flag=True, help="Always query the server instead of reusing recent results")
+def status(status, verbose, no_cache):
     """Show current queue status and job information."""
     try:
         # Try to get status via socket server first
@@ -246,94 +384,105 @@ def status(status, verbose):
         
         try:
             from .client import SpackInstallerClient
-            client = SpackInstallerClient()
+            client = SpackInstallerClient(use_cache=not no_cache)
             
             if client.is_server_running():
-                # Get status via socket server
-                queue_status = client.get_status()
-                jobs = client.get_jobs(status)
+                # Get status and jobs via socket server in one round trip
+                queue_status, jobs_response = client.batch([
+                    ("get_status", None),
+                    ("get_jobs", {'status': status} if status else None)
+                ])
+                jobs = jobs_response.get('jobs', [])
                 server_used = True
             else:
                 raise ConnectionError("Server not running")
                 
         except (ConnectionError, RuntimeError):
             # Fall back to direct database access
-            queue_status = queue_manager.get_queue_status()
+            queue_status = get_queue_manager().get_queue_status()
             
             # Get jobs
             if status:
+                from .enums import JobStatus
                 filter_status = JobStatus(status)
-                jobs = queue_manager.get_all_jobs(filter_status)
+                jobs = get_queue_manager().get_all_jobs(filter_status)
             else:
-                jobs = queue_manager.get_all_jobs()
+                jobs = get_queue_manager().get_all_jobs()
         
-        # Display queue summary
-        click.echo(f"\n{Fore.CYAN}=== Queue Status ==={Style.RESET_ALL}")
-        if server_used:
-            click.echo(f"Mode: {Fore.GREEN}Server mode{Style.RESET_ALL}")
-        else:
-            click.echo(f"Mode: {Fore.YELLOW}Direct database access{Style.RESET_ALL}")
+        with OutputBuffer() as out:
+            # Display queue summary
+            out.echo(f"\n{_C.CYAN}=== Queue Status ==={_C.RESET_ALL}")
+            if server_used:
+                out.echo(f"Mode: {_C.GREEN}Server mode{_C.RESET_ALL}")
+            else:
+                out.echo(f"Mode: {_C.YELLOW}Direct database access{_C.RESET_ALL}")
             
-        click.echo(f"Worker Active: {Fore.GREEN if queue_status['worker_active'] else Fore.RED}"
-                  f"{'Yes' if queue_status['worker_active'] else 'No'}{Style.RESET_ALL}")
-        
-        if queue_status['current_job_id']:
-            click.echo(f"Current Job: {queue_status['current_job_id']}")
-        
-        if queue_status['next_job_id']:
-            click.echo(f"Next Job: {queue_status['next_job_id']}")
-        
-        click.echo(f"Pending Jobs: {queue_status['total_pending']}")
-        click.echo(f"Estimated Total Time: {format_duration(queue_status['estimated_total_time'])}")
-        
-        # Job counts by status
-        click.echo(f"\n{Fore.CYAN}=== Job Counts ==={Style.RESET_ALL}")
-        for job_status, count in queue_status['status_counts'].items():
-            click.echo(f"{job_status.capitalize()}: {count}")
-        
-        if not jobs:
-            click.echo(f"\n{Fore.YELLOW}No jobs found.{Style.RESET_ALL}")
-            return
-        
-        # Display jobs table
-        click.echo(f"\n{Fore.CYAN}=== Jobs ==={Style.RESET_ALL}")
-        
-        if verbose:
-            headers = ["ID", "Package", "Status", "Priority", "Est. Time", "Actual Time", 
-                      "Submitted", "Started", "Completed", "Dependencies"]
-            rows = []
-            for job in jobs:
-                deps = ", ".join(job['dependencies_list']) if job['dependencies_list'] else "None"
-                rows.append([
-                    job['id'],
-                    job['package_name'],
-                    format_status_string(job['status']),
-                    job['priority'],
-                    format_duration(job['estimated_time']),
-                    format_duration(job['actual_time']) if job['actual_time'] else "N/A",
-                    format_timestamp(job['submitted_at']),
-                    format_timestamp(job['started_at']),
-                    format_timestamp(job['completed_at']),
-                    deps[:30] + "..." if len(deps) > 30 else deps
-                ])
-        else:
-            headers = ["ID", "Package", "Status", "Priority", "Est. Time", "Submitted", "Submitted By"]
-            rows = []
-            for job in jobs:
-                rows.append([
-                    job['id'],
-                    job['package_name'],
-                    format_status_string(job['status']),
-                    job['priority'],
-                    format_duration(job['estimated_time']),
-                    format_timestamp(job['submitted_at']),
-                    job['submitted_by']
-                ])
-        
-        click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+            out.echo(f"Worker Active: {_C.GREEN if queue_status['worker_active'] else _C.RED}"
+                     f"{'Yes' if queue_status['worker_active'] else 'No'}{_C.RESET_ALL}")
+        
+            if queue_status['current_job_id']:
+                out.echo(f"Current Job: {queue_status['current_job_id']}")
+        
+            if queue_status['next_job_id']:
+                out.echo(f"Next Job: {queue_status['next_job_id']}")
+        
+            out.echo(f"Pending Jobs: {queue_status['total_pending']}")
+            out.echo(f"Estimated Total Time: {format_duration(queue_status['estimated_total_time'])}")
+        
+            # Job counts by status
+            out.echo(f"\n{_C.CYAN}=== Job Counts ==={_C.RESET_ALL}")
+            for job_status, count in queue_status['status_counts'].items():
+                out.echo(f"{job_status.capitalize()}: {count}")
+        
+            if not jobs:
+                out.echo(f"\n{_C.YELLOW}No jobs found.{_C.RESET_ALL}")
+                return
+        
+            # Display jobs table
+            out.echo(f"\n{_C.CYAN}=== Jobs ==={_C.RESET_ALL}")
+        
+            # Bind the formatters locally; these run several times per row
+            fmt_status = format_status_string
+            fmt_duration = format_duration
+            fmt_timestamp = format_timestamp
+        
+            if verbose:
+                headers = ["ID", "Package", "Status", "Priority", "Est. Time", "Actual Time", 
+                          "Submitted", "Started", "Completed", "Dependencies"]
+                rows = [
+                    [
+                        job['id'],
+                        job['package_name'],
+                        fmt_status(job['status']),
+                        job['priority'],
+                        fmt_duration(job['estimated_time']),
+                        fmt_duration(job['actual_time']) if job['actual_time'] else "N/A",
+                        fmt_timestamp(job['submitted_at']),
+                        fmt_timestamp(job['started_at']),
+                        fmt_timestamp(job['completed_at']),
+                        format_dependencies(job['dependencies_list'])
+                    ]
+                    for job in jobs
+                ]
+            else:
+                headers = ["ID", "Package", "Status", "Priority", "Est. Time", "Submitted", "Submitted By"]
+                rows = [
+                    [
+                        job['id'],
+                        job['package_name'],
+                        fmt_status(job['status']),
+                        job['priority'],
+                        fmt_duration(job['estimated_time']),
+                        fmt_timestamp(job['submitted_at']),
+                        job['submitted_by']
+                    ]
+                    for job in jobs
+                ]
+        
+            out.echo(_render_grid(headers, rows))
         
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error getting status: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error getting status: {e}", err=True)
         sys.exit(1)
 
 
@@ -364,13 +513,9 @@ def start(mode, check_interval, daemon, log_file):
     try:
         # Validate daemon options
         if daemon and not log_file:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error: --log-file is required when using --daemon", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error: --log-file is required when using --daemon", err=True)
             sys.exit(1)
         
-        # Configure check interval if provided
-        if check_interval:
-            config.WORKER_CHECK_INTERVAL = check_interval
-        
         if mode == "server":
             if not daemon:
                 click.echo("Starting worker server...")
@@ -400,15 +545,16 @@ def start(mode, check_interval, daemon, log_file):
             
         elif mode == "legacy":
             if daemon:
-                click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error: --daemon is not supported in legacy mode", err=True)
+                click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error: --daemon is not supported in legacy mode", err=True)
                 sys.exit(1)
             click.echo("Starting worker in legacy mode (direct database access)...")
-            start_worker()
+            from .worker import start_worker
+            start_worker(check_interval=check_interval)
             
     except KeyboardInterrupt:
-        click.echo(f"\n{Fore.YELLOW}Worker stopped by user.{Style.RESET_ALL}")
+        click.echo(f"\n{_C.YELLOW}Worker stopped by user.{_C.RESET_ALL}")
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error starting worker: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error starting worker: {e}", err=True)
         sys.exit(1)
 
 
@@ -416,12 +562,13 @@ def start(mode, check_interval, daemon, log_file):
 def stop():
     """Stop the worker daemon."""
     try:
+        from .worker import stop_worker
         if stop_worker():
-            click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Worker stopped successfully.")
+            click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Worker stopped successfully.")
         else:
-            click.echo(f"{Fore.YELLOW}No active worker found.{Style.RESET_ALL}")
+            click.echo(f"{_C.YELLOW}No active worker found.{_C.RESET_ALL}")
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error stopping worker: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error stopping worker: {e}", err=True)
         sys.exit(1)
 
 
@@ -429,11 +576,12 @@ def stop():
 def info():
     """Show worker status information."""
     try:
+        from .worker import get_worker_status
         worker_status = get_worker_status()
         
-        click.echo(f"\n{Fore.CYAN}=== Worker Status ==={Style.RESET_ALL}")
-        click.echo(f"Active: {Fore.GREEN if worker_status['active'] else Fore.RED}"
-                  f"{'Yes' if worker_status['active'] else 'No'}{Style.RESET_ALL}")
+        click.echo(f"\n{_C.CYAN}=== Worker Status ==={_C.RESET_ALL}")
+        click.echo(f"Active: {_C.GREEN if worker_status['active'] else _C.RED}"
+                  f"{'Yes' if worker_status['active'] else 'No'}{_C.RESET_ALL}")
         
         if worker_status['current_job_id']:
             click.echo(f"Current Job ID: {worker_status['current_job_id']}")
@@ -448,7 +596,7 @@ def info():
             click.echo(f"Process ID: {worker_status['process_id']}")
             
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error getting worker status: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error getting worker status: {e}", err=True)
         sys.exit(1)
 
 
@@ -457,13 +605,13 @@ def info():
 def cancel(job_id):
     """Cancel a pending job."""
     try:
-        if queue_manager.cancel_job(job_id):
-            click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Job {job_id} cancelled successfully.")
+        if get_queue_manager().cancel_job(job_id):
+            click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Job {job_id} cancelled successfully.")
         else:
-            click.echo(f"{Fore.YELLOW}Could not cancel job {job_id}. "
-                      f"Job may not exist or may not be in pending status.{Style.RESET_ALL}")
+            click.echo(f"{_C.YELLOW}Could not cancel job {job_id}. "
+                      f"Job may not exist or may not be in pending status.{_C.RESET_ALL}")
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error cancelling job: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error cancelling job: {e}", err=True)
         sys.exit(1)
 
 
@@ -473,43 +621,79 @@ def cancel(job_id):
 def cleanup(keep_days):
     """Clean up old completed jobs."""
     try:
-        deleted_count = queue_manager.cleanup_completed_jobs(keep_days)
-        click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Cleaned up {deleted_count} old jobs.")
+        deleted_count = get_queue_manager().cleanup_completed_jobs(keep_days)
+        click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Cleaned up {deleted_count} old jobs.")
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error during cleanup: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error during cleanup: {e}", err=True)
         sys.exit(1)
 
 
 @main.command()
 @click.argument("job_id", type=int)
-def logs(job_id):
+@click.option("--tail", "-n", type=click.IntRange(min=0), default=None,
+              help="Only show the last N log entries")
+@click.option("--follow", "-f", is_flag=True,
+              help="Keep printing new log entries until the job finishes")
+def logs(job_id, tail, follow):
     """Show logs for a specific job."""
     try:
-        job = queue_manager.get_job(job_id)
+        try:
+            from .client import SpackInstallerClient
+            client = SpackInstallerClient()
+            
+            if client.is_server_running():
+                # Stream logs from the server a page at a time
+                fetch_job = client.get_job
+                fetch_log_pages = client.stream_job_logs
+                job = fetch_job(job_id)
+            else:
+                raise ConnectionError("Server not running")
+                
+        except (ConnectionError, RuntimeError):
+            # Fall back to direct database access
+            fetch_job = get_queue_manager().get_job
+            fetch_log_pages = get_queue_manager().iter_job_log_pages
+            job = fetch_job(job_id)
+        
         if not job:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Job {job_id} not found.", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Job {job_id} not found.", err=True)
             sys.exit(1)
         
-        job_logs = queue_manager.get_job_logs(job_id)
-        
-        click.echo(f"\n{Fore.CYAN}=== Logs for Job {job_id} ({job['package_name']}) ==={Style.RESET_ALL}")
-        
-        if not job_logs:
-            click.echo(f"{Fore.YELLOW}No logs found for this job.{Style.RESET_ALL}")
-            return
-        
-        for log in job_logs:
-            color = {
-                "INFO": Fore.GREEN,
-                "WARNING": Fore.YELLOW,
-                "ERROR": Fore.RED
-            }.get(log['level'], "")
+        with OutputBuffer() as out:
+            out.echo(f"\n{_C.CYAN}=== Logs for Job {job_id} ({job['package_name']}) ==={_C.RESET_ALL}")
+            
+            offset = 0
+            shown = 0
+            while True:
+                for page in fetch_log_pages(job_id, offset=offset, tail=tail):
+                    for log in page['logs']:
+                        out.echo(f"{format_timestamp(log['timestamp'])} "
+                                 f"{format_log_level(log['level'])} {log['message']}")
+                    offset = page['offset']
+                    shown += len(page['logs'])
+                    # Show each page as soon as it arrives
+                    out.flush()
+                
+                # Only the first read is limited; later reads pick up new entries
+                tail = None
+                if not follow or job['status'] not in _ACTIVE_STATUSES:
+                    break
+                time.sleep(LOG_FOLLOW_INTERVAL)
+                job = fetch_job(job_id) or job
             
-            click.echo(f"{format_timestamp(log['timestamp'])} "
-                      f"{color}[{log['level']}]{Style.RESET_ALL} {log['message']}")
+            if not shown:
+                out.echo(f"{_C.YELLOW}No logs found for this job.{_C.RESET_ALL}")
             
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Output was piped into something like `head` that has exited;
+        # point stdout at /dev/null so the interpreter's final flush is quiet
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error getting logs: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error getting logs: {e}", err=True)
         sys.exit(1)
 
 
@@ -518,30 +702,49 @@ def logs(job_id):
 def retry(job_id):
     """Retry a failed job with the same configuration."""
     try:
-        # Get the original job
-        original_job = queue_manager.get_job(job_id)
+        try:
+            from .client import SpackInstallerClient
+            client = SpackInstallerClient()
+            
+            if client.is_server_running():
+                # Fetch the original job and attempt the retry in one round
+                # trip; the retry is only created if the job is eligible
+                job_response, retry_response = client.batch([
+                    ("get_job", {'job_id': job_id}),
+                    ("create_retry_job", {'job_id': job_id})
+                ])
+                original_job = job_response.get('job')
+                retry_job = retry_response.get('job')
+            else:
+                raise ConnectionError("Server not running")
+                
+        except (ConnectionError, RuntimeError):
+            # Fall back to direct database access
+            original_job = get_queue_manager().get_job(job_id)
+            retry_job = None
+            if (original_job and original_job['status'] == 'failed' and
+                    original_job['retry_count'] < original_job['max_retries']):
+                retry_job = get_queue_manager().create_retry_job(job_id)
+        
         if not original_job:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Job {job_id} not found.", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Job {job_id} not found.", err=True)
             sys.exit(1)
         
         # Check if job is failed
         if original_job['status'] != 'failed':
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Job {job_id} is not failed (status: {original_job['status']}). Only failed jobs can be retried.", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Job {job_id} is not failed (status: {original_job['status']}). Only failed jobs can be retried.", err=True)
             sys.exit(1)
         
         # Check if job has retries remaining
         if original_job['retry_count'] >= original_job['max_retries']:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Job {job_id} has exhausted all retry attempts ({original_job['retry_count']}/{original_job['max_retries']}).", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Job {job_id} has exhausted all retry attempts ({original_job['retry_count']}/{original_job['max_retries']}).", err=True)
             sys.exit(1)
         
-        # Create retry job using the queue manager method
-        retry_job = queue_manager.create_retry_job(job_id)
-        
         if not retry_job:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Failed to create retry job for job {job_id}.", err=True)
+            click.echo(f"{_C.RED}✗{_C.RESET_ALL} Failed to create retry job for job {job_id}.", err=True)
             sys.exit(1)
         
-        click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Retry job created successfully!")
+        click.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Retry job created successfully!")
         click.echo(f"New Job ID: {retry_job['id']}")
         click.echo(f"Package: {retry_job['package_name']}")
         click.echo(f"Retry attempt: {retry_job['retry_count']}/{retry_job['max_retries']}")
@@ -553,17 +756,20 @@ def retry(job_id):
         
         # Show when the retry will be eligible to run
         if retry_job.get('last_retry_at'):
-            from datetime import datetime, timedelta
-            next_eligible = retry_job['last_retry_at'] + timedelta(seconds=retry_job['retry_delay'])
+            last_retry_at = retry_job['last_retry_at']
+            if isinstance(last_retry_at, str):
+                # Timestamps arrive as ISO strings from the server
+                last_retry_at = datetime.fromisoformat(last_retry_at)
+            next_eligible = last_retry_at + timedelta(seconds=retry_job['retry_delay'])
             current_time = datetime.utcnow()
             if next_eligible > current_time:
                 wait_time = (next_eligible - current_time).total_seconds()
                 click.echo(f"Next retry eligible in: {format_duration(wait_time)}")
             else:
-                click.echo(f"{Fore.GREEN}Job is eligible to run immediately{Style.RESET_ALL}")
+                click.echo(f"{_C.GREEN}Job is eligible to run immediately{_C.RESET_ALL}")
         
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error creating retry job: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error creating retry job: {e}", err=True)
         sys.exit(1)
 
 
@@ -572,49 +778,51 @@ def failed():
     """Show all failed jobs and their retry status."""
     try:
         # Get all failed jobs
-        failed_jobs = queue_manager.get_all_jobs(JobStatus.FAILED)
+        from .enums import JobStatus
+        failed_jobs = get_queue_manager().get_all_jobs(JobStatus.FAILED)
         
         if not failed_jobs:
-            click.echo(f"\n{Fore.GREEN}No failed jobs found.{Style.RESET_ALL}")
+            click.echo(f"\n{_C.GREEN}No failed jobs found.{_C.RESET_ALL}")
             return
         
-        click.echo(f"\n{Fore.CYAN}=== Failed Jobs ==={Style.RESET_ALL}")
+        with OutputBuffer() as out:
+            out.echo(f"\n{_C.CYAN}=== Failed Jobs ==={_C.RESET_ALL}")
         
-        headers = ["ID", "Package", "User", "Failed At", "Error", "Retries", "Can Retry"]
-        rows = []
+            headers = ["ID", "Package", "User", "Failed At", "Error", "Retries", "Can Retry"]
+            rows = []
         
-        for job in failed_jobs:
-            # Truncate error message for display
-            error_msg = job.get('error_message', 'No error message')
-            if len(error_msg) > 50:
-                error_msg = error_msg[:47] + "..."
+            for job in failed_jobs:
+                # Truncate error message for display
+                error_msg = job.get('error_message', 'No error message')
+                if len(error_msg) > 50:
+                    error_msg = error_msg[:47] + "..."
             
-            # Check if job can be retried
-            can_retry = job['retry_count'] < job['max_retries']
-            retry_status = f"{job['retry_count']}/{job['max_retries']}"
-            can_retry_display = f"{Fore.GREEN}Yes{Style.RESET_ALL}" if can_retry else f"{Fore.RED}No{Style.RESET_ALL}"
+                # Check if job can be retried
+                can_retry = job['retry_count'] < job['max_retries']
+                retry_status = f"{job['retry_count']}/{job['max_retries']}"
+                can_retry_display = f"{_C.GREEN}Yes{_C.RESET_ALL}" if can_retry else f"{_C.RED}No{_C.RESET_ALL}"
             
-            rows.append([
-                job['id'],
-                job['package_name'],
-                job['submitted_by'],
-                format_timestamp(job.get('completed_at')),
-                error_msg,
-                retry_status,
-                can_retry_display
-            ])
-        
-        click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
-        
-        # Show retry instructions
-        retryable_jobs = [job for job in failed_jobs if job['retry_count'] < job['max_retries']]
-        if retryable_jobs:
-            click.echo(f"\n{Fore.CYAN}To retry a failed job, use:{Style.RESET_ALL}")
-            click.echo(f"  spack-installer retry <job-id>")
-            click.echo(f"\nExample: spack-installer retry {retryable_jobs[0]['id']}")
+                rows.append([
+                    job['id'],
+                    job['package_name'],
+                    job['submitted_by'],
+                    format_timestamp(job.get('completed_at')),
+                    error_msg,
+                    retry_status,
+                    can_retry_display
+                ])
+        
+            out.echo(_render_grid(headers, rows))
+        
+            # Show retry instructions
+            retryable_jobs = [job for job in failed_jobs if job['retry_count'] < job['max_retries']]
+            if retryable_jobs:
+                out.echo(f"\n{_C.CYAN}To retry a failed job, use:{_C.RESET_ALL}")
+                out.echo(f"  spack-installer retry <job-id>")
+                out.echo(f"\nExample: spack-installer retry {retryable_jobs[0]['id']}")
         
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error getting failed jobs: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error getting failed jobs: {e}", err=True)
         sys.exit(1)
 
 
@@ -622,76 +830,85 @@ def failed():
 def config_check():
     """Check spack configuration and system requirements."""
     try:
-        click.echo(f"\n{Fore.CYAN}=== Spack Configuration Check ==={Style.RESET_ALL}")
+        with OutputBuffer() as out:
+            out.echo(f"\n{_C.CYAN}=== Spack Configuration Check ==={_C.RESET_ALL}")
         
-        # Check spack setup script
-        spack_script = config.get_spack_setup_script()
-        click.echo(f"Spack setup script: {spack_script}")
+            # Check spack setup script
+            spack_script = config.SPACK_SETUP_SCRIPT
+            out.echo(f"Spack setup script: {spack_script}")
         
-        if config.validate_spack_setup():
-            click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Spack setup script found")
-        else:
-            click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Spack setup script not found")
-            click.echo(f"{Fore.YELLOW}  Set SPACK_SETUP_SCRIPT environment variable to specify location{Style.RESET_ALL}")
-        
-        # Check database configuration
-        click.echo(f"\n{Fore.CYAN}=== Database Configuration ==={Style.RESET_ALL}")
-        click.echo(f"Database type: {config.get_database_type()}")
-        click.echo(f"Database path: {config.get_database_path()}")
-        if config.get_database_url():
-            click.echo(f"Database URL: {config.get_database_url()}")
-        
-        # Check if database file exists and is accessible
-        db_path = config.get_database_path()
-        if os.path.exists(db_path):
-            click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Database file exists")
-            try:
-                # Test database access
-                from .database import get_db_manager
-                db = get_db_manager()
-                status_counts = db.get_status_counts()
-                total_jobs = sum(status_counts.values())
-                click.echo(f"  Total jobs in database: {total_jobs}")
-            except Exception as e:
-                click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error accessing database: {e}")
-        else:
-            click.echo(f"{Fore.YELLOW}⚠{Style.RESET_ALL} Database file will be created on first use")
-        
-        # Show other configuration values
-        click.echo(f"\n{Fore.CYAN}=== Worker Configuration ==={Style.RESET_ALL}")
-        click.echo(f"Check interval: {config.WORKER_CHECK_INTERVAL}s")
-        click.echo(f"Heartbeat interval: {config.WORKER_HEARTBEAT_INTERVAL}s")
-        click.echo(f"Job timeout multiplier: {config.DEFAULT_JOB_TIMEOUT_MULTIPLIER}x")
-        click.echo(f"Max heartbeat age: {config.MAX_WORKER_HEARTBEAT_AGE}s")
-        
-        # Test spack availability (if setup script exists)
-        if config.validate_spack_setup():
-            click.echo(f"\n{Fore.CYAN}=== Testing Spack Availability ==={Style.RESET_ALL}")
-            import subprocess
-            try:
-                test_command = f"source {spack_script} && spack --version"
-                result = subprocess.run(
-                    test_command,
-                    shell=True,
-                    executable="/bin/bash",
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
+            # Checked once; the script does not move during one invocation
+            spack_ok = config.validate_spack_setup()
+            if spack_ok:
+                out.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Spack setup script found")
+            else:
+                out.echo(f"{_C.RED}✗{_C.RESET_ALL} Spack setup script not found")
+                out.echo(f"{_C.YELLOW}  Set SPACK_SETUP_SCRIPT environment variable to specify location{_C.RESET_ALL}")
+        
+            # Check database configuration
+            out.echo(f"\n{_C.CYAN}=== Database Configuration ==={_C.RESET_ALL}")
+            out.echo(f"Database type: {config.get_database_type()}")
+            db_path = config.get_database_path()
+            db_url = config.DATABASE_URL
+            out.echo(f"Database path: {db_path}")
+            if db_url:
+                out.echo(f"Database URL: {db_url}")
+        
+            # Check if database file exists and is accessible
+            if os.path.exists(db_path):
+                out.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Database file exists")
+                try:
+                    # Test database access
+                    from .database import get_db_manager
+                    db = get_db_manager()
+                    status_counts = db.get_status_counts()
+                    total_jobs = sum(status_counts.values())
+                    out.echo(f"  Total jobs in database: {total_jobs}")
+                except Exception as e:
+                    out.echo(f"{_C.RED}✗{_C.RESET_ALL} Error accessing database: {e}")
+            else:
+                out.echo(f"{_C.YELLOW}⚠{_C.RESET_ALL} Database file will be created on first use")
+        
+            # Show other configuration values
+            out.echo(f"\n{_C.CYAN}=== Worker Configuration ==={_C.RESET_ALL}")
+            out.echo(f"Check interval: {config.WORKER_CHECK_INTERVAL}s")
+            out.echo(f"Heartbeat interval: {config.WORKER_HEARTBEAT_INTERVAL}s")
+            out.echo(f"Job timeout multiplier: {config.DEFAULT_JOB_TIMEOUT_MULTIPLIER}x")
+            out.echo(f"Max heartbeat age: {config.MAX_WORKER_HEARTBEAT_AGE}s")
+        
+            # Test spack availability (if setup script exists)
+            if spack_ok:
+                out.echo(f"\n{_C.CYAN}=== Testing Spack Availability ==={_C.RESET_ALL}")
+                # Show everything so far before the (slow) spack invocation
+                out.flush()
+                try:
+                    spack_bin = config.get_spack_executable()
+                    if spack_bin:
+                        # Run spack directly; it does not need the setup script's environment
+                        test_command = [spack_bin, "--version"]
+                    else:
+                        # Unusual layout: let the setup script put spack on PATH
+                        test_command = ["/bin/bash", "-c", 'source "$1" && spack --version', "bash", spack_script]
+                    result = subprocess.run(
+                        test_command,
+                        capture_output=True,
+                        text=True,
+                        timeout=10
+                    )
                 
-                if result.returncode == 0:
-                    version = result.stdout.strip()
-                    click.echo(f"{Fore.GREEN}✓{Style.RESET_ALL} Spack is available: {version}")
-                else:
-                    click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Failed to run spack: {result.stderr}")
+                    if result.returncode == 0:
+                        version = result.stdout.strip()
+                        out.echo(f"{_C.GREEN}✓{_C.RESET_ALL} Spack is available: {version}")
+                    else:
+                        out.echo(f"{_C.RED}✗{_C.RESET_ALL} Failed to run spack: {result.stderr}")
                     
-            except subprocess.TimeoutExpired:
-                click.echo(f"{Fore.YELLOW}⚠{Style.RESET_ALL} Spack test timed out")
-            except Exception as e:
-                click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error testing spack: {e}")
+                except subprocess.TimeoutExpired:
+                    out.echo(f"{_C.YELLOW}⚠{_C.RESET_ALL} Spack test timed out")
+                except Exception as e:
+                    out.echo(f"{_C.RED}✗{_C.RESET_ALL} Error testing spack: {e}")
         
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error checking configuration: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error checking configuration: {e}", err=True)
         sys.exit(1)
 
 
@@ -699,48 +916,49 @@ def config_check():
 def optimize():
     """Show optimized queue order and dependency analysis."""
     try:
-        # Get optimized order
-        optimized_jobs = queue_manager.get_optimized_queue_order()
+        with OutputBuffer() as out:
+            # Get optimized order
+            optimized_jobs = get_queue_manager().get_optimized_queue_order()
         
-        click.echo(f"\n{Fore.CYAN}=== Optimized Queue Order ==={Style.RESET_ALL}")
+            out.echo(f"\n{_C.CYAN}=== Optimized Queue Order ==={_C.RESET_ALL}")
         
-        if not optimized_jobs:
-            click.echo(f"{Fore.YELLOW}No pending jobs to optimize.{Style.RESET_ALL}")
-        else:
-            headers = ["Order", "ID", "Package", "Priority", "Est. Time", "Dependencies"]
-            rows = []
-            for i, job in enumerate(optimized_jobs, 1):
-                deps = ", ".join(job['dependencies_list']) if job['dependencies_list'] else "None"
-                rows.append([
-                    i,
-                    job['id'],
-                    job['package_name'],
-                    job['priority'],
-                    format_duration(job['estimated_time']),
-                    deps[:30] + "..." if len(deps) > 30 else deps
-                ])
+            if not optimized_jobs:
+                out.echo(f"{_C.YELLOW}No pending jobs to optimize.{_C.RESET_ALL}")
+            else:
+                headers = ["Order", "ID", "Package", "Priority", "Est. Time", "Dependencies"]
+                rows = []
+                for i, job in enumerate(optimized_jobs, 1):
+                    deps = ", ".join(job['dependencies_list']) if job['dependencies_list'] else "None"
+                    rows.append([
+                        i,
+                        job['id'],
+                        job['package_name'],
+                        job['priority'],
+                        format_duration(job['estimated_time']),
+                        deps[:30] + "..." if len(deps) > 30 else deps
+                    ])
             
-            click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+                out.echo(_render_grid(headers, rows))
         
-        # Check for dependency issues
-        issues = queue_manager.detect_dependency_issues()
+            # Check for dependency issues
+            issues = get_queue_manager().detect_dependency_issues()
         
-        if issues['circular_dependencies']:
-            click.echo(f"\n{Fore.RED}=== Circular Dependencies Detected ==={Style.RESET_ALL}")
-            for dep1, dep2 in issues['circular_dependencies']:
-                click.echo(f"{Fore.RED}✗{Style.RESET_ALL} {dep1} ↔ {dep2}")
+            if issues['circular_dependencies']:
+                out.echo(f"\n{_C.RED}=== Circular Dependencies Detected ==={_C.RESET_ALL}")
+                for dep1, dep2 in issues['circular_dependencies']:
+                    out.echo(f"{_C.RED}✗{_C.RESET_ALL} {dep1} ↔ {dep2}")
         
-        if issues['unsatisfied_dependencies']:
-            click.echo(f"\n{Fore.YELLOW}=== Unsatisfied External Dependencies ==={Style.RESET_ALL}")
-            for issue in issues['unsatisfied_dependencies']:
-                click.echo(f"{Fore.YELLOW}⚠{Style.RESET_ALL} Job {issue['job_id']} ({issue['package']}) "
-                          f"needs: {', '.join(issue['missing_external_deps'])}")
+            if issues['unsatisfied_dependencies']:
+                out.echo(f"\n{_C.YELLOW}=== Unsatisfied External Dependencies ==={_C.RESET_ALL}")
+                for issue in issues['unsatisfied_dependencies']:
+                    out.echo(f"{_C.YELLOW}⚠{_C.RESET_ALL} Job {issue['job_id']} ({issue['package']}) "
+                             f"needs: {', '.join(issue['missing_external_deps'])}")
         
-        if not issues['circular_dependencies'] and not issues['unsatisfied_dependencies']:
-            click.echo(f"\n{Fore.GREEN}✓{Style.RESET_ALL} No dependency issues detected.")
+            if not issues['circular_dependencies'] and not issues['unsatisfied_dependencies']:
+                out.echo(f"\n{_C.GREEN}✓{_C.RESET_ALL} No dependency issues detected.")
             
     except Exception as e:
-        click.echo(f"{Fore.RED}✗{Style.RESET_ALL} Error optimizing queue: {e}", err=True)
+        click.echo(f"{_C.RED}✗{_C.RESET_ALL} Error optimizing queue: {e}", err=True)
         sys.exit(1)
 
 
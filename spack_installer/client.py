@@ -3,25 +3,205 @@
 import os
 import socket
 import json
+import time
+import atexit
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+import weakref
+from typing import Dict, Any, Optional, List, Tuple, Iterator
 
 from .config import config
+from .protocol import send_message, recv_message, encode, decode
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds a cached read-only response stays valid
+CACHE_TTL = 2.0
+
+# Marker for a cache miss
+_MISSING = object()
+
+# Actions whose responses may be cached, and actions that invalidate the cache
+_CACHEABLE_ACTIONS = frozenset({"get_status", "get_jobs"})
+_MUTATING_ACTIONS = frozenset({"submit_job", "cancel_job", "create_retry_job"})
+
+
+class _ResponseCache:
+    """Short-lived cache of read-only server responses.
+    
+    Shared by all clients in the process; any mutating request clears it.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Any:
+        """Return the cached value for key, or _MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return _MISSING
+        return entry[1]
+    
+    def put(self, key: tuple, value: Any) -> None:
+        """Store a value for key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+    
+    def clear(self) -> None:
+        """Drop all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+
+_response_cache = _ResponseCache(CACHE_TTL)
+
+
+# Clients in this process, closed together when it exits
+_clients: "weakref.WeakSet[SpackInstallerClient]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_clients() -> None:
+    """Close the connections of all clients still alive at exit."""
+    for client in list(_clients):
+        client.close()
+
+
+def _cache_key(action: str, params: Optional[Dict[str, Any]]) -> tuple:
+    """Build the response cache key for a request."""
+    return (action, tuple(sorted((params or {}).items())))
+
+
 class SpackInstallerClient:
     """Client for communicating with the Spack Installer server via sockets."""
     
-    def __init__(self):
-        """Initialize the client."""
+    def __init__(self, use_cache: bool = True):
+        """Initialize the client.
+        
+        Args:
+            use_cache: Whether read-only requests may be answered from a
+                short-lived response cache
+        """
+        self.use_cache = use_cache
         self.use_unix_socket = config.USE_UNIX_SOCKET
         self.server_socket_path = config.SERVER_SOCKET_PATH
         self.server_host = config.SERVER_HOST
         self.server_port = config.SERVER_PORT
         # Default socket timeout of 30 seconds if not configured
         self.socket_timeout = getattr(config, 'SOCKET_TIMEOUT', 30.0)
+        # Connection reused across requests; opened on first use
+        self._sock: Optional[socket.socket] = None
+        _clients.add(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def close(self):
+        """Close the connection to the server, if open."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+    
+    def _get_sock(self) -> socket.socket:
+        """Return the open server connection, connecting if necessary.
+        
+        Raises:
+            ConnectionError: If the Unix socket does not exist
+            OSError: If the connection fails
+        """
+        if self._sock is not None:
+            return self._sock
+        
+        if self.use_unix_socket:
+            if not os.path.exists(self.server_socket_path):
+                raise ConnectionError(f"Unix socket {self.server_socket_path} does not exist")
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = self.server_socket_path
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Requests are small and answered before the next one is sent,
+            # so Nagle's algorithm would only add latency
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            target = (self.server_host, self.server_port)
+        
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        
+        sock.settimeout(self.socket_timeout)
+        self._sock = sock
+        return sock
+    
+    def _exchange(self, payload: bytes, idempotent: bool) -> bytes:
+        """Send one framed request and read its framed response.
+        
+        A reused connection the server has already closed is replaced
+        before sending. If sending on a reused connection fails anyway, the
+        server cannot have run the request, so it is retried once on a fresh
+        connection. A failure after the request was sent is retried only for
+        idempotent requests, since the server may already have run it.
+        """
+        if self._sock is not None and not self._is_open(self._sock):
+            self.close()
+        reused = self._sock is not None
+        sock = self._get_sock()
+        try:
+            send_message(sock, payload)
+        except socket.timeout:
+            self.close()
+            raise
+        except OSError:
+            self.close()
+            if not reused:
+                raise
+            return self._exchange(payload, idempotent)
+        
+        try:
+            response = recv_message(sock)
+            if response is None:
+                raise ConnectionError("Server closed the connection")
+            return response
+        except socket.timeout:
+            self.close()
+            raise
+        except OSError:
+            self.close()
+            if not (reused and idempotent):
+                raise
+        
+        return self._exchange(payload, idempotent)
+    
+    @staticmethod
+    def _is_open(sock: socket.socket) -> bool:
+        """Check without blocking that the server has not closed a connection.
+        
+        Between requests nothing should be readable; end of file, an error or
+        stray data all mean the connection can no longer be used.
+        """
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            sock.recv(1, socket.MSG_PEEK)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.settimeout(timeout)
+        return False
     
     def _send_request(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Send a request to the server and get the response.
@@ -46,37 +226,16 @@ class SpackInstallerClient:
         }
         
         try:
-            if self.use_unix_socket:
-                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                if not os.path.exists(self.server_socket_path):
-                    raise ConnectionError(f"Unix socket {self.server_socket_path} does not exist")
-                sock.connect(self.server_socket_path)
-            else:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.connect((self.server_host, self.server_port))
-            
-            sock.settimeout(self.socket_timeout)
-            
-            # Send the request
-            request_json = json.dumps(request).encode('utf-8')
-            sock.sendall(request_json)
-            
-            # Signal end of request by shutting down the write side
-            sock.shutdown(socket.SHUT_WR)
-            
-            # Receive the response
-            response_data = b''
-            while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response_data += chunk
-            
-            sock.close()
+            # Requests that change the queue must not run twice
+            actions = [action]
+            if action == "batch":
+                actions = [sub_request.get("action") for sub_request in params.get("requests", [])]
+            idempotent = _MUTATING_ACTIONS.isdisjoint(actions)
+            response_data = self._exchange(encode(request), idempotent)
             
             # Parse the complete response
             try:
-                response = json.loads(response_data.decode('utf-8'))
+                response = decode(response_data)
             except json.JSONDecodeError:
                 raise RuntimeError("Received invalid JSON response from server")
             
@@ -93,6 +252,63 @@ class SpackInstallerClient:
         except (socket.error, ConnectionError) as e:
             raise ConnectionError(f"Failed to connect to server: {e}")
     
+    def _send_cached_request(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a read-only request, reusing a recent identical response if cached."""
+        if not self.use_cache:
+            return self._send_request(action, params)
+        
+        key = _cache_key(action, params)
+        response = _response_cache.get(key)
+        if response is _MISSING:
+            response = self._send_request(action, params)
+            _response_cache.put(key, response)
+        return response
+    
+    def batch(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Send several requests to the server in a single round trip.
+        
+        Cacheable requests with a fresh cached response are answered locally;
+        the rest are executed by the server in order.
+        
+        Args:
+            requests: List of (action, params) tuples
+            
+        Returns:
+            List of response data, in request order
+            
+        Raises:
+            ConnectionError: If unable to connect to the server
+            RuntimeError: If the server returns an error for any request
+        """
+        results: List[Any] = [_MISSING] * len(requests)
+        pending = []
+        for index, (action, params) in enumerate(requests):
+            if action in _MUTATING_ACTIONS:
+                _response_cache.clear()
+            elif self.use_cache and action in _CACHEABLE_ACTIONS:
+                results[index] = _response_cache.get(_cache_key(action, params))
+            if results[index] is _MISSING:
+                pending.append(index)
+        
+        if pending:
+            response = self._send_request("batch", {
+                "requests": [
+                    {"action": requests[i][0], "params": requests[i][1] or {}}
+                    for i in pending
+                ]
+            })
+            for index, result in zip(pending, response.get("results", [])):
+                if not result.get("success", False):
+                    error_msg = result.get("error", "Unknown error")
+                    raise RuntimeError(f"Server error: {error_msg}")
+                
+                action, params = requests[index]
+                results[index] = result.get("data", {})
+                if self.use_cache and action in _CACHEABLE_ACTIONS:
+                    _response_cache.put(_cache_key(action, params), results[index])
+        
+        return results
+    
     def is_server_running(self) -> bool:
         """Check if the server is running and responding.
         
@@ -100,17 +316,8 @@ class SpackInstallerClient:
             bool: True if the server is running and responding, False otherwise
         """
         try:
-            # Try to create a socket and connect to the server
-            if self.use_unix_socket:
-                if not os.path.exists(self.server_socket_path):
-                    return False
-                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                sock.connect(self.server_socket_path)
-            else:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.connect((self.server_host, self.server_port))
-            
-            sock.close()
+            # Opening the connection is enough; it is kept for later requests
+            self._get_sock()
             return True
         except Exception:
             return False
@@ -143,6 +350,7 @@ class SpackInstallerClient:
         if spack_command:
             params['spack_command'] = spack_command
         
+        _response_cache.clear()
         return self._send_request("submit_job", params)
     
     def get_status(self) -> Dict[str, Any]:
@@ -151,7 +359,7 @@ class SpackInstallerClient:
         Returns:
             Dict containing queue status information
         """
-        return self._send_request("get_status")
+        return self._send_cached_request("get_status")
     
     def get_jobs(self, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get jobs from the server.
@@ -166,9 +374,22 @@ class SpackInstallerClient:
         if status_filter:
             params['status'] = status_filter
         
-        response = self._send_request("get_jobs", params)
+        response = self._send_cached_request("get_jobs", params)
         return response.get('jobs', [])
     
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single job.
+        
+        Args:
+            job_id: ID of the job
+            
+        Returns:
+            Job dictionary, or None if the job does not exist
+        """
+        params = {'job_id': job_id}
+        response = self._send_request("get_job", params)
+        return response.get('job')
+    
     def cancel_job(self, job_id: int) -> bool:
         """Cancel a job.
         
@@ -179,9 +400,24 @@ class SpackInstallerClient:
             bool: True if successfully cancelled
         """
         params = {'job_id': job_id}
+        _response_cache.clear()
         response = self._send_request("cancel_job", params)
         return response.get('cancelled', False)
     
+    def create_retry_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Create a retry job for a failed job.
+        
+        Args:
+            job_id: ID of the failed job
+            
+        Returns:
+            The new retry job, or None if the job cannot be retried
+        """
+        params = {'job_id': job_id}
+        _response_cache.clear()
+        response = self._send_request("create_retry_job", params)
+        return response.get('job')
+    
     def get_job_logs(self, job_id: int) -> List[Dict[str, Any]]:
         """Get logs for a job.
         
@@ -194,3 +430,60 @@ class SpackInstallerClient:
         params = {'job_id': job_id}
         response = self._send_request("get_job_logs", params)
         return response.get('logs', [])
+    
+    def stream_job_logs(
+        self,
+        job_id: int,
+        offset: int = 0,
+        tail: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a job's logs from the server one page at a time.
+        
+        Unlike get_job_logs, entries can be shown as soon as their page
+        arrives and the full list is never held in memory.
+        
+        Args:
+            job_id: ID of the job
+            offset: Number of log entries to skip
+            tail: Only return the last ``tail`` entries
+            
+        Yields:
+            Dicts holding the page's 'logs', the 'offset' just past them,
+            and whether 'more' pages follow
+            
+        Raises:
+            ConnectionError: If unable to connect to the server
+            RuntimeError: If the server returns an error
+        """
+        request = {
+            "action": "get_job_logs_stream",
+            "params": {'job_id': job_id, 'offset': offset, 'tail': tail}
+        }
+        
+        done = False
+        try:
+            sock = self._get_sock()
+            send_message(sock, encode(request))
+            while not done:
+                data = recv_message(sock)
+                if data is None:
+                    raise ConnectionError("Server closed the connection")
+                response = decode(data)
+                if not response.get("success", False):
+                    done = True
+                    error_msg = response.get("error", "Unknown error")
+                    raise RuntimeError(f"Server error: {error_msg}")
+                
+                page = response.get("data", {})
+                done = not page.get("more", False)
+                yield page
+        except socket.timeout:
+            raise RuntimeError("Server did not respond within the timeout period")
+        except json.JSONDecodeError:
+            raise RuntimeError("Received invalid JSON response from server")
+        except (socket.error, ConnectionError) as e:
+            raise ConnectionError(f"Failed to connect to server: {e}")
+        finally:
+            # Unread pages would be mistaken for the next response
+            if not done:
+                self.close()
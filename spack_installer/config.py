@@ -3,42 +3,151 @@
 import os
 from typing import Optional
 
+# All settings are read from this mapping. It is the live os.environ, not
+# a snapshot, so reload() sees variables set after startup; each lookup
+# encodes the key, but settings are only looked up on first use.
+_env = os.environ
 
-class Config:
-    """Configuration settings for the application."""
-    
-    # Database settings
-    DATABASE_TYPE: str = os.getenv("SPACK_INSTALLER_DB_TYPE", "json")  # "json" or "sqlite"
-    DATABASE_URL: Optional[str] = os.getenv("SPACK_INSTALLER_DB_URL")
-    DATABASE_PATH: str = os.getenv("SPACK_INSTALLER_DB_PATH", os.path.expanduser("~/.spack_installer/jobs.json"))
-    
-    # Spack configuration
-    SPACK_SETUP_SCRIPT: str = os.getenv("SPACK_SETUP_SCRIPT", "/opt/spack/setup-env.sh")
-    
-    # Worker settings
-    WORKER_CHECK_INTERVAL: float = float(os.getenv("WORKER_CHECK_INTERVAL", "10.0"))
-    WORKER_HEARTBEAT_INTERVAL: float = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "30.0"))
-    
-    # Job settings
-    DEFAULT_JOB_TIMEOUT_MULTIPLIER: float = float(os.getenv("JOB_TIMEOUT_MULTIPLIER", "2.0"))
-    MAX_WORKER_HEARTBEAT_AGE: float = float(os.getenv("MAX_WORKER_HEARTBEAT_AGE", "60.0"))
-    
-    # Server settings (for multi-user mode)
-    SERVER_HOST: str = os.getenv("SPACK_INSTALLER_SERVER_HOST", "localhost")
-    SERVER_PORT: int = int(os.getenv("SPACK_INSTALLER_SERVER_PORT", "8080"))
-    SERVER_SOCKET_PATH: str = os.getenv("SPACK_INSTALLER_SERVER_SOCKET", "/tmp/spack_installer.sock")
-    USE_UNIX_SOCKET: bool = os.getenv("SPACK_INSTALLER_USE_UNIX_SOCKET", "true").lower() == "true"
-    MULTI_USER_DATABASE_PATH: str = os.getenv("SPACK_INSTALLER_MULTI_USER_DB", "/tmp/jobs.json")
-    
-    # Retry settings
-    DEFAULT_MAX_RETRIES: int = int(os.getenv("SPACK_INSTALLER_MAX_RETRIES", "3"))
-    RETRY_BACKOFF_FACTOR: float = float(os.getenv("SPACK_INSTALLER_RETRY_BACKOFF", "2.0"))
-    DEFAULT_RETRY_DELAY: float = float(os.getenv("SPACK_INSTALLER_RETRY_DELAY", "60.0"))
-    RETRY_CHECK_INTERVAL: float = float(os.getenv("SPACK_INSTALLER_RETRY_CHECK_INTERVAL", "300.0"))
-    
-    # Legacy retry settings for compatibility
-    MAX_JOB_RETRIES: int = DEFAULT_MAX_RETRIES
-    RETRY_BASE_DELAY: float = DEFAULT_RETRY_DELAY
+# Bound once so the per-job setup script check skips the attribute lookups
+_isfile = os.path.isfile
+
+# Spack setup scripts already found to exist. Only hits are remembered: a
+# missing script is checked again on every call, so a long-running worker
+# notices spack being installed after it started.
+_found_setup_scripts = set()
+
+# Environment values accepted as "true" for boolean settings
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
+
+
+def _parse_bool(value: str) -> bool:
+    """Convert an environment value to a boolean setting."""
+    return value.strip().lower() in _TRUTHY
+
+
+def _default_database_path() -> str:
+    """Default DATABASE_PATH, under the user's home directory."""
+    return os.path.expanduser("~/.spack_installer/jobs.json")
+
+
+class _LazySettings(type):
+    """Metaclass that reads each setting from the environment on first use.
+    
+    Settings are declared in the class's ``_SETTINGS`` table. The first
+    access converts the environment value, or takes the default (calling it
+    if it is a function), and stores it as an ordinary class attribute, so
+    later reads cost nothing extra and settings a command never uses are
+    never parsed.
+    
+    Settings are read-only from outside: assigning one raises, so code
+    can rely on values never changing except through ``reload()``.
+    """
+    
+    def __getattr__(cls, name):
+        alias = cls._ALIASES.get(name)
+        if alias is not None:
+            return getattr(cls, alias)
+        if name not in cls._SETTINGS:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+        
+        value = cls._load_setting(name)
+        type.__setattr__(cls, name, value)
+        return value
+    
+    def __setattr__(cls, name, value):
+        if name in cls._SETTINGS or name in cls._ALIASES:
+            raise AttributeError(f"Setting '{name}' is read-only; set its environment variable and call reload()")
+        super().__setattr__(name, value)
+    
+    def _load_setting(cls, name):
+        """Read and convert one setting from the environment."""
+        key, default, convert = cls._SETTINGS[name]
+        raw = _env.get(key)
+        if raw is None:
+            return default() if callable(default) else default
+        try:
+            return convert(raw)
+        except ValueError:
+            raise ValueError(f"Invalid value for {key}: {raw!r}") from None
+
+
+class Config(metaclass=_LazySettings):
+    """Configuration settings for the application.
+    
+    All settings live on the class; instances carry no state of their own.
+    """
+    
+    __slots__ = ()
+    
+    # Setting name -> (environment variable, default, converter for values
+    # taken from the environment)
+    _SETTINGS = {
+        # Database settings
+        "DATABASE_TYPE": ("SPACK_INSTALLER_DB_TYPE", "json", str.lower),  # "json" or "sqlite"
+        "DATABASE_URL": ("SPACK_INSTALLER_DB_URL", None, str),
+        "DATABASE_PATH": ("SPACK_INSTALLER_DB_PATH", _default_database_path, str),
+        
+        # Spack configuration
+        "SPACK_SETUP_SCRIPT": ("SPACK_SETUP_SCRIPT", "/opt/spack/setup-env.sh", str),
+        
+        # Worker settings
+        "WORKER_CHECK_INTERVAL": ("WORKER_CHECK_INTERVAL", 10.0, float),
+        "WORKER_HEARTBEAT_INTERVAL": ("WORKER_HEARTBEAT_INTERVAL", 30.0, float),
+        
+        # Job settings
+        "DEFAULT_JOB_TIMEOUT_MULTIPLIER": ("JOB_TIMEOUT_MULTIPLIER", 2.0, float),
+        "MAX_WORKER_HEARTBEAT_AGE": ("MAX_WORKER_HEARTBEAT_AGE", 60.0, float),
+        
+        # Server settings (for multi-user mode)
+        "SERVER_HOST": ("SPACK_INSTALLER_SERVER_HOST", "localhost", str),
+        "SERVER_PORT": ("SPACK_INSTALLER_SERVER_PORT", 8080, int),
+        "SERVER_SOCKET_PATH": ("SPACK_INSTALLER_SERVER_SOCKET", "/tmp/spack_installer.sock", str),
+        "USE_UNIX_SOCKET": ("SPACK_INSTALLER_USE_UNIX_SOCKET", True, _parse_bool),
+        "MULTI_USER_DATABASE_PATH": ("SPACK_INSTALLER_MULTI_USER_DB", "/tmp/jobs.json", str),
+        
+        # Retry settings
+        "DEFAULT_MAX_RETRIES": ("SPACK_INSTALLER_MAX_RETRIES", 3, int),
+        "RETRY_BACKOFF_FACTOR": ("SPACK_INSTALLER_RETRY_BACKOFF", 2.0, float),
+        "DEFAULT_RETRY_DELAY": ("SPACK_INSTALLER_RETRY_DELAY", 60.0, float),
+        "RETRY_CHECK_INTERVAL": ("SPACK_INSTALLER_RETRY_CHECK_INTERVAL", 300.0, float),
+    }
+    
+    # Legacy setting names kept for compatibility -> current setting.
+    # Resolved on every access, so they always match the current value.
+    _ALIASES = {
+        "MAX_JOB_RETRIES": "DEFAULT_MAX_RETRIES",
+        "RETRY_BASE_DELAY": "DEFAULT_RETRY_DELAY",
+    }
+    
+    # Resolved spack executable, cached after the first successful lookup
+    _spack_executable: Optional[str] = None
+    
+    # The single Config instance, returned by every Config() call
+    _instance: Optional["Config"] = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def __getattr__(self, name):
+        # Settings not read yet are loaded through the class
+        return getattr(type(self), name)
+    
+    @classmethod
+    def reload(cls) -> None:
+        """Re-read settings from the environment.
+        
+        Settings that were already loaded are parsed again before any is
+        replaced, so an invalid value raises and leaves the configuration
+        unchanged. Settings not used yet stay unloaded. Cached spack
+        lookups are cleared as well.
+        """
+        loaded = [name for name in cls._SETTINGS if name in vars(cls)]
+        values = {name: cls._load_setting(name) for name in loaded}
+        for name, value in values.items():
+            type.__setattr__(cls, name, value)
+        cls.clear_spack_cache()
     
     @classmethod
     def get_database_path(cls) -> str:
@@ -48,7 +157,7 @@ class Config:
     @classmethod
     def get_database_type(cls) -> str:
         """Get the database type (json or sqlite)."""
-        return cls.DATABASE_TYPE.lower()
+        return cls.DATABASE_TYPE
     
     @classmethod
     def get_database_url(cls) -> Optional[str]:
@@ -62,9 +171,52 @@ class Config:
     
     @classmethod
     def validate_spack_setup(cls) -> bool:
-        """Check if the spack setup script exists."""
-        setup_script = cls.get_spack_setup_script()
-        return os.path.isfile(setup_script)
+        """Check if the spack setup script exists.
+        
+        Once the script has been found, later calls return True without
+        touching the filesystem.
+        """
+        setup_script = cls.SPACK_SETUP_SCRIPT
+        if setup_script in _found_setup_scripts:
+            return True
+        if _isfile(setup_script):
+            _found_setup_scripts.add(setup_script)
+            return True
+        return False
+    
+    @classmethod
+    def clear_spack_cache(cls) -> None:
+        """Forget cached spack lookups so they are repeated on next use."""
+        _found_setup_scripts.clear()
+        cls._spack_executable = None
+    
+    @classmethod
+    def get_spack_executable(cls) -> Optional[str]:
+        """Locate the spack executable that belongs to the setup script.
+        
+        The setup script normally lives in ``$SPACK_ROOT/share/spack``, so
+        the executable is looked for in the ``bin`` directory of that
+        checkout, then next to the script, then under ``$SPACK_ROOT``.
+        
+        Returns:
+            Path to the spack executable, or None if it cannot be found
+        """
+        if cls._spack_executable is None:
+            setup_dir = os.path.dirname(os.path.abspath(cls.SPACK_SETUP_SCRIPT))
+            candidates = [
+                os.path.join(setup_dir, "..", "..", "bin", "spack"),
+                os.path.join(setup_dir, "bin", "spack"),
+            ]
+            spack_root = os.getenv("SPACK_ROOT")
+            if spack_root:
+                candidates.append(os.path.join(spack_root, "bin", "spack"))
+            
+            for candidate in candidates:
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    cls._spack_executable = os.path.normpath(candidate)
+                    break
+        
+        return cls._spack_executable
     
     @classmethod
     def get_server_host(cls) -> str:
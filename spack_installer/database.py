@@ -2,16 +2,299 @@
 
 import os
 import json
+import atexit
+import bisect
+import logging
+import shutil
+import itertools
 import threading
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Generator
-from contextlib import contextmanager
-from .models import JobStatus, JobPriority
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Generator, Tuple
+from contextlib import contextmanager, ExitStack
+from .enums import JobStatus, JobPriority
 from .config import config
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Layout version of the database file. Version 2 stores every retry field
+# on every job and keeps logs in the separate log file.
+SCHEMA_VERSION = 2
+
+# Statuses of jobs that hold their package in the queue
+_ACTIVE_STATUSES = frozenset({JobStatus.PENDING.value, JobStatus.RUNNING.value})
+
+# Statuses of finished jobs, which cleanup may remove
+_FINISHED_STATUSES = frozenset({
+    JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value
+})
+
+# Enum members by their stored string values
+_PRIORITY_MAP = {priority.value: priority for priority in JobPriority}
+_STATUS_MAP = {status.value: status for status in JobStatus}
+
 # Default database path from config
 DEFAULT_DB_PATH = config.get_database_path()
 
+# Buffered job log entries are written at least this often (seconds)...
+LOG_FLUSH_INTERVAL = 0.25
+
+# ...or as soon as this many are waiting
+LOG_FLUSH_BATCH = 1000
+
+# Bytes read from the end of the log file per step when finding the last entry
+LOG_TAIL_CHUNK = 4096
+
+# The journal is folded into a new database snapshot once it grows past the
+# snapshot's size, or this many bytes if the snapshot is smaller
+JOURNAL_MIN_COMPACT_BYTES = 65536
+
+# Timestamps are stored as integer milliseconds since the Unix epoch (UTC)
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+_DAY_MS = 86400000
+
+
+def _now_ms() -> int:
+    """Return the current time as a stored timestamp."""
+    return time.time_ns() // 1000000
+
+
+def _to_epoch_ms(value: datetime) -> int:
+    """Convert a datetime (naive values are taken as UTC) to a stored timestamp."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MILLISECOND
+
+
+def _retry_defaults() -> Dict[str, Any]:
+    """Return the values of retry fields missing from jobs stored by older versions."""
+    return {
+        'retry_count': 0,
+        'max_retries': config.DEFAULT_MAX_RETRIES,
+        'last_retry_at': None,
+        'retry_delay': config.DEFAULT_RETRY_DELAY,
+        'is_retry': False,
+        'original_job_id': None
+    }
+
+
+@contextmanager
+def _flock(path: str, shared: bool, create: bool = True):
+    """Hold an advisory lock on the lock file at ``path``.
+    
+    Without fcntl, or when the lock file cannot be opened (or does not
+    exist and ``create`` is false), nothing is locked.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            if not create:
+                raise
+            fd = os.open(path, os.O_RDONLY | os.O_CREAT, 0o666)
+    except OSError:
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+class SchedulerJob:
+    """Lightweight job object the scheduler works on.
+    
+    Slots keep the many short-lived instances built per queue poll smaller
+    and faster to create than objects with an attribute dictionary.
+    """
+    
+    __slots__ = (
+        "id", "package_name", "priority", "estimated_time",
+        "dependencies_list", "submitted_at", "status"
+    )
+    
+    def __init__(
+        self,
+        id: int,
+        package_name: str,
+        priority: JobPriority,
+        estimated_time: float,
+        dependencies_list: List[str],
+        submitted_at: Optional[datetime],
+        status: JobStatus
+    ):
+        self.id = id
+        self.package_name = package_name
+        self.priority = priority
+        self.estimated_time = estimated_time
+        self.dependencies_list = dependencies_list
+        self.submitted_at = submitted_at
+        self.status = status
+    
+    def __repr__(self) -> str:
+        return f"SchedulerJob(id={self.id!r}, package_name={self.package_name!r}, status={self.status!r})"
+
+
+def scheduler_job(job: Dict[str, Any], submitted_at: Optional[datetime]) -> SchedulerJob:
+    """Build the scheduler's object for a job.
+    
+    Args:
+        job: Job dictionary, as stored or as returned by the database
+        submitted_at: The job's submission time
+        
+    Returns:
+        SchedulerJob for the job
+    """
+    return SchedulerJob(
+        job['id'],
+        job['package_name'],
+        # Unknown values fall back to the defaults
+        _PRIORITY_MAP.get(job['priority'], JobPriority.MEDIUM),
+        job['estimated_time'],
+        job['dependencies_list'] or [],
+        # Used for the age calculation in the scheduler
+        submitted_at,
+        _STATUS_MAP.get(job['status'], JobStatus.PENDING)
+    )
+
+
+class _ReadWriteLock:
+    """Lock allowing either many concurrent readers or a single writer.
+    
+    Waiting writers hold off new readers, so a steady stream of reads
+    cannot starve them.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read_lock(self):
+        """Hold the lock shared with other readers."""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write_lock(self):
+        """Hold the lock exclusively."""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class _ShardedReadWriteLock:
+    """Reader/writer lock split into per-thread shards.
+    
+    Each thread reads through its own shard, so concurrent readers do not
+    all contend on one mutex; a writer takes every shard, in a fixed order.
+    """
+    
+    def __init__(self, shards: int = None):
+        count = shards or min(8, os.cpu_count() or 1)
+        self._shards = [_ReadWriteLock() for _ in range(count)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+    
+    def read_lock(self):
+        """Hold this thread's shard shared with other readers."""
+        index = getattr(self._local, 'shard', None)
+        if index is None:
+            # Hand shards out round-robin as threads first read
+            index = self._local.shard = next(self._next_shard) % len(self._shards)
+        return self._shards[index].read_lock()
+    
+    @contextmanager
+    def write_lock(self):
+        """Hold every shard exclusively."""
+        with ExitStack() as stack:
+            for shard in self._shards:
+                stack.enter_context(shard.write_lock())
+            yield
+
+
+class _JobIndex:
+    """Lookup tables over the jobs of one parsed database snapshot."""
+    
+    def __init__(self, data: Dict[str, Any]):
+        jobs = data["jobs"]
+        self.jobs = jobs
+        # Older layouts may lack retry fields, which readers then fill in
+        self.migrated = data.get("schema_version", 1) >= SCHEMA_VERSION
+        self.by_id = {job["id"]: job for job in jobs}
+        self.by_status = by_status = {status.value: [] for status in JobStatus}
+        
+        # Bound append methods keep attribute lookups out of the loop
+        appenders = {status: bucket.append for status, bucket in by_status.items()}
+        for job in jobs:
+            status = job["status"]
+            append = appenders.get(status)
+            if append is None:
+                append = appenders[status] = by_status.setdefault(status, []).append
+            append(job)
+        
+        self.completed_packages = {job["package_name"] for job in by_status[JobStatus.COMPLETED.value]}
+        
+        # Newest-first orderings, keyed by status value (None for all jobs)
+        self._newest_first: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    
+    def newest_first(self, status: Optional[str], stored_ms) -> List[Dict[str, Any]]:
+        """Return jobs ordered by submission time, newest first.
+        
+        Each ordering is sorted once per snapshot and then shared by every
+        read of it. Jobs are stored in id order, which nearly always matches
+        submission order, so the sort itself is close to linear.
+        
+        Args:
+            status: Status value to select, or None for all jobs
+            stored_ms: Converts a stored timestamp to epoch milliseconds
+            
+        Returns:
+            The jobs, which must not be modified
+        """
+        ordered = self._newest_first.get(status)
+        if ordered is None:
+            selected = self.jobs if status is None else self.by_status.get(status, ())
+            # Timestamps have millisecond resolution, so break ties with
+            # the (monotonic) job id
+            ordered = sorted(selected, key=lambda x: (stored_ms(x['submitted_at']), x['id']), reverse=True)
+            self._newest_first[status] = ordered
+        return ordered
+
 
 class JSONDatabase:
     """JSON-based database for storing job and worker information."""
@@ -24,69 +307,646 @@ class JSONDatabase:
         """
         self.db_path = db_path or DEFAULT_DB_PATH
         
+        # Job logs live in an append-only JSON-lines file beside the database,
+        # so adding a log entry never rewrites the jobs
+        self.log_path = os.path.splitext(self.db_path)[0] + ".logs.jsonl"
+        
+        # Changes since the database file was last written, one JSON line
+        # per write transaction
+        self.journal_path = os.path.splitext(self.db_path)[0] + ".journal.jsonl"
+        
+        # Previous version of the database file, kept by every write
+        self.backup_path = self.db_path + ".bak"
+        
         # Ensure directory exists
         db_dir = os.path.dirname(self.db_path)
         os.makedirs(db_dir, exist_ok=True)
         
-        # Thread lock for concurrent access
-        self._lock = threading.RLock()
+        # Writers are exclusive; log readers run concurrently. The lock file
+        # extends writer exclusion to other processes using the database.
+        self._lock = _ShardedReadWriteLock()
+        self._lock_path = self.db_path + ".lock"
+        
+        # Parsed data shared by readers, keyed on the file's stat signature.
+        # A published entry is never modified, so readers use it without
+        # taking a lock; writers work on a copy and publish a new entry.
+        self._cache = None
+        
+        # Data of the write transaction held open by this thread's batch()
+        self._batch = threading.local()
+        
+        # Log entries from add_job_log waiting to be appended to the log
+        # file. Any write transaction persists them; a background thread
+        # flushes the rest.
+        self._log_buffer = deque()
+        self._log_buffer_lock = threading.Lock()
+        self._log_flush_wakeup = threading.Event()
+        self._log_flush_thread = None
+        atexit.register(self.flush_logs)
+        
+        # Reused across writes; json.dumps with options builds a new
+        # encoder per call
+        self._encoder = json.JSONEncoder(separators=(',', ':'), default=self._json_serializer)
         
-        # Initialize database if it doesn't exist
-        self._initialize_db()
+        # Raw log file lines bucketed by job: [inode, bytes read, {job_id: lines}]
+        self._log_index = None
+        self._log_index_lock = threading.Lock()
+        
+        # (inode, size, last entry id) of the log file after this process's
+        # last append, so the next append need not read the file's tail
+        self._log_tail = None
+        
+        # Incremented by every operation that changes the data, so callers
+        # can tell whether results they cached are still current
+        self.generation = 0
+        
+        # Values for retry fields missing from jobs stored by older versions
+        self._retry_defaults = _retry_defaults()
+        
+        # Initialize database if it doesn't exist. The file lock keeps
+        # processes opening a new database at once from replacing each
+        # other's first writes.
+        if not os.path.exists(self.db_path):
+            with self._file_lock(shared=False):
+                self._initialize_db()
+        self._migrate()
     
     def _initialize_db(self):
         """Initialize the database file if it doesn't exist."""
         if not os.path.exists(self.db_path):
             initial_data = {
+                "schema_version": SCHEMA_VERSION,
                 "jobs": [],
-                "logs": [],
+                "active_packages": {},
                 "worker_status": None,
                 "next_job_id": 1
             }
             self._write_data(initial_data)
     
+    def _migrate(self):
+        """Bring a database written by an older version up to SCHEMA_VERSION.
+        
+        Runs once when the database is opened, so the per-job compatibility
+        work is not repeated on every read. Users who cannot write the
+        database keep reading the old layout.
+        """
+        data = self._load_cached()
+        if data.get("schema_version", 1) >= SCHEMA_VERSION:
+            return
+        try:
+            with self._lock.write_lock(), self._file_lock(shared=False):
+                data = self._read_data()
+                if data.get("schema_version", 1) >= SCHEMA_VERSION:
+                    return
+                
+                # Move embedded logs to the log file
+                legacy_logs = data.pop("logs", None)
+                if legacy_logs:
+                    self._append_logs(legacy_logs)
+                
+                # Add retry fields to jobs that predate them
+                for job in data["jobs"]:
+                    for field, default in self._retry_defaults.items():
+                        job.setdefault(field, default)
+                
+                self._active_packages(data)
+                data["schema_version"] = SCHEMA_VERSION
+                self._cache = None
+                self._write_data(data)
+        except PermissionError:
+            pass
+    
     def _read_data(self) -> Dict[str, Any]:
-        """Read data from JSON file."""
+        """Read data from JSON file and apply the journal to it.
+        
+        Raises:
+            json.JSONDecodeError: If the file and its backup are both corrupted
+        """
+        data = self._read_snapshot()
+        self._replay_journal(data)
+        return data
+    
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Read the database file as last written in full."""
         try:
-            with open(self.db_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # If file doesn't exist or is corrupted, reinitialize
+            return self._parse_snapshot(self.db_path, self.backup_path)
+        except FileNotFoundError:
+            # If file doesn't exist, reinitialize
             self._initialize_db()
-            with open(self.db_path, 'r') as f:
-                return json.load(f)
+            return self._load_file(self.db_path)
+    
+    @classmethod
+    def _parse_snapshot(cls, path: str, backup_path: str) -> Dict[str, Any]:
+        """Parse the database file, falling back to its backup if it is corrupted.
+        
+        Raises:
+            FileNotFoundError: If the database file does not exist
+            json.JSONDecodeError: If the file and its backup are both corrupted
+        """
+        try:
+            return cls._load_file(path)
+        except json.JSONDecodeError:
+            # Fall back to the copy kept by the previous write rather than
+            # discarding the database
+            try:
+                return cls._load_file(backup_path)
+            except (OSError, json.JSONDecodeError):
+                pass
+            raise
+    
+    @classmethod
+    def _load_file(cls, path: str) -> Dict[str, Any]:
+        """Parse a JSON file, using orjson when it is installed."""
+        with open(path, 'rb') as f:
+            return cls._parse(f.read())
+    
+    @staticmethod
+    def _parse(data: bytes) -> Any:
+        """Parse JSON bytes, using orjson when it is installed.
+        
+        Raises:
+            json.JSONDecodeError: If the data is not valid JSON
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    def _serialize(self, data: Dict[str, Any]) -> bytes:
+        """Encode the data as compact JSON, using orjson when it is installed."""
+        if orjson is not None:
+            # Hand datetimes to the serializer instead of orjson's own ISO output
+            return orjson.dumps(
+                data,
+                default=self._json_serializer,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        return self._encoder.encode(data).encode('utf-8')
     
     def _write_data(self, data: Dict[str, Any]):
-        """Write data to JSON file."""
-        with open(self.db_path, 'w') as f:
-            json.dump(data, f, indent=2, default=self._json_serializer)
+        """Write data to JSON file.
+        
+        The data is written and fsynced to a temporary file that then
+        replaces the database, so a crash mid-write never leaves a truncated
+        file. The directory is fsynced as well, so the rename itself is
+        durable. The replaced version is kept as the backup.
+        
+        The data gets a new ``snapshot_id`` and the journal is emptied, as
+        the file now holds every change. Journal records are tagged with the
+        snapshot they apply to, so any left behind are ignored.
+        """
+        data["snapshot_id"] = data.get("snapshot_id", 0) + 1
+        payload = self._serialize(data)
+        temp_path = f"{self.db_path}.tmp.{os.getpid()}"
+        try:
+            f = open(temp_path, 'wb')
+        except PermissionError:
+            # The directory is not writable, as with a shared database whose
+            # file alone is writable by all users; rewrite it in place
+            with open(self.db_path, 'wb') as f:
+                f.write(payload)
+            self._truncate_journal()
+            return
+        
+        try:
+            with f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(self.db_path):
+                self._copy_mode(self.db_path, temp_path)
+                self._link_backup()
+            os.replace(temp_path, self.db_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._fsync_directory()
+        self._truncate_journal()
+    
+    def _fsync_directory(self):
+        """Flush the database directory's entries to disk, ignoring failures.
+        
+        Not every platform or filesystem supports fsync on a directory.
+        """
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.db_path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def _truncate_journal(self):
+        """Empty the journal after a full write, ignoring failures."""
+        try:
+            os.truncate(self.journal_path, 0)
+        except OSError:
+            pass
+    
+    def _persist(self, cache: list, data: Dict[str, Any]):
+        """Store the result of a write transaction.
+        
+        Only the jobs and top-level values that changed since the cached
+        data are appended to the journal. The whole file is rewritten
+        instead when jobs were removed, when the journal has outgrown the
+        file, or when the journal cannot be written.
+        
+        Args:
+            cache: Cache entry the transaction started from
+            data: Data the transaction produced
+        """
+        (_, snapshot_size, _), journal = cache[0]
+        if journal is not None and journal[1] > max(snapshot_size, JOURNAL_MIN_COMPACT_BYTES):
+            self._write_data(data)
+            return
+        
+        record = self._journal_record(cache, data)
+        if record is None or not self._append_journal(record):
+            self._write_data(data)
+    
+    @staticmethod
+    def _journal_record(cache: list, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Describe how ``data`` differs from the cached data.
+        
+        Args:
+            cache: Cache entry the transaction started from
+            data: Data the transaction produced
+            
+        Returns:
+            A journal record holding the new or changed jobs and top-level
+            values, an empty record if nothing changed, or None if the
+            change cannot be journaled (jobs or top-level keys were removed).
+            Top-level dictionaries such as ``active_packages`` are recorded
+            as the entries that changed ("merge") and were removed ("drop").
+        """
+        old = cache[1]
+        if cache[2] is not None:
+            old_by_id = cache[2].by_id
+        else:
+            old_by_id = {job["id"]: job for job in old["jobs"]}
+        
+        changed_jobs = []
+        kept = 0
+        for job in data["jobs"]:
+            previous = old_by_id.get(job["id"])
+            if previous is not None:
+                kept += 1
+                # Jobs the write did not touch are still shared
+                if previous is job or previous == job:
+                    continue
+            changed_jobs.append(job)
+        if kept < len(old["jobs"]) or not old.keys() <= data.keys():
+            return None
+        
+        changed_values = {}
+        merged = {}
+        dropped = {}
+        for key, value in data.items():
+            if key == "jobs" or (key in old and old[key] == value):
+                continue
+            previous = old.get(key)
+            if isinstance(value, dict) and isinstance(previous, dict):
+                merged[key] = {k: v for k, v in value.items() if k not in previous or previous[k] != v}
+                removed = [k for k in previous if k not in value]
+                if removed:
+                    dropped[key] = removed
+            else:
+                changed_values[key] = value
+        
+        if not (changed_jobs or changed_values or merged):
+            return {}
+        return {
+            "base": data.get("snapshot_id", 0),
+            "jobs": changed_jobs,
+            "set": changed_values,
+            "merge": merged,
+            "drop": dropped,
+        }
+    
+    def _append_journal(self, record: Dict[str, Any]) -> bool:
+        """Append a record to the journal and fsync it.
+        
+        Returns:
+            True if the record was written (or was empty), False if the
+            journal could not be opened
+        """
+        if not record:
+            return True
+        line = self._serialize(record) + b"\n"
+        created = not os.path.exists(self.journal_path)
+        try:
+            f = open(self.journal_path, 'a+b')
+        except OSError:
+            return False
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                # Terminate a line left incomplete by an interrupted write
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        if created:
+            self._copy_mode(self.db_path, self.journal_path)
+        return True
+    
+    def _replay_journal(self, data: Dict[str, Any], offset: int = 0):
+        """Apply journal records from ``offset`` on to ``data`` in place.
+        
+        Changed jobs replace the stored job with the same ID, and new ones
+        are appended. Dictionaries are replaced rather than updated, since
+        ``data`` may share them with a published snapshot. Records written
+        against another snapshot, and lines that do not parse, are skipped.
+        """
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            chunk = f.read()
+        self._apply_journal(data, chunk)
+    
+    @classmethod
+    def _apply_journal(cls, data: Dict[str, Any], chunk: bytes):
+        """Apply the journal records in ``chunk`` to ``data`` in place."""
+        snapshot_id = data.get("snapshot_id", 0)
+        jobs = data["jobs"]
+        positions = None
+        for line in chunk.splitlines():
+            try:
+                record = cls._parse(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("base") != snapshot_id:
+                continue
+            if record["jobs"] and positions is None:
+                positions = {job["id"]: i for i, job in enumerate(jobs)}
+            for job in record["jobs"]:
+                position = positions.get(job["id"])
+                if position is None:
+                    positions[job["id"]] = len(jobs)
+                    jobs.append(job)
+                else:
+                    jobs[position] = job
+            data.update(record["set"])
+            for key, changes in record["merge"].items():
+                merged = {**data[key], **changes}
+                for removed in record["drop"].get(key, ()):
+                    merged.pop(removed, None)
+                data[key] = merged
+    
+    def _link_backup(self):
+        """Point the backup at the current database file before it is replaced.
+        
+        A hard link costs no copying. The backup is best effort, so failures
+        (e.g. on filesystems without hard links) are ignored.
+        """
+        try:
+            try:
+                os.unlink(self.backup_path)
+            except FileNotFoundError:
+                pass
+            os.link(self.db_path, self.backup_path)
+        except OSError:
+            pass
     
     def _json_serializer(self, obj):
-        """Custom JSON serializer for datetime objects."""
+        """Custom JSON serializer storing datetime objects as epoch milliseconds."""
         if isinstance(obj, datetime):
-            return obj.isoformat()
+            return _to_epoch_ms(obj)
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
     
-    def _parse_datetime(self, dt_str: str) -> Optional[datetime]:
-        """Parse datetime string back to datetime object."""
-        if not dt_str:
+    @staticmethod
+    def _to_stored(value):
+        """Convert a datetime to its stored form; other values pass through."""
+        if isinstance(value, datetime):
+            return _to_epoch_ms(value)
+        return value
+    
+    def _stored_ms(self, value) -> int:
+        """Return a stored timestamp as epoch milliseconds, or 0 if unset or invalid."""
+        if isinstance(value, int):
+            return value
+        parsed = self._parse_datetime(value)
+        return _to_epoch_ms(parsed) if parsed else 0
+    
+    @staticmethod
+    def _parse_datetime(value) -> Optional[datetime]:
+        """Convert a stored timestamp back to a datetime object.
+        
+        Accepts epoch milliseconds as well as the ISO strings written by
+        older versions.
+        """
+        if value is None or value == "":
             return None
+        if isinstance(value, int):
+            # Integer days/seconds/microseconds skip the float normalization
+            # timedelta does for a milliseconds= argument
+            seconds, milliseconds = divmod(value, 1000)
+            return _EPOCH + timedelta(0, seconds, milliseconds * 1000)
         try:
-            return datetime.fromisoformat(dt_str)
+            return datetime.fromisoformat(value)
         except (ValueError, TypeError):
             return None
     
-    @contextmanager
-    def _transaction(self):
-        """Context manager for thread-safe database operations."""
-        with self._lock:
+    def _file_signature(self):
+        """Return a value that changes whenever the database file is rewritten
+        or the journal is appended to.
+        """
+        st = os.stat(self.db_path)
+        try:
+            journal_st = os.stat(self.journal_path)
+            journal = (journal_st.st_ino, journal_st.st_size)
+        except FileNotFoundError:
+            journal = None
+        return ((st.st_mtime_ns, st.st_size, st.st_ino), journal)
+    
+    def _file_lock(self, shared: bool):
+        """Hold an advisory lock on the database's lock file.
+        
+        Writers take it exclusively for the whole read-modify-write, and
+        readers take it shared while parsing, so no process sees another's
+        half-written file. Without fcntl, or when the lock file cannot be
+        opened, only in-process locking applies.
+        """
+        return _flock(self._lock_path, shared)
+    
+    def _current_cache(self) -> Optional[list]:
+        """Return the cache entry if the file has not changed since it was cached.
+        
+        Entries are ``[signature, data, index]``; the index is built on
+        first use.
+        """
+        cache = self._cache
+        if cache is not None:
+            try:
+                if cache[0] == self._file_signature():
+                    return cache
+            except FileNotFoundError:
+                pass
+        return None
+    
+    def _load_snapshot(self):
+        """Return the parsed data and its job index.
+        
+        The file is only re-read, and the index rebuilt, if it changed.
+        """
+        cache = self._current_cache()
+        if cache is None:
+            with self._file_lock(shared=True):
+                cache = self._refresh_cache()
+        if cache[2] is None:
+            cache[2] = _JobIndex(cache[1])
+        return cache[1], cache[2]
+    
+    def _refresh_cache(self) -> list:
+        """Load the current data into a new cache entry and publish it.
+        
+        When only the journal grew since the cached data was loaded, just
+        the new records are applied, to a copy of it. Must be called with
+        the file lock held.
+        """
+        cache = self._cache
+        try:
+            signature = self._file_signature()
+        except FileNotFoundError:
+            cache = None
+        if (cache is not None and cache[0][0] == signature[0]
+                and cache[0][1] is not None and signature[1] is not None
+                and cache[0][1][0] == signature[1][0]
+                and cache[0][1][1] <= signature[1][1]):
+            data = dict(cache[1])
+            data["jobs"] = list(cache[1]["jobs"])
+            self._replay_journal(data, cache[0][1][1])
+        else:
             data = self._read_data()
+            signature = self._file_signature()
+        cache = self._cache = [signature, data, None]
+        return cache
+    
+    def _load_cached(self) -> Dict[str, Any]:
+        """Return the parsed data, re-reading the file only if it changed."""
+        return self._load_snapshot()[0]
+    
+    @contextmanager
+    def _read_transaction(self):
+        """Context manager for read-only database operations.
+        
+        Nothing is written back. The yielded data is a published snapshot
+        shared with other readers and must not be modified. No lock is
+        taken: a write in progress publishes a new snapshot rather than
+        changing this one.
+        """
+        yield self._load_cached()
+    
+    @contextmanager
+    def _read_index(self):
+        """Like _read_transaction, but yields the job index of the data."""
+        yield self._load_snapshot()[1]
+    
+    @contextmanager
+    def _write_transaction(self):
+        """Context manager for database operations that modify the data.
+        
+        The data is only written back if the block completes without an
+        exception, usually as a journal record of what changed (see
+        _persist). Log entries the block adds to ``data["logs"]`` are
+        appended to the log file after the write, and callables it adds to
+        ``data["after_write"]`` are then run, still under the locks; neither
+        happens if the write fails.
+        
+        The block works on a copy of the cached data when the file is
+        unchanged, and the written data becomes the new cache, so a process
+        that writes does not re-parse its own changes. Blocks must therefore
+        store only values that survive a JSON round trip unchanged
+        (timestamps as epoch milliseconds, lists rather than tuples).
+        
+        Inside a batch() the block joins the batch's transaction instead.
+        """
+        batch_data = getattr(self._batch, 'data', None)
+        if batch_data is not None:
+            yield batch_data
+            return
+        
+        with self._lock.write_lock(), self._file_lock(shared=False):
+            cache = self._current_cache() or self._refresh_cache()
+            data = self._copy_for_write(cache[1])
+            
+            data["logs"] = []
+            data["after_write"] = []
+            yield data
+            new_logs = data.pop("logs")
+            after_write = data.pop("after_write")
+            self._persist(cache, data)
+            self._cache = [self._file_signature(), data, None]
+            self._append_logs(new_logs)
+            for action in after_write:
+                action()
+    
+    @staticmethod
+    def _copy_for_write(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy published data so a write block can modify it.
+        
+        Readers keep using the original until the new data is published.
+        Only the job list is copied: its job dictionaries are shared until
+        a write block looks one up with ``_find_job``, which copies just
+        that job. A write therefore costs one list copy, not a copy of
+        every job.
+        """
+        copy = dict(data)
+        copy["jobs"] = list(data["jobs"])
+        for key in ("active_packages", "worker_status"):
+            if isinstance(data.get(key), dict):
+                copy[key] = dict(data[key])
+        return copy
+    
+    @contextmanager
+    def batch(self):
+        """Group several modifications into one write transaction.
+        
+        Modifying methods such as update_job_status, add_job_log and
+        update_worker_status called by this thread inside the block share a
+        single transaction: they are persisted with one write, and none of
+        them take effect if the block raises. Reads inside the block see the
+        data as it was before the batch.
+        
+        flush_logs() and get_job_logs() must not be called inside the
+        block: they take the write lock, which is not reentrant and which
+        the batch already holds.
+        
+        Yields:
+            This database
+        """
+        if getattr(self._batch, 'data', None) is not None:
+            yield self
+            return
+        
+        with self._mutation() as data:
+            self._batch.data = data
             try:
-                yield data
-                self._write_data(data)
-            except Exception:
-                # Don't save if there's an error
-                raise
+                yield self
+            finally:
+                self._batch.data = None
+    
+    @contextmanager
+    def _mutation(self):
+        """Transaction for operations that modify the data.
+        
+        Bumps ``generation`` once the operation has been written and its
+        data published. Bumping earlier would let a lock-free reader pair
+        the new generation with the old data.
+        """
+        with self._write_transaction() as data:
+            yield data
+        self.generation += 1
     
     def create_job(
         self,
@@ -99,120 +959,196 @@ class JSONDatabase:
         resource_requirements: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """Create a new job and return its data as a dictionary."""
-        with self._transaction() as data:
-            # Check if package is already queued or installed
-            existing_job = None
-            for job in data["jobs"]:
-                if (job["package_name"] == package_name and 
-                    job["status"] in ["pending", "running"]):
-                    existing_job = job
-                    break
-            
-            if existing_job:
-                raise ValueError(f"Package '{package_name}' is already queued or being installed (Job ID: {existing_job['id']})")
-            
-            # Create new job
-            job_id = data["next_job_id"]
-            data["next_job_id"] += 1
-            
-            job = {
-                'id': job_id,
-                'package_name': package_name,
-                'priority': priority.value,
-                'status': JobStatus.PENDING.value,
-                'estimated_time': estimated_time,
-                'actual_time': None,
-                'submitted_by': submitted_by,
-                'submitted_at': datetime.utcnow(),
-                'started_at': None,
-                'completed_at': None,
-                'spack_command': spack_command,
-                'error_message': None,
-                'dependencies_list': dependencies or [],
-                'resource_requirements_dict': resource_requirements or {}
-            }
+        with self._mutation() as data:
+            return self._insert_job(
+                data,
+                package_name=package_name,
+                priority=priority,
+                estimated_time=estimated_time,
+                submitted_by=submitted_by,
+                spack_command=spack_command,
+                dependencies=dependencies,
+                resource_requirements=resource_requirements
+            )
+    
+    def create_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several jobs in a single transaction.
+        
+        Args:
+            jobs: List of keyword-argument dicts as accepted by create_job
             
-            data["jobs"].append(job)
+        Returns:
+            List of created job dictionaries, in input order
             
-            # Add log entry
-            log_entry = {
-                'id': len(data["logs"]) + 1,
-                'job_id': job_id,
-                'timestamp': datetime.utcnow(),
-                'level': "INFO",
-                'message': f"Job submitted for package '{package_name}'"
+        Raises:
+            ValueError: If any package is already queued; no jobs are created
+        """
+        with self._mutation() as data:
+            return [self._insert_job(data, **job) for job in jobs]
+    
+    def _insert_job(
+        self,
+        data: Dict[str, Any],
+        package_name: str,
+        priority: JobPriority,
+        estimated_time: float,
+        submitted_by: str,
+        spack_command: str = None,
+        dependencies: List[str] = None,
+        resource_requirements: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Insert a new job into already-loaded data."""
+        # Check if package is already queued or installed
+        active_packages = self._active_packages(data)
+        if package_name in active_packages:
+            raise ValueError(f"Package '{package_name}' is already queued or being installed (Job ID: {active_packages[package_name]})")
+        
+        # Create new job
+        job_id = data["next_job_id"]
+        data["next_job_id"] += 1
+        now = _now_ms()
+        
+        job = {
+            'id': job_id,
+            'package_name': package_name,
+            'priority': priority.value,
+            'status': JobStatus.PENDING.value,
+            'estimated_time': estimated_time,
+            'actual_time': None,
+            'submitted_by': submitted_by,
+            'submitted_at': now,
+            'started_at': None,
+            'completed_at': None,
+            'spack_command': spack_command,
+            'error_message': None,
+            'dependencies_list': list(dependencies or []),
+            'resource_requirements_dict': dict(resource_requirements or {}),
+            **self._retry_defaults
+        }
+        
+        data["jobs"].append(job)
+        active_packages[package_name] = job_id
+        
+        # Add log entry
+        log_entry = {
+            'job_id': job_id,
+            'timestamp': now,
+            'level': "INFO",
+            'message': f"Job submitted for package '{package_name}'"
+        }
+        data["logs"].append(log_entry)
+        
+        # Return a copy with parsed datetimes for consistency
+        job_copy = job.copy()
+        job_copy['submitted_at'] = self._parse_datetime(job['submitted_at'])
+        job_copy['started_at'] = self._parse_datetime(job['started_at'])
+        job_copy['completed_at'] = self._parse_datetime(job['completed_at'])
+        
+        return job_copy
+    
+    def _active_packages(self, data: Dict[str, Any]) -> Dict[str, int]:
+        """Return the map of queued or running package names to their job ID.
+        
+        The map is stored with the data so that checking for an already
+        queued package does not scan every job. Databases written before it
+        existed get it rebuilt here once.
+        """
+        active_packages = data.get("active_packages")
+        if active_packages is None:
+            active_packages = data["active_packages"] = {
+                job["package_name"]: job["id"]
+                for job in data["jobs"]
+                if job["status"] in _ACTIVE_STATUSES
             }
-            data["logs"].append(log_entry)
-            
-            # Return a copy with parsed datetimes for consistency
-            job_copy = job.copy()
-            job_copy['submitted_at'] = job['submitted_at']
-            job_copy['started_at'] = self._parse_datetime(job['started_at'])
-            job_copy['completed_at'] = self._parse_datetime(job['completed_at'])
+        return active_packages
+    
+    @staticmethod
+    def _find_job(jobs: List[Dict[str, Any]], job_id: int) -> Optional[Dict[str, Any]]:
+        """Find a job by ID in a write block's job list, ready to modify.
+        
+        Jobs are appended with increasing IDs and cleanup only removes
+        entries, so the list is searched by bisection. A linear scan covers
+        files where the order does not hold.
+        
+        The list shares its job dictionaries with the published data, so
+        the job found is replaced in the list by a copy, which is returned.
+        
+        Args:
+            jobs: The write block's job list
+            job_id: ID of the job to find
             
-            return job_copy
+        Returns:
+            The job dictionary to modify, or None if there is no such job
+        """
+        low, high = 0, len(jobs)
+        while low < high:
+            middle = (low + high) // 2
+            if jobs[middle]["id"] < job_id:
+                low = middle + 1
+            else:
+                high = middle
+        if not (low < len(jobs) and jobs[low]["id"] == job_id):
+            low = next((i for i, job in enumerate(jobs) if job["id"] == job_id), None)
+            if low is None:
+                return None
+        job = jobs[low] = jobs[low].copy()
+        return job
     
     def get_job_by_id(self, job_id: int) -> Optional[Dict[str, Any]]:
         """Get a job by ID, returning a dictionary."""
-        with self._transaction() as data:
-            for job in data["jobs"]:
-                if job["id"] == job_id:
-                    job_copy = job.copy()
-                    job_copy['submitted_at'] = self._parse_datetime(job['submitted_at'])
-                    job_copy['started_at'] = self._parse_datetime(job['started_at'])
-                    job_copy['completed_at'] = self._parse_datetime(job['completed_at'])
-                    
-                    # Add retry fields for backward compatibility
-                    if 'retry_count' not in job_copy:
-                        job_copy['retry_count'] = 0
-                    if 'max_retries' not in job_copy:
-                        job_copy['max_retries'] = config.DEFAULT_MAX_RETRIES
-                    if 'last_retry_at' not in job_copy:
-                        job_copy['last_retry_at'] = None
-                    if 'retry_delay' not in job_copy:
-                        job_copy['retry_delay'] = config.DEFAULT_RETRY_DELAY
-                    if 'is_retry' not in job_copy:
-                        job_copy['is_retry'] = False
-                    if 'original_job_id' not in job_copy:
-                        job_copy['original_job_id'] = None
-                    else:
-                        job_copy['last_retry_at'] = self._parse_datetime(job['last_retry_at'])
-                    
-                    return job_copy
-            return None
+        with self._read_index() as index:
+            job = index.by_id.get(job_id)
+            if job is None:
+                return None
+            
+            return self._job_view(job, index.migrated)
     
     def get_all_jobs(self, status: Optional[JobStatus] = None) -> List[Dict[str, Any]]:
         """Get all jobs, optionally filtered by status, returning dictionaries."""
-        with self._transaction() as data:
-            jobs = []
-            for job in data["jobs"]:
-                if status is None or job["status"] == status.value:
-                    job_copy = job.copy()
-                    job_copy['submitted_at'] = self._parse_datetime(job['submitted_at'])
-                    job_copy['started_at'] = self._parse_datetime(job['started_at'])
-                    job_copy['completed_at'] = self._parse_datetime(job['completed_at'])
-                    
-                    # Add retry fields for backward compatibility
-                    if 'retry_count' not in job_copy:
-                        job_copy['retry_count'] = 0
-                    if 'max_retries' not in job_copy:
-                        job_copy['max_retries'] = config.DEFAULT_MAX_RETRIES
-                    if 'last_retry_at' not in job_copy:
-                        job_copy['last_retry_at'] = None
-                    if 'retry_delay' not in job_copy:
-                        job_copy['retry_delay'] = config.DEFAULT_RETRY_DELAY
-                    if 'is_retry' not in job_copy:
-                        job_copy['is_retry'] = False
-                    if 'original_job_id' not in job_copy:
-                        job_copy['original_job_id'] = None
-                    else:
-                        job_copy['last_retry_at'] = self._parse_datetime(job['last_retry_at'])
-                    
-                    jobs.append(job_copy)
-            
-            # Sort by submitted_at descending
-            jobs.sort(key=lambda x: x['submitted_at'] or datetime.min, reverse=True)
-            return jobs
+        with self._read_index() as index:
+            # The ordering is computed on the stored values, before any
+            # datetime objects exist, and reused until the data changes
+            ordered = index.newest_first(status.value if status is not None else None, self._stored_ms)
+            
+            migrated = index.migrated
+            return [self._job_view(job, migrated) for job in ordered]
+    
+    def get_pending_job_objects(self) -> List[SchedulerJob]:
+        """Get pending jobs as scheduler objects, in get_all_jobs order.
+        
+        The objects are built straight from the stored jobs in one pass:
+        no job dictionaries are copied and only ``submitted_at`` is parsed.
+        """
+        with self._read_index() as index:
+            ordered = index.newest_first(JobStatus.PENDING.value, self._stored_ms)
+            parse = self._parse_datetime
+            return [scheduler_job(job, parse(job['submitted_at'])) for job in ordered]
+    
+    def _job_view(self, job: Dict[str, Any], migrated: bool = True) -> Dict[str, Any]:
+        """Build the dictionary returned for a stored job.
+        
+        The result is created in a single dict display with the timestamps
+        already parsed, rather than copying the job and then overwriting
+        its fields one by one.
+        
+        Args:
+            job: Stored job dictionary, which is left untouched
+            migrated: Whether stored jobs are known to carry the retry fields
+        
+        Returns:
+            A new job dictionary with datetime objects for its timestamps
+        """
+        parse = self._parse_datetime
+        if not migrated:
+            # Fill in retry fields for backward compatibility
+            job = {**self._retry_defaults, **job}
+        return {
+            **job,
+            'submitted_at': parse(job['submitted_at']),
+            'started_at': parse(job['started_at']),
+            'completed_at': parse(job['completed_at']),
+            'last_retry_at': parse(job['last_retry_at']),
+        }
     
     def update_job_status(
         self,
@@ -224,21 +1160,22 @@ class JSONDatabase:
         error_message=None
     ) -> bool:
         """Update job status and related fields."""
-        with self._transaction() as data:
-            job = None
-            for j in data["jobs"]:
-                if j["id"] == job_id:
-                    job = j
-                    break
-            
+        with self._mutation() as data:
+            job = self._find_job(data["jobs"], job_id)
             if not job:
                 return False
             
             job["status"] = status.value
+            active_packages = self._active_packages(data)
+            if status.value in _ACTIVE_STATUSES:
+                active_packages[job["package_name"]] = job_id
+            elif active_packages.get(job["package_name"]) == job_id:
+                del active_packages[job["package_name"]]
+            
             if started_at is not None:
-                job["started_at"] = started_at
+                job["started_at"] = self._to_stored(started_at)
             if completed_at is not None:
-                job["completed_at"] = completed_at
+                job["completed_at"] = self._to_stored(completed_at)
             if actual_time is not None:
                 job["actual_time"] = actual_time
             if error_message is not None:
@@ -250,9 +1187,8 @@ class JSONDatabase:
                 log_message += f": {error_message}"
             
             log_entry = {
-                'id': len(data["logs"]) + 1,
                 'job_id': job_id,
-                'timestamp': datetime.utcnow(),
+                'timestamp': _now_ms(),
                 'level': "ERROR" if status == JobStatus.FAILED else "INFO",
                 'message': log_message
             }
@@ -261,80 +1197,380 @@ class JSONDatabase:
             return True
     
     def get_job_logs(self, job_id: int) -> List[Dict[str, Any]]:
-        """Get logs for a specific job."""
-        with self._transaction() as data:
-            logs = []
-            for log in data["logs"]:
-                if log["job_id"] == job_id:
-                    log_copy = log.copy()
-                    log_copy['timestamp'] = self._parse_datetime(log['timestamp'])
-                    logs.append(log_copy)
-            
-            # Sort by timestamp
-            logs.sort(key=lambda x: x['timestamp'] or datetime.min)
-            return logs
+        """Get logs for a specific job.
+        
+        Flushes buffered entries first, so like flush_logs() it must not
+        be called inside batch().
+        """
+        return self.get_job_logs_page(job_id)[0]
+    
+    def get_job_logs_page(
+        self,
+        job_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get a range of a job's logs, in timestamp order.
+        
+        Only the entries in the range are converted, and only entries added
+        to the log file since the last call are parsed, so polling a job for
+        new entries costs time proportional to what is new. Flushes buffered
+        entries first, so it must not be called inside batch().
+        
+        Args:
+            job_id: ID of the job
+            offset: Number of entries to skip
+            limit: Maximum number of entries to return (all if None)
+            
+        Returns:
+            The entries, and the job's total number of entries
+        """
+        # Make entries added through add_job_log visible straight away
+        self.flush_logs()
+        
+        with self._lock.read_lock(), self._file_lock(shared=True):
+            entries = self._job_log_entries(job_id)
+            total = len(entries)
+            stop = total if limit is None else offset + limit
+            selected = entries[offset:stop]
+        
+        parse = self._parse_datetime
+        return [{**log, 'timestamp': parse(log['timestamp'])} for log in selected], total
+    
+    def _job_log_entries(self, job_id: int) -> List[Dict[str, Any]]:
+        """Return the stored log entries of one job, in timestamp order.
+        
+        The job's new lines are parsed and put in place by their stored
+        epoch milliseconds. Entries are appended roughly in order, so that
+        is almost always an append; equal timestamps keep file order. The
+        list is shared and must not be modified. Must be called with the
+        file lock held.
+        """
+        with self._log_index_lock:
+            bucket = self._job_log_bucket(job_id)
+            if bucket is None:
+                return []
+            
+            pending, keys, entries = bucket
+            stored_ms = self._stored_ms
+            for line in pending:
+                try:
+                    log = self._parse(line)
+                except json.JSONDecodeError:
+                    continue
+                key = stored_ms(log['timestamp'])
+                if not keys or key >= keys[-1]:
+                    keys.append(key)
+                    entries.append(log)
+                else:
+                    position = bisect.bisect_right(keys, key)
+                    keys.insert(position, key)
+                    entries.insert(position, log)
+            pending.clear()
+            return entries
+    
+    def _job_log_bucket(self, job_id: int) -> Optional[list]:
+        """Return the in-memory log bucket of one job, or None if it has none.
+        
+        Lines are bucketed by job as [unparsed lines, sort keys, parsed
+        entries]. Since the file is only appended to, each call reads just
+        the bytes added since the last one; the buckets are rebuilt when
+        cleanup replaces the file. Must be called with the file lock and
+        _log_index_lock held.
+        """
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            self._log_index = None
+            return None
+        
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            index = self._log_index
+            if index is None or index[0] != inode:
+                index = self._log_index = [inode, 0, {}]
+            f.seek(index[1])
+            chunk = f.read()
+        
+        # Only consume complete lines; a partial one is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        by_job = index[2]
+        for line in chunk[:end].splitlines():
+            # Entries are written by _serialize, so the job ID follows
+            # this key; extracting it avoids parsing other jobs' entries.
+            # int() also skips the space older versions wrote after it
+            start = line.find(b'"job_id":')
+            if start < 0:
+                continue
+            stop = line.find(b",", start)
+            try:
+                line_job_id = int(line[start + 9:stop])
+            except ValueError:
+                continue
+            bucket = by_job.get(line_job_id)
+            if bucket is None:
+                bucket = by_job[line_job_id] = [[], [], []]
+            bucket[0].append(line)
+        index[1] += end
+        
+        return by_job.get(job_id)
     
     def add_job_log(self, job_id: int, level: str, message: str) -> bool:
-        """Add a log entry for a specific job."""
-        with self._transaction() as data:
-            log_entry = {
-                'id': len(data["logs"]) + 1,
-                'job_id': job_id,
-                'timestamp': datetime.utcnow().isoformat(),
-                'level': level,
-                'message': message
-            }
+        """Add a log entry for a specific job.
+        
+        The entry is buffered rather than written immediately, so a burst of
+        log lines costs one file rewrite instead of one per line. It is
+        persisted by the next write transaction or by the background flush
+        thread, at the latest LOG_FLUSH_INTERVAL seconds later.
+        """
+        log_entry = {
+            'job_id': job_id,
+            'timestamp': _now_ms(),
+            'level': level,
+            'message': message
+        }
+        
+        # Inside a batch the entry is written with the batch's other changes
+        batch_data = getattr(self._batch, 'data', None)
+        if batch_data is not None:
+            batch_data["logs"].append(log_entry)
+            return True
+        
+        with self._log_buffer_lock:
+            self._log_buffer.append(log_entry)
+            pending = len(self._log_buffer)
+        
+        self._ensure_log_flush_thread()
+        if pending >= LOG_FLUSH_BATCH:
+            self._log_flush_wakeup.set()
+        return True
+    
+    def add_job_logs(self, job_id: int, level: str, messages: List[str]) -> bool:
+        """Add several log entries for a job at once.
+        
+        Like add_job_log, but the entries are buffered together, under one
+        acquisition of the buffer lock.
+        
+        Args:
+            job_id: ID of the job
+            level: Level of every entry
+            messages: Messages, in order
             
-            data["logs"].append(log_entry)
+        Returns:
+            True once the entries are buffered
+        """
+        timestamp = _now_ms()
+        log_entries = [
+            {'job_id': job_id, 'timestamp': timestamp, 'level': level, 'message': message}
+            for message in messages
+        ]
+        
+        # Inside a batch the entries are written with the batch's other changes
+        batch_data = getattr(self._batch, 'data', None)
+        if batch_data is not None:
+            batch_data["logs"].extend(log_entries)
             return True
+        
+        with self._log_buffer_lock:
+            self._log_buffer.extend(log_entries)
+            pending = len(self._log_buffer)
+        
+        self._ensure_log_flush_thread()
+        if pending >= LOG_FLUSH_BATCH:
+            self._log_flush_wakeup.set()
+        return True
+    
+    def flush_logs(self) -> None:
+        """Write any buffered log entries to the log file.
+        
+        Takes the write lock, so it must not be called inside batch().
+        """
+        if self._log_buffer:
+            with self._lock.write_lock(), self._file_lock(shared=False):
+                self._append_logs([])
+    
+    def _append_logs(self, entries: List[Dict[str, Any]]) -> None:
+        """Append buffered log entries, then ``entries``, to the log file.
+        
+        Entries are numbered on from the last one in the file (see
+        _next_log_id). Buffered entries are only dropped from the buffer
+        once written. Must be called with the write lock and exclusive file
+        lock held.
+        """
+        with self._log_buffer_lock:
+            buffered = list(self._log_buffer)
+        entries = buffered + entries
+        if not entries:
+            return
+        
+        next_id = self._next_log_id()
+        lines = []
+        for log_id, entry in enumerate(entries, next_id):
+            log_entry = {'id': log_id}
+            log_entry.update((key, value) for key, value in entry.items() if key != 'id')
+            lines.append(self._serialize(log_entry))
+        lines.append(b"")
+        
+        created = not os.path.exists(self.log_path)
+        with open(self.log_path, 'ab') as f:
+            f.write(b"\n".join(lines))
+            self._log_tail = (os.fstat(f.fileno()).st_ino, f.tell(), next_id + len(entries) - 1)
+        if created:
+            # Give the log file the same permissions as the database file
+            self._copy_mode(self.db_path, self.log_path)
+        
+        with self._log_buffer_lock:
+            for _ in range(len(buffered)):
+                self._log_buffer.popleft()
+    
+    @staticmethod
+    def _copy_mode(src: str, dst: str) -> None:
+        """Copy permission bits between files, ignoring failures."""
+        try:
+            shutil.copymode(src, dst)
+        except OSError:
+            pass
+    
+    def _next_log_id(self) -> int:
+        """Return the id for the next log entry.
+        
+        If the log file is exactly as this process last left it, the id
+        follows on from the one remembered then; otherwise the file's last
+        entry is read.
+        """
+        tail = self._log_tail
+        if tail is not None:
+            try:
+                st = os.stat(self.log_path)
+            except FileNotFoundError:
+                pass
+            else:
+                if (st.st_ino, st.st_size) == tail[:2]:
+                    return tail[2] + 1
+        return self._last_log_id() + 1
+    
+    def _last_log_id(self) -> int:
+        """Return the id of the last entry in the log file, or 0 if empty."""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            tail = b""
+            position = end
+            # Read backwards until the tail holds a complete last line
+            while position > 0:
+                step = min(LOG_TAIL_CHUNK, position)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+                lines = tail.rstrip(b"\n").split(b"\n")
+                if len(lines) > 1 or position == 0:
+                    try:
+                        return self._parse(lines[-1])['id']
+                    except (ValueError, KeyError):
+                        return 0
+            return 0
+    
+    def _read_logs(self) -> Generator[Dict[str, Any], None, None]:
+        """Yield every entry in the log file."""
+        return self._read_log_file(self.log_path)
+    
+    @classmethod
+    def _read_log_file(cls, path: str) -> Generator[Dict[str, Any], None, None]:
+        """Yield every entry in the log file at ``path``."""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield cls._parse(line)
+                except json.JSONDecodeError:
+                    # Skip a line left incomplete by an interrupted write
+                    continue
+    
+    def _rewrite_logs(self, job_ids: set) -> None:
+        """Rewrite the log file keeping only entries for ``job_ids``.
+        
+        Entry ids are never reused: if the last entry is dropped, a marker
+        entry with its id and no job takes its place, for _last_log_id to
+        find. Must be called with the write lock and exclusive file lock
+        held.
+        """
+        if not os.path.exists(self.log_path):
+            return
+        temp_path = self.log_path + ".tmp"
+        with open(temp_path, 'wb') as out:
+            last = None
+            last_kept = True
+            for log in self._read_logs():
+                last = log
+                last_kept = log["job_id"] in job_ids
+                if last_kept:
+                    out.write(self._serialize(log) + b"\n")
+            if not last_kept:
+                out.write(self._serialize({'id': last['id'], 'job_id': None}) + b"\n")
+        self._copy_mode(self.log_path, temp_path)
+        os.replace(temp_path, self.log_path)
+    
+    def _ensure_log_flush_thread(self) -> None:
+        """Start the background log flush thread on first use."""
+        if self._log_flush_thread is None:
+            with self._log_buffer_lock:
+                if self._log_flush_thread is None:
+                    self._log_flush_thread = threading.Thread(
+                        target=self._log_flush_loop, name="job-log-flush", daemon=True
+                    )
+                    self._log_flush_thread.start()
+    
+    def _log_flush_loop(self) -> None:
+        """Periodically write buffered log entries."""
+        while True:
+            self._log_flush_wakeup.wait(LOG_FLUSH_INTERVAL)
+            self._log_flush_wakeup.clear()
+            try:
+                self.flush_logs()
+            except Exception as e:
+                logging.exception(f"Failed to flush job logs: {e}")
     
     def get_status_counts(self) -> Dict[str, int]:
         """Get count of jobs by status."""
-        with self._transaction() as data:
-            status_counts = {}
-            for status in JobStatus:
-                status_counts[status.value] = 0
-            
-            for job in data["jobs"]:
-                status = job["status"]
-                if status in status_counts:
-                    status_counts[status] += 1
-            
-            return status_counts
+        with self._read_index() as index:
+            return {status.value: len(index.by_status[status.value]) for status in JobStatus}
     
     def get_completed_package_names(self) -> set:
         """Get set of package names that have been completed successfully."""
-        with self._transaction() as data:
-            package_names = set()
-            for job in data["jobs"]:
-                if job["status"] == JobStatus.COMPLETED.value:
-                    package_names.add(job["package_name"])
-            return package_names
+        with self._read_index() as index:
+            return set(index.completed_packages)
     
     def cleanup_old_jobs(self, keep_days: int) -> int:
         """Clean up old completed/failed jobs."""
-        from datetime import timedelta
-        
-        with self._transaction() as data:
-            cutoff_date = datetime.utcnow() - timedelta(days=keep_days)
-            
-            jobs_to_keep = []
-            deleted_count = 0
-            
-            for job in data["jobs"]:
-                if (job["status"] in [JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value] and
-                    job["completed_at"]):
-                    completed_at = self._parse_datetime(job["completed_at"])
-                    if completed_at and completed_at < cutoff_date:
-                        deleted_count += 1
-                        continue
-                jobs_to_keep.append(job)
+        with self._mutation() as data:
+            cutoff_ms = _now_ms() - keep_days * _DAY_MS
             
+            # Compare stored values directly; _stored_ms also reads ISO
+            # strings from older versions and gives 0 for unparseable ones,
+            # which are kept
+            stored_ms = self._stored_ms
+            jobs = data["jobs"]
+            jobs_to_keep = [
+                job for job in jobs
+                if not (job["status"] in _FINISHED_STATUSES and job["completed_at"]
+                        and 0 < stored_ms(job["completed_at"]) < cutoff_ms)
+            ]
+            deleted_count = len(jobs) - len(jobs_to_keep)
             data["jobs"] = jobs_to_keep
             
-            # Also clean up logs for deleted jobs
-            job_ids = {job["id"] for job in jobs_to_keep}
-            data["logs"] = [log for log in data["logs"] if log["job_id"] in job_ids]
+            # Also clean up logs for deleted jobs, once the jobs are written;
+            # if that fails the kept jobs must not have lost their logs.
+            # The job list is read then, so jobs a batch adds later keep theirs.
+            if deleted_count:
+                data["after_write"].append(
+                    lambda: self._rewrite_logs({job["id"] for job in data["jobs"]})
+                )
             
             return deleted_count
     
@@ -347,14 +1583,9 @@ class JSONDatabase:
         Returns:
             Dictionary of the new retry job, or None if retry not possible
         """
-        with self._transaction() as data:
+        with self._mutation() as data:
             # Find the original job
-            original_job = None
-            for job in data["jobs"]:
-                if job["id"] == original_job_id:
-                    original_job = job
-                    break
-            
+            original_job = self._find_job(data["jobs"], original_job_id)
             if not original_job:
                 return None
             
@@ -362,26 +1593,13 @@ class JSONDatabase:
             if original_job["status"] != JobStatus.FAILED.value:
                 return None
             
-            # Add retry fields to existing jobs if they don't exist (backward compatibility)
-            if 'retry_count' not in original_job:
-                original_job['retry_count'] = 0
-            if 'max_retries' not in original_job:
-                original_job['max_retries'] = config.DEFAULT_MAX_RETRIES
-            if 'last_retry_at' not in original_job:
-                original_job['last_retry_at'] = None
-            if 'retry_delay' not in original_job:
-                original_job['retry_delay'] = config.DEFAULT_RETRY_DELAY
-            if 'is_retry' not in original_job:
-                original_job['is_retry'] = False
-            if 'original_job_id' not in original_job:
-                original_job['original_job_id'] = None
-            
             # Check if we've exceeded max retries
             if original_job["retry_count"] >= original_job["max_retries"]:
                 return None
             
             # Calculate retry delay with exponential backoff
             retry_count = original_job["retry_count"] + 1
+            now = _now_ms()
             retry_delay = original_job["retry_delay"] * (config.RETRY_BACKOFF_FACTOR ** (retry_count - 1))
             
             # Create new retry job
@@ -396,7 +1614,7 @@ class JSONDatabase:
                 'estimated_time': original_job['estimated_time'],
                 'actual_time': None,
                 'submitted_by': original_job['submitted_by'],
-                'submitted_at': datetime.utcnow(),
+                'submitted_at': now,
                 'started_at': None,
                 'completed_at': None,
                 'spack_command': original_job['spack_command'],
@@ -405,32 +1623,31 @@ class JSONDatabase:
                 'resource_requirements_dict': original_job.get('resource_requirements_dict', {}),
                 'retry_count': retry_count,
                 'max_retries': original_job['max_retries'],
-                'last_retry_at': datetime.utcnow(),
+                'last_retry_at': now,
                 'retry_delay': retry_delay,
                 'is_retry': True,
                 'original_job_id': original_job.get('original_job_id', original_job_id)
             }
             
             data["jobs"].append(retry_job)
+            self._active_packages(data).setdefault(retry_job['package_name'], job_id)
             
             # Update original job to increment retry count
             original_job["retry_count"] = retry_count
-            original_job["last_retry_at"] = datetime.utcnow()
+            original_job["last_retry_at"] = now
             
             # Add log entries
             retry_log = {
-                'id': len(data["logs"]) + 1,
                 'job_id': job_id,
-                'timestamp': datetime.utcnow(),
+                'timestamp': now,
                 'level': "INFO",
                 'message': f"Retry job created (attempt {retry_count}/{original_job['max_retries']}) for original job {original_job_id}"
             }
             data["logs"].append(retry_log)
             
             original_log = {
-                'id': len(data["logs"]) + 1,
                 'job_id': original_job_id,
-                'timestamp': datetime.utcnow(),
+                'timestamp': now,
                 'level': "INFO",
                 'message': f"Retry attempt {retry_count} created as job {job_id}, next retry delay: {retry_delay:.1f}s"
             }
@@ -438,8 +1655,8 @@ class JSONDatabase:
             
             # Return a copy with parsed datetimes
             retry_job_copy = retry_job.copy()
-            retry_job_copy['submitted_at'] = retry_job['submitted_at']
-            retry_job_copy['last_retry_at'] = retry_job['last_retry_at']
+            retry_job_copy['submitted_at'] = self._parse_datetime(retry_job['submitted_at'])
+            retry_job_copy['last_retry_at'] = self._parse_datetime(retry_job['last_retry_at'])
             
             return retry_job_copy
     
@@ -449,56 +1666,36 @@ class JSONDatabase:
         Returns:
             List of job dictionaries that can be retried
         """
-        with self._transaction() as data:
-            eligible_jobs = []
-            current_time = datetime.utcnow()
-            
-            for job in data["jobs"]:
+        with self._read_index() as index:
+            failed_jobs = index.by_status[JobStatus.FAILED.value]
+            if not index.migrated:
                 # Add retry fields if missing (backward compatibility)
-                if 'retry_count' not in job:
-                    job['retry_count'] = 0
-                if 'max_retries' not in job:
-                    job['max_retries'] = config.DEFAULT_MAX_RETRIES
-                if 'last_retry_at' not in job:
-                    job['last_retry_at'] = None
-                if 'retry_delay' not in job:
-                    job['retry_delay'] = config.DEFAULT_RETRY_DELAY
-                if 'is_retry' not in job:
-                    job['is_retry'] = False
-                if 'original_job_id' not in job:
-                    job['original_job_id'] = None
-                    
-                if (job["status"] == JobStatus.FAILED.value and 
-                    job["retry_count"] < job["max_retries"]):
-                    
-                    # Check if enough time has passed since last retry
-                    if job.get("last_retry_at"):
-                        last_retry = self._parse_datetime(job["last_retry_at"])
-                        if last_retry:
-                            time_since_retry = (current_time - last_retry).total_seconds()
-                            if time_since_retry < job["retry_delay"]:
-                                continue  # Not enough time has passed
-                    
-                    job_copy = job.copy()
-                    job_copy['submitted_at'] = self._parse_datetime(job['submitted_at'])
-                    job_copy['started_at'] = self._parse_datetime(job['started_at'])
-                    job_copy['completed_at'] = self._parse_datetime(job['completed_at'])
-                    job_copy['last_retry_at'] = self._parse_datetime(job['last_retry_at'])
-                    eligible_jobs.append(job_copy)
-            
-            return eligible_jobs
+                defaults = self._retry_defaults
+                failed_jobs = [{**defaults, **job} for job in failed_jobs]
+            
+            # Filter on the stored epoch-millisecond values; only the jobs
+            # that qualify are copied and get datetime objects
+            now_ms = _now_ms()
+            stored_ms = self._stored_ms
+            job_view = self._job_view
+            return [
+                job_view(job) for job in failed_jobs
+                if job["retry_count"] < job["max_retries"]
+                and now_ms - stored_ms(job["last_retry_at"]) >= job["retry_delay"] * 1000
+            ]
 
     def get_worker_status(self) -> Optional[Dict[str, Any]]:
         """Get worker status information."""
-        with self._transaction() as data:
+        with self._read_transaction() as data:
             worker = data.get("worker_status")
             if not worker:
                 return None
             
-            worker_copy = worker.copy()
-            worker_copy['started_at'] = self._parse_datetime(worker.get('started_at'))
-            worker_copy['last_heartbeat'] = self._parse_datetime(worker.get('last_heartbeat'))
-            return worker_copy
+            return {
+                **worker,
+                'started_at': self._parse_datetime(worker.get('started_at')),
+                'last_heartbeat': self._parse_datetime(worker.get('last_heartbeat')),
+            }
     
     def update_worker_status(
         self,
@@ -508,17 +1705,17 @@ class JSONDatabase:
         process_id: Optional[int] = None
     ) -> None:
         """Update worker status."""
-        with self._transaction() as data:
+        with self._mutation() as data:
             if not data["worker_status"]:
                 data["worker_status"] = {}
             
             worker = data["worker_status"]
             worker["is_active"] = is_active
             worker["current_job_id"] = current_job_id
-            worker["last_heartbeat"] = datetime.utcnow()
+            worker["last_heartbeat"] = _now_ms()
             
             if started_at is not None:
-                worker["started_at"] = started_at
+                worker["started_at"] = self._to_stored(started_at)
             if process_id is not None:
                 worker["process_id"] = process_id
             
@@ -532,13 +1729,88 @@ class JSONDatabase:
 _db_manager: Optional[JSONDatabase] = None
 
 
+def sqlite_path_for(db_path: str) -> str:
+    """Map a JSON database path to its SQLite counterpart.
+
+    Keeps the SQLite file next to, but separate from, an existing JSON
+    database so that switching backends never misreads one as the other.
+    """
+    root, ext = os.path.splitext(db_path)
+    return root + ".db" if ext == ".json" else db_path
+
+
+def read_json_database(db_path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Read the jobs and log entries of the JSON database at ``db_path``.
+    
+    Unlike opening it as a JSONDatabase, this only reads: no file is
+    created, migrated or rewritten, and nothing is left to run at exit.
+    Jobs written by older versions get their missing retry fields, and
+    timestamps are returned as datetime objects. Log id markers, which
+    belong to no job, are left out.
+    
+    Raises:
+        FileNotFoundError: If the database file does not exist
+        json.JSONDecodeError: If the file and its backup are both corrupted
+    """
+    root = os.path.splitext(db_path)[0]
+    with _flock(db_path + ".lock", shared=True, create=False):
+        data = JSONDatabase._parse_snapshot(db_path, db_path + ".bak")
+        try:
+            with open(root + ".journal.jsonl", 'rb') as f:
+                JSONDatabase._apply_journal(data, f.read())
+        except FileNotFoundError:
+            pass
+        
+        # Versions before SCHEMA_VERSION 2 kept the logs in the database file
+        logs = list(data.get("logs") or ())
+        logs.extend(JSONDatabase._read_log_file(root + ".logs.jsonl"))
+    
+    parse = JSONDatabase._parse_datetime
+    defaults = _retry_defaults()
+    jobs = [
+        {
+            **defaults,
+            **job,
+            'submitted_at': parse(job['submitted_at']),
+            'started_at': parse(job['started_at']),
+            'completed_at': parse(job['completed_at']),
+            'last_retry_at': parse(job.get('last_retry_at')),
+        }
+        for job in data["jobs"]
+    ]
+    # Skip the id markers _rewrite_logs leaves in place of dropped entries
+    logs = [
+        {**log, 'timestamp': parse(log['timestamp'])}
+        for log in logs
+        if log.get('job_id') is not None
+    ]
+    return jobs, logs
+
+
+def open_sqlite_database(db_path: str):
+    """Open the SQLite counterpart of the JSON database at ``db_path``.
+
+    On first use the jobs and logs of an existing JSON database are
+    imported, so switching an install to SQLite keeps its queue.
+    """
+    from .sqlite_database import SQLiteDatabase
+    sqlite_path = sqlite_path_for(db_path)
+    db = SQLiteDatabase(sqlite_path)
+    if sqlite_path != db_path and os.path.exists(db_path):
+        db.import_json(db_path)
+    return db
+
+
 def get_db_manager(db_path: str = None) -> JSONDatabase:
     """Get the global database manager instance."""
     global _db_manager
     if _db_manager is None:
         # Use config-specified path if no explicit path provided
         db_path = db_path or config.get_database_path()
-        _db_manager = JSONDatabase(db_path)
+        if config.get_database_type() == "sqlite":
+            _db_manager = open_sqlite_database(db_path)
+        else:
+            _db_manager = JSONDatabase(db_path)
     return _db_manager
 
 
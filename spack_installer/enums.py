@@ -0,0 +1,23 @@
+"""Job status and priority enumerations.
+
+Kept apart from the SQLAlchemy models so that the CLI, queue manager and
+database backends can use them without importing SQLAlchemy.
+"""
+
+from enum import Enum
+
+
+class JobStatus(Enum):
+    """Job status enumeration."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobPriority(Enum):
+    """Job priority enumeration."""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
@@ -8,6 +8,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import TypeDecorator, VARCHAR
 import json
+from .enums import JobStatus, JobPriority
 
 Base = declarative_base()
 
@@ -34,22 +35,6 @@ class ChoiceType(TypeDecorator):
         return value
 
 
-class JobStatus(Enum):
-    """Job status enumeration."""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
-
-
-class JobPriority(Enum):
-    """Job priority enumeration."""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-
-
 class InstallationJob(Base):
     """Model for installation jobs."""
     
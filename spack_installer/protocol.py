@@ -0,0 +1,101 @@
+"""Wire protocol shared by the socket client and server.
+
+Each message is a 4-byte big-endian payload length followed by the JSON
+payload. Framing messages this way lets a connection carry any number of
+requests instead of relying on the peer closing its write side.
+"""
+
+import json
+import socket
+import struct
+from datetime import datetime
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Length prefix: unsigned 32-bit, network byte order
+HEADER = struct.Struct(">I")
+
+# Maximum bytes requested from the socket per recv call
+RECV_SIZE = 65536
+
+
+def encode(obj: Any) -> bytes:
+    """Serialize a message body to JSON bytes.
+
+    Uses orjson when it is installed and falls back to the standard
+    library otherwise. Datetimes are sent as ISO 8601 strings either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_encode_default).encode('utf-8')
+
+
+def _encode_default(obj: Any) -> Any:
+    """Serialize values the standard library json module does not handle."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def decode(data: bytes) -> Any:
+    """Parse a JSON message body.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def send_message(sock: socket.socket, payload: bytes) -> None:
+    """Send a single framed message.
+
+    Args:
+        sock: Connected socket
+        payload: Encoded message body
+    """
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[bytearray]:
+    """Receive a single framed message.
+
+    Args:
+        sock: Connected socket
+
+    Returns:
+        The message body, or None if the peer closed the connection
+        before sending another message
+
+    Raises:
+        ConnectionError: If the connection closes partway through a message
+    """
+    header = _recv_exact(sock, HEADER.size, allow_eof=True)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    return _recv_exact(sock, length)
+
+
+def _recv_exact(sock: socket.socket, size: int, allow_eof: bool = False) -> Optional[bytearray]:
+    """Read exactly ``size`` bytes from the socket.
+
+    The data is received straight into a buffer allocated once at its
+    final size, so large messages are not copied chunk by chunk.
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], min(size - received, RECV_SIZE))
+        if not count:
+            if allow_eof and received == 0:
+                return None
+            raise ConnectionError("Connection closed in the middle of a message")
+        received += count
+    return buf
@@ -1,12 +1,32 @@
 """Queue manager for handling job submission and management with improved architecture."""
 
+import functools
 import getpass
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from .database import get_db_manager
-from .models import JobStatus, JobPriority
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from .database import SchedulerJob, get_db_manager, scheduler_job
+from .enums import JobStatus, JobPriority
 from .scheduler import JobScheduler
 
+# Number of log entries sent per page when streaming job logs
+LOG_PAGE_SIZE = 500
+
+# Seconds a cached status or job listing may be reused. Writes made in this
+# process invalidate the cache immediately; this bounds how long writes made
+# by other processes sharing the database can go unnoticed.
+STATUS_CACHE_TTL = 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def _current_user() -> str:
+    """Return the name of the user running this process.
+    
+    It cannot change for the life of the process, so it is looked up once.
+    """
+    return getpass.getuser()
+
 
 class QueueManager:
     """Manages the job queue with improved data access patterns."""
@@ -15,6 +35,16 @@ class QueueManager:
         """Initialize the queue manager."""
         self.scheduler = JobScheduler()
         self.db = get_db_manager()
+        
+        # Cached dependency analysis results, keyed by queue contents
+        self._analysis_cache: Dict[str, Tuple[Tuple, Any]] = {}
+        
+        # Cached read results as (database generation, time, value)
+        self._read_cache: Dict[Tuple, Tuple[int, float, Any]] = {}
+        # Held while reloading a cached read, so concurrent callers that
+        # miss together wait for one load instead of each repeating it.
+        # Reentrant because some loaders read other cached results.
+        self._load_lock = threading.RLock()
     
     def submit_job(
         self,
@@ -42,7 +72,7 @@ class QueueManager:
         """
         # Use provided username or fall back to current user
         if submitted_by is None:
-            submitted_by = getpass.getuser()
+            submitted_by = _current_user()
             
         return self.db.create_job(
             package_name=package_name,
@@ -54,16 +84,89 @@ class QueueManager:
             resource_requirements=resource_requirements
         )
     
+    def submit_jobs_bulk(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit several installation jobs in a single database transaction.
+        
+        Args:
+            jobs: List of dicts with the same keys as submit_job's arguments
+            
+        Returns:
+            List of job information dicts, in input order
+            
+        Raises:
+            ValueError: If any package is already queued; no jobs are submitted
+        """
+        current_user = _current_user()
+        
+        job_specs = []
+        for job in jobs:
+            spec = {
+                'priority': JobPriority.MEDIUM,
+                'estimated_time': 300.0,
+                **job
+            }
+            if spec.get('submitted_by') is None:
+                spec['submitted_by'] = current_user
+            job_specs.append(spec)
+        
+        return self.db.create_jobs(job_specs)
+    
     def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
         """Get a job by ID."""
         return self.db.get_job_by_id(job_id)
     
     def get_all_jobs(self, status: JobStatus = None) -> List[Dict[str, Any]]:
-        """Get all jobs, optionally filtered by status."""
-        return self.db.get_all_jobs(status)
+        """Get all jobs, optionally filtered by status.
+        
+        The result may be shared with other callers and must not be modified.
+        """
+        return self._cached_read(("get_all_jobs", status), lambda: self.db.get_all_jobs(status))
     
     def get_queue_status(self) -> Dict[str, Any]:
-        """Get comprehensive queue status information."""
+        """Get comprehensive queue status information.
+        
+        The result may be shared with other callers and must not be modified.
+        """
+        return self._cached_read(("get_queue_status",), self._load_queue_status)
+    
+    def _cached_read(self, key: Tuple, loader) -> Any:
+        """Return a cached read result, reloading it if the data changed.
+        
+        Args:
+            key: Identifies the read and its arguments
+            loader: Called with no arguments to compute a fresh result
+        """
+        value = self._fresh_entry(key)
+        if value is not None:
+            return value[0]
+        
+        with self._load_lock:
+            # Another thread may have reloaded it while this one waited
+            value = self._fresh_entry(key)
+            if value is not None:
+                return value[0]
+            
+            # Read the generation first: a write that lands during the load
+            # leaves the stored entry already out of date
+            generation = self.db.generation
+            now = time.monotonic()
+            value = loader()
+            self._read_cache[key] = (generation, now, value)
+            return value
+    
+    def _fresh_entry(self, key: Tuple) -> Optional[Tuple[Any]]:
+        """Return the cached value for key as a 1-tuple, or None if stale."""
+        entry = self._read_cache.get(key)
+        if (
+            entry is not None
+            and entry[0] == self.db.generation
+            and time.monotonic() - entry[1] < STATUS_CACHE_TTL
+        ):
+            return (entry[2],)
+        return None
+    
+    def _load_queue_status(self) -> Dict[str, Any]:
+        """Build queue status information from the database."""
         # Get status counts
         status_counts = self.db.get_status_counts()
         
@@ -73,12 +176,10 @@ class QueueManager:
         current_job_id = worker_status['current_job_id'] if worker_status else None
         
         # Get pending jobs for next job calculation
-        pending_jobs = self.get_all_jobs(JobStatus.PENDING)
+        pending_job_objects = self._pending_jobs()
         installed_packages = self.db.get_completed_package_names()
         
-        # Convert pending job dicts to objects for scheduler compatibility
-        pending_job_objects = [self._dict_to_job_object(job) for job in pending_jobs]
-        next_job = self.scheduler.get_next_job(pending_job_objects, installed_packages)
+        next_job = self.scheduler.get_next_job(pending_job_objects, installed_packages, self._bottom_levels())
         
         # Estimate total time
         total_estimated_time = self.scheduler.estimate_total_time(pending_job_objects)
@@ -90,7 +191,7 @@ class QueueManager:
             "next_job_id": next_job.id if next_job else None,
             "total_pending": status_counts.get("pending", 0),
             "estimated_total_time": total_estimated_time,
-            "queue_length": len(pending_jobs)
+            "queue_length": len(pending_job_objects)
         }
     
     def cancel_job(self, job_id: int) -> bool:
@@ -107,23 +208,18 @@ class QueueManager:
     
     def get_next_job_to_run(self) -> Optional[Dict[str, Any]]:
         """Get the next job that should be executed."""
-        pending_jobs = self.get_all_jobs(JobStatus.PENDING)
-        if not pending_jobs:
+        pending_job_objects = self._pending_jobs()
+        if not pending_job_objects:
             return None
         
         installed_packages = self.db.get_completed_package_names()
         
-        # Convert to objects for scheduler
-        pending_job_objects = [self._dict_to_job_object(job) for job in pending_jobs]
-        next_job_obj = self.scheduler.get_next_job(pending_job_objects, installed_packages)
-        
-        if next_job_obj:
-            # Find the corresponding dict
-            for job_dict in pending_jobs:
-                if job_dict['id'] == next_job_obj.id:
-                    return job_dict
+        next_job_obj = self.scheduler.get_next_job(pending_job_objects, installed_packages, self._bottom_levels())
+        if next_job_obj is None:
+            return None
         
-        return None
+        # Only the chosen job is loaded as a full dictionary
+        return self.get_job(next_job_obj.id)
     
     def mark_job_running(self, job_id: int) -> bool:
         """Mark a job as running."""
@@ -175,91 +271,138 @@ class QueueManager:
         """Get logs for a specific job."""
         return self.db.get_job_logs(job_id)
     
+    def iter_job_log_pages(
+        self,
+        job_id: int,
+        offset: int = 0,
+        tail: Optional[int] = None,
+        page_size: int = LOG_PAGE_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a job's logs in pages.
+        
+        Logs for a job are only ever appended, so a caller that remembers
+        the ``offset`` of the last page it saw can ask again later for just
+        the new entries.
+        
+        Args:
+            job_id: ID of the job
+            offset: Number of log entries to skip
+            tail: Only return the last ``tail`` entries
+            page_size: Maximum number of entries per page
+            
+        Yields:
+            Dicts holding the page's 'logs', the 'offset' just past them,
+            and whether 'more' pages follow. At least one page is yielded.
+        """
+        start = offset
+        if tail is not None:
+            _, total = self.db.get_job_logs_page(job_id, 0, 0)
+            start = max(start, total - tail)
+        
+        # Each page is read from the database on its own, so only the
+        # entries sent are loaded
+        while True:
+            logs, total = self.db.get_job_logs_page(job_id, start, page_size)
+            stop = start + len(logs)
+            more = stop < total and bool(logs)
+            yield {'logs': logs, 'offset': stop, 'more': more}
+            if not more:
+                return
+            start = stop
+    
     def get_optimized_queue_order(self) -> List[Dict[str, Any]]:
         """Get the optimized order for all pending jobs."""
         pending_jobs = self.get_all_jobs(JobStatus.PENDING)
-        pending_job_objects = [self._dict_to_job_object(job) for job in pending_jobs]
-        optimized_objects = self.scheduler.optimize_job_order(pending_job_objects)
+        # Both are cached reads in the same order; they only differ if a
+        # write landed between them, and then the objects are rebuilt
+        pending_job_objects = self._pending_jobs()
+        if len(pending_job_objects) != len(pending_jobs) or any(
+            obj.id != job['id'] for obj, job in zip(pending_job_objects, pending_jobs)
+        ):
+            pending_job_objects = [self._dict_to_job_object(job) for job in pending_jobs]
+        key = self._pending_key(pending_job_objects)
+        
+        optimized_ids = self._cached_analysis("optimized_order", key)
+        if optimized_ids is None:
+            optimized_objects = self.scheduler.optimize_job_order(pending_job_objects)
+            optimized_ids = [obj.id for obj in optimized_objects]
+            self._analysis_cache["optimized_order"] = (key, optimized_ids)
         
         # Convert back to dictionaries
-        optimized_dicts = []
-        for obj in optimized_objects:
-            for job_dict in pending_jobs:
-                if job_dict['id'] == obj.id:
-                    optimized_dicts.append(job_dict)
-                    break
-        
-        return optimized_dicts
+        jobs_by_id = {job_dict['id']: job_dict for job_dict in pending_jobs}
+        return [jobs_by_id[job_id] for job_id in optimized_ids]
     
     def detect_dependency_issues(self) -> Dict[str, Any]:
         """Detect potential dependency issues in the queue."""
-        pending_jobs = self.get_all_jobs(JobStatus.PENDING)
-        pending_job_objects = [self._dict_to_job_object(job) for job in pending_jobs]
+        pending_job_objects = self._pending_jobs()
+        installed_packages = self.db.get_completed_package_names()
+        key = (self._pending_key(pending_job_objects), frozenset(installed_packages))
+        
+        issues = self._cached_analysis("dependency_issues", key)
+        if issues is not None:
+            return issues
         
         # Detect circular dependencies
         circular_deps = self.scheduler.detect_circular_dependencies(pending_job_objects)
         
         # Find jobs with unsatisfied dependencies
-        installed_packages = self.db.get_completed_package_names()
+        pending_packages = {j.package_name for j in pending_job_objects}
         
         unsatisfied_deps = []
-        for job in pending_jobs:
-            missing_deps = set(job['dependencies_list'] or []) - installed_packages
+        for job in pending_job_objects:
+            missing_deps = set(job.dependencies_list) - installed_packages
             if missing_deps:
                 # Check if missing deps are in pending jobs
-                pending_packages = {j['package_name'] for j in pending_jobs}
                 external_deps = missing_deps - pending_packages
                 if external_deps:
                     unsatisfied_deps.append({
-                        "job_id": job['id'],
-                        "package": job['package_name'],
+                        "job_id": job.id,
+                        "package": job.package_name,
                         "missing_external_deps": list(external_deps)
                     })
         
-        return {
+        issues = {
             "circular_dependencies": circular_deps,
             "unsatisfied_dependencies": unsatisfied_deps
         }
+        self._analysis_cache["dependency_issues"] = (key, issues)
+        return issues
+    
+    def _pending_key(self, pending_job_objects: List[SchedulerJob]) -> Tuple:
+        """Build a cache key describing the scheduling-relevant queue contents."""
+        return tuple(
+            (job.id, job.priority, job.estimated_time, tuple(job.dependencies_list))
+            for job in pending_job_objects
+        )
+    
+    def _cached_analysis(self, name: str, key: Tuple) -> Any:
+        """Return a cached analysis result if it was computed for the same key."""
+        cached = self._analysis_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        return None
+    
+    def _pending_jobs(self) -> List[SchedulerJob]:
+        """Return the pending jobs as scheduler objects.
+        
+        The database builds them in a single pass over its stored jobs, and
+        they are cached, so the status, next-job and analysis queries made
+        for one poll share them. The result may be shared with other callers
+        and must not be modified.
+        """
+        return self._cached_read(("pending_job_objects",), self.db.get_pending_job_objects)
+    
+    def _bottom_levels(self) -> Dict[str, float]:
+        """Return the critical path lengths of the pending packages.
+        
+        They depend only on the pending jobs, so they are cached alongside
+        them and shared by the status and next-job queries.
+        """
+        return self._cached_read(
+            ("bottom_levels",),
+            lambda: self.scheduler.compute_bottom_levels(self._pending_jobs())
+        )
     
-    def _dict_to_job_object(self, job_dict: Dict[str, Any]):
+    def _dict_to_job_object(self, job_dict: Dict[str, Any]) -> SchedulerJob:
         """Convert job dictionary to a simple object for scheduler compatibility."""
-        from types import SimpleNamespace
-        
-        # Create a simple object with the necessary attributes
-        obj = SimpleNamespace()
-        obj.id = job_dict['id']
-        obj.package_name = job_dict['package_name']
-        
-        # Convert string priority back to enum
-        priority_str = job_dict['priority']
-        if priority_str == 'high':
-            obj.priority = JobPriority.HIGH
-        elif priority_str == 'medium':
-            obj.priority = JobPriority.MEDIUM
-        elif priority_str == 'low':
-            obj.priority = JobPriority.LOW
-        else:
-            obj.priority = JobPriority.MEDIUM  # Default fallback
-        
-        obj.estimated_time = job_dict['estimated_time']
-        obj.dependencies_list = job_dict['dependencies_list'] or []
-        
-        # Add submitted_at for age calculation in scheduler
-        obj.submitted_at = job_dict['submitted_at']
-        
-        # Add status as enum
-        status_str = job_dict['status']
-        if status_str == 'pending':
-            obj.status = JobStatus.PENDING
-        elif status_str == 'running':
-            obj.status = JobStatus.RUNNING
-        elif status_str == 'completed':
-            obj.status = JobStatus.COMPLETED
-        elif status_str == 'failed':
-            obj.status = JobStatus.FAILED
-        elif status_str == 'cancelled':
-            obj.status = JobStatus.CANCELLED
-        else:
-            obj.status = JobStatus.PENDING  # Default fallback
-        
-        return obj
+        return scheduler_job(job_dict, job_dict['submitted_at'])
@@ -1,9 +1,18 @@
 """Intelligent job scheduling algorithms for optimizing installation order."""
 
 import heapq
-from typing import List, Dict, Set, Tuple
+from collections import deque
+from typing import TYPE_CHECKING, List, Dict, Set, Tuple
 from datetime import datetime
-from .models import InstallationJob, JobPriority, JobStatus
+from .enums import JobPriority, JobStatus
+
+if TYPE_CHECKING:
+    from .models import InstallationJob
+
+# Score bonus per hour of work that waits on a job, and the most hours
+# credited, which keeps the bonus below one priority level
+CRITICAL_PATH_WEIGHT = 15.0
+CRITICAL_PATH_CAP_HOURS = 6.0
 
 
 class JobScheduler:
@@ -17,14 +26,22 @@ class JobScheduler:
             JobPriority.LOW: 1.0
         }
     
-    def calculate_job_score(self, job: InstallationJob, dependency_graph: Dict[str, Set[str]]) -> float:
+    def calculate_job_score(
+        self,
+        job: "InstallationJob",
+        bottom_levels: Dict[str, float],
+        now: datetime = None
+    ) -> float:
         """Calculate a scheduling score for a job.
         
         Lower scores indicate higher priority for scheduling.
         
         Args:
             job: The job to score
-            dependency_graph: Graph of package dependencies
+            bottom_levels: Critical path length of each pending package,
+                as built by compute_bottom_levels
+            now: Current UTC time, read once per scheduling pass by callers
+                scoring many jobs; the clock is read if omitted
             
         Returns:
             Scheduling score (lower = higher priority)
@@ -46,51 +63,105 @@ class JobScheduler:
         score += time_factor * 5
         
         # Age factor (older jobs get slight preference)
-        age_hours = (datetime.utcnow() - job.submitted_at).total_seconds() / 3600.0
+        if now is None:
+            now = datetime.utcnow()
+        age_hours = (now - job.submitted_at).total_seconds() / 3600.0
         score -= min(age_hours, 24.0) * 2  # Cap at 24 hours
         
         # Dependency chain optimization
-        # Jobs that unlock many other jobs get priority
-        unlocked_jobs = self._count_unlocked_jobs(job.package_name, dependency_graph)
-        score -= unlocked_jobs * 15
+        # Jobs with the longest chain of work waiting on them get priority
+        downstream_time = bottom_levels.get(job.package_name, job.estimated_time) - job.estimated_time
+        score -= min(downstream_time / 3600.0, CRITICAL_PATH_CAP_HOURS) * CRITICAL_PATH_WEIGHT
         
         return score
     
-    def _count_unlocked_jobs(self, package_name: str, dependency_graph: Dict[str, Set[str]]) -> int:
-        """Count how many jobs would be unlocked by installing this package."""
-        count = 0
-        for pkg, deps in dependency_graph.items():
-            if package_name in deps:
-                count += 1
-        return count
+    def compute_bottom_levels(self, jobs: List["InstallationJob"]) -> Dict[str, float]:
+        """Compute the critical path length, or bottom level, of each package.
+        
+        A package's bottom level is its estimated time plus the largest
+        bottom level among the packages that depend on it, i.e. the
+        longest chain of work that starts with it. All levels are computed
+        in one pass over the packages in reverse topological order.
+        Packages on a dependency cycle, which that order never reaches,
+        use the levels of their dependents known by then.
+        
+        Args:
+            jobs: Pending jobs
+            
+        Returns:
+            Bottom level in seconds for each package of the jobs
+        """
+        estimated_times: Dict[str, float] = {}
+        dependencies: Dict[str, Set[str]] = {}
+        for job in jobs:
+            name = job.package_name
+            estimated_times[name] = max(job.estimated_time, estimated_times.get(name, 0.0))
+            dependencies.setdefault(name, set()).update(job.dependencies_list)
+        
+        dependents: Dict[str, List[str]] = {name: [] for name in estimated_times}
+        for name, package_dependencies in dependencies.items():
+            for dependency in package_dependencies:
+                if dependency in dependents and dependency != name:
+                    dependents[dependency].append(name)
+        
+        # Start from the packages nothing depends on and work back to
+        # their dependencies once all of a dependency's dependents are done
+        unresolved = {name: len(names) for name, names in dependents.items()}
+        queue = deque(name for name, count in unresolved.items() if count == 0)
+        bottom_levels: Dict[str, float] = {}
+        while queue:
+            name = queue.popleft()
+            bottom_levels[name] = estimated_times[name] + max(
+                (bottom_levels[dependent] for dependent in dependents[name]), default=0.0
+            )
+            for dependency in dependencies[name]:
+                if dependency in unresolved and dependency != name:
+                    unresolved[dependency] -= 1
+                    if unresolved[dependency] == 0:
+                        queue.append(dependency)
+        
+        for name in estimated_times:
+            if name not in bottom_levels:
+                bottom_levels[name] = estimated_times[name] + max(
+                    (bottom_levels.get(dependent, 0.0) for dependent in dependents[name]), default=0.0
+                )
+        
+        return bottom_levels
     
-    def _build_dependency_graph(self, jobs: List[InstallationJob]) -> Dict[str, Set[str]]:
+    def _build_dependency_graph(self, jobs: List["InstallationJob"]) -> Dict[str, Set[str]]:
         """Build a dependency graph from the list of jobs."""
         graph = {}
         for job in jobs:
             graph[job.package_name] = set(job.dependencies_list)
         return graph
     
-    def _find_ready_jobs(self, jobs: List[InstallationJob], installed_packages: Set[str]) -> List[InstallationJob]:
+    def _find_ready_jobs(self, jobs: List["InstallationJob"], installed_packages: Set[str]) -> List["InstallationJob"]:
         """Find jobs that have all their dependencies satisfied."""
         ready_jobs = []
         
         for job in jobs:
             if job.status != JobStatus.PENDING:
                 continue
-                
-            dependencies = set(job.dependencies_list)
-            if dependencies.issubset(installed_packages):
+            
+            # issuperset takes the list as is, so no set is built per job
+            if installed_packages.issuperset(job.dependencies_list):
                 ready_jobs.append(job)
         
         return ready_jobs
     
-    def get_next_job(self, jobs: List[InstallationJob], installed_packages: Set[str] = None) -> InstallationJob:
+    def get_next_job(
+        self,
+        jobs: List["InstallationJob"],
+        installed_packages: Set[str] = None,
+        bottom_levels: Dict[str, float] = None
+    ) -> "InstallationJob":
         """Get the next job to execute based on intelligent scheduling.
         
         Args:
             jobs: List of all jobs
             installed_packages: Set of already installed package names
+            bottom_levels: Critical path lengths of the pending packages, if
+                the caller already has them (see compute_bottom_levels)
             
         Returns:
             The next job to execute, or None if no jobs are ready
@@ -108,22 +179,16 @@ class JobScheduler:
         if not ready_jobs:
             return None
         
-        # Build dependency graph for scoring
-        dependency_graph = self._build_dependency_graph(pending_jobs)
+        # Compute critical paths once for scoring
+        if bottom_levels is None:
+            bottom_levels = self.compute_bottom_levels(pending_jobs)
         
-        # Score all ready jobs and pick the best one
-        scored_jobs = []
-        for job in ready_jobs:
-            score = self.calculate_job_score(job, dependency_graph)
-            heapq.heappush(scored_jobs, (score, job.id, job))
-        
-        if scored_jobs:
-            _, _, best_job = heapq.heappop(scored_jobs)
-            return best_job
-        
-        return None
+        # Score all ready jobs and pick the best one; only one job is taken,
+        # so a single min() pass is enough
+        now = datetime.utcnow()
+        return min(ready_jobs, key=lambda job: (self.calculate_job_score(job, bottom_levels, now), job.id))
     
-    def optimize_job_order(self, jobs: List[InstallationJob]) -> List[InstallationJob]:
+    def optimize_job_order(self, jobs: List["InstallationJob"]) -> List["InstallationJob"]:
         """Optimize the order of all pending jobs.
         
         Args:
@@ -138,61 +203,143 @@ class JobScheduler:
         
         optimized_order = []
         installed_packages = set()
-        remaining_jobs = pending_jobs.copy()
         
-        # Iteratively pick the best next job
-        while remaining_jobs:
-            next_job = self.get_next_job(remaining_jobs, installed_packages)
-            if next_job is None:
+        # Scores depend only on the job and the critical paths of the whole
+        # queue, so each job is scored once, when it becomes ready
+        bottom_levels = self.compute_bottom_levels(pending_jobs)
+        now = datetime.utcnow()
+        
+        # Kahn's algorithm: each job waits on its not yet scheduled
+        # dependencies and joins the ready heap when the last one is scheduled
+        waiting_on: Dict[int, int] = {}
+        dependents: Dict[str, List["InstallationJob"]] = {}
+        # The heap holds (score, job id) pairs, so ties never compare jobs
+        jobs_by_id = {job.id: job for job in pending_jobs}
+        ready: List[Tuple[float, int]] = []
+        for job in pending_jobs:
+            dependencies = set(job.dependencies_list)
+            waiting_on[job.id] = len(dependencies)
+            for dependency in dependencies:
+                dependents.setdefault(dependency, []).append(job)
+            if not dependencies:
+                self._push_ready(ready, job, bottom_levels, now)
+        
+        # Fallback order for when no job is ready: the highest priority job
+        # with the fewest dependencies. The key never changes, so it is
+        # sorted once and walked past the jobs already scheduled.
+        fallback_order = iter(sorted(
+            pending_jobs,
+            key=lambda j: (
+                -self.priority_weights.get(j.priority, 2.0),
+                len(j.dependencies_list),
+                j.submitted_at
+            )
+        ))
+        scheduled: Set[int] = set()
+        
+        while len(optimized_order) < len(pending_jobs):
+            if ready:
+                next_job = jobs_by_id[heapq.heappop(ready)[1]]
+            else:
                 # No jobs are ready (circular dependencies or missing external deps)
-                # Pick the highest priority job with fewest dependencies
-                next_job = min(
-                    remaining_jobs,
-                    key=lambda j: (
-                        -self.priority_weights.get(j.priority, 2.0),
-                        len(j.dependencies_list),
-                        j.submitted_at
-                    )
-                )
+                next_job = next(job for job in fallback_order if job.id not in scheduled)
+                # Do not make it ready again should its dependencies follow
+                waiting_on[next_job.id] = -1
             
             optimized_order.append(next_job)
-            installed_packages.add(next_job.package_name)
-            remaining_jobs.remove(next_job)
+            scheduled.add(next_job.id)
+            
+            package_name = next_job.package_name
+            if package_name not in installed_packages:
+                installed_packages.add(package_name)
+                for job in dependents.get(package_name, ()):
+                    waiting_on[job.id] -= 1
+                    if waiting_on[job.id] == 0:
+                        self._push_ready(ready, job, bottom_levels, now)
         
         return optimized_order
     
-    def detect_circular_dependencies(self, jobs: List[InstallationJob]) -> List[Tuple[str, str]]:
+    def _push_ready(
+        self,
+        ready: List[Tuple[float, int]],
+        job: "InstallationJob",
+        bottom_levels: Dict[str, float],
+        now: datetime
+    ) -> None:
+        """Score a ready job and push it onto the ready heap."""
+        heapq.heappush(ready, (self.calculate_job_score(job, bottom_levels, now), job.id))
+    
+    def detect_circular_dependencies(self, jobs: List["InstallationJob"]) -> List[Tuple[str, str]]:
         """Detect circular dependencies in the job list.
         
+        Uses an iterative form of Tarjan's strongly connected components
+        algorithm, so deep dependency chains cannot exceed the recursion
+        limit. Every dependency edge inside a component of two or more
+        packages lies on a cycle and is reported, as are self-dependencies.
+        
         Returns:
             List of tuples representing circular dependency edges
         """
         graph = self._build_dependency_graph(jobs)
         
-        def has_cycle_util(node: str, visited: Set[str], rec_stack: Set[str]) -> List[Tuple[str, str]]:
-            visited.add(node)
-            rec_stack.add(node)
-            cycles = []
-            
-            for neighbor in graph.get(node, set()):
-                if neighbor not in visited:
-                    cycles.extend(has_cycle_util(neighbor, visited, rec_stack))
-                elif neighbor in rec_stack:
-                    cycles.append((node, neighbor))
-            
-            rec_stack.remove(node)
-            return cycles
-        
-        visited = set()
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        component_stack: List[str] = []
         all_cycles = []
         
-        for node in graph:
-            if node not in visited:
-                all_cycles.extend(has_cycle_util(node, visited, set()))
+        for root in graph:
+            if root in index:
+                continue
+            
+            index[root] = lowlink[root] = len(index)
+            component_stack.append(root)
+            on_stack.add(root)
+            # Explicit DFS stack of (node, iterator over its dependencies)
+            stack = [(root, iter(graph[root]))]
+            
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        component_stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        stack.append((neighbor, iter(graph.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                else:
+                    # All dependencies explored
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    
+                    if lowlink[node] == index[node]:
+                        # node is the root of a component; pop it off
+                        component = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        
+                        if len(component) > 1:
+                            members = set(component)
+                            for member in component:
+                                all_cycles.extend(
+                                    (member, dependency)
+                                    for dependency in graph.get(member, ())
+                                    if dependency in members
+                                )
+                        elif node in graph.get(node, ()):
+                            all_cycles.append((node, node))
         
         return all_cycles
     
-    def estimate_total_time(self, jobs: List[InstallationJob]) -> float:
+    def estimate_total_time(self, jobs: List["InstallationJob"]) -> float:
         """Estimate total time for all jobs considering parallelization potential.
         
         Args:
@@ -0,0 +1,697 @@
+"""SQLite-based database implementation for the Spack installer queue system."""
+
+import os
+import json
+import sqlite3
+import threading
+import weakref
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Generator, Tuple
+from contextlib import contextmanager
+from .enums import JobStatus, JobPriority
+from .config import config
+from .database import SchedulerJob, read_json_database, scheduler_job
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    package_name TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    estimated_time REAL,
+    actual_time REAL,
+    submitted_by TEXT,
+    submitted_at TEXT,
+    started_at TEXT,
+    completed_at TEXT,
+    spack_command TEXT,
+    error_message TEXT,
+    dependencies_list TEXT NOT NULL DEFAULT '[]',
+    resource_requirements_dict TEXT NOT NULL DEFAULT '{}',
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    max_retries INTEGER NOT NULL,
+    last_retry_at TEXT,
+    retry_delay REAL NOT NULL,
+    is_retry INTEGER NOT NULL DEFAULT 0,
+    original_job_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_pkg_status ON jobs(package_name, status);
+
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_logs_job ON logs(job_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS worker_status (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    is_active INTEGER NOT NULL DEFAULT 0,
+    current_job_id INTEGER,
+    last_heartbeat TEXT,
+    started_at TEXT,
+    process_id INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Most idle connections kept for reuse by new threads
+CONNECTION_POOL_SIZE = 8
+
+# Job columns holding timestamps, returned as datetime objects
+_JOB_TIMESTAMPS = ('submitted_at', 'started_at', 'completed_at', 'last_retry_at')
+
+
+class _ConnectionHolder:
+    """Holds a thread's connection; released to the pool when collected."""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class SQLiteDatabase:
+    """SQLite-based database for storing job and worker information.
+
+    Exposes the same methods and returns the same dictionaries as
+    JSONDatabase, but each operation touches only the rows it needs instead
+    of reading and rewriting the whole database.
+    """
+
+    def __init__(self, db_path: str):
+        """Initialize the SQLite database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+
+        # Ensure directory exists
+        db_dir = os.path.dirname(self.db_path)
+        os.makedirs(db_dir, exist_ok=True)
+
+        # One connection per thread; sqlite3 connections are not shareable.
+        # When a thread exits its connection goes back to the pool for the
+        # next thread, so short-lived threads, such as the socket server's
+        # per-client handlers, do not each open a new one.
+        self._local = threading.local()
+        self._pool = deque()
+        self._pool_lock = threading.Lock()
+
+        # Incremented by every operation that changes the data, so callers
+        # can tell whether results they cached are still current
+        self.generation = 0
+
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, taking it from the pool on first use."""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            with self._pool_lock:
+                conn = self._pool.pop() if self._pool else None
+            if conn is None:
+                conn = self._open_connection()
+            holder = _ConnectionHolder(conn)
+            # Runs when the thread's locals are dropped as it exits
+            weakref.finalize(holder, self._release_connection, conn)
+            self._local.holder = holder
+        return holder.conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new connection to the database."""
+        # Autocommit mode; writes open their own transactions. Pooled
+        # connections move between threads, but only one uses each at a time.
+        conn = sqlite3.connect(
+            self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed while a write is in progress
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _release_connection(self, conn: sqlite3.Connection):
+        """Return an exited thread's connection to the pool, or close it."""
+        with self._pool_lock:
+            if not conn.in_transaction and len(self._pool) < CONNECTION_POOL_SIZE:
+                self._pool.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def batch(self) -> Generator['SQLiteDatabase', None, None]:
+        """Group several modifications into one transaction.
+
+        Modifying methods called by this thread inside the block share a
+        single transaction: they are committed together, and none of them
+        take effect if the block raises.
+
+        Yields:
+            This database
+        """
+        if getattr(self._local, 'in_batch', False):
+            yield self
+            return
+
+        with self._mutation():
+            self._local.in_batch = True
+            try:
+                yield self
+            finally:
+                self._local.in_batch = False
+
+    @contextmanager
+    def _mutation(self) -> Generator[sqlite3.Connection, None, None]:
+        """Transaction for operations that modify the data.
+
+        Takes the write lock up front and bumps ``generation`` once the
+        transaction has committed. Inside a batch() the operation joins the
+        batch's transaction instead.
+        """
+        conn = self._conn()
+        if getattr(self._local, 'in_batch', False):
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self.generation += 1
+
+    @staticmethod
+    def _to_text(value) -> Optional[str]:
+        """Convert a timestamp to its stored ISO form."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def _parse_datetime(self, dt_str: str) -> Optional[datetime]:
+        """Parse datetime string back to datetime object."""
+        if not dt_str:
+            return None
+        try:
+            return datetime.fromisoformat(dt_str)
+        except (ValueError, TypeError):
+            return None
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a jobs row to the job dictionary callers expect."""
+        job = dict(row)
+        for field in _JOB_TIMESTAMPS:
+            job[field] = self._parse_datetime(job[field])
+        job['dependencies_list'] = json.loads(job['dependencies_list'])
+        job['resource_requirements_dict'] = json.loads(job['resource_requirements_dict'])
+        job['is_retry'] = bool(job['is_retry'])
+        return job
+
+    def _fetch_job(self, conn: sqlite3.Connection, job_id: int) -> Optional[Dict[str, Any]]:
+        """Load one job through the given connection."""
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _insert_log(
+        self,
+        conn: sqlite3.Connection,
+        job_id: int,
+        level: str,
+        message: str,
+        timestamp: Optional[str] = None
+    ) -> None:
+        """Insert a log entry through the given connection.
+
+        Operations that also store a timestamp on the job pass the same
+        ``timestamp`` here, so the clock is read once per operation.
+        """
+        conn.execute(
+            "INSERT INTO logs (job_id, timestamp, level, message) VALUES (?, ?, ?, ?)",
+            (job_id, timestamp or datetime.utcnow().isoformat(), level, message)
+        )
+
+    def create_job(
+        self,
+        package_name: str,
+        priority: JobPriority,
+        estimated_time: float,
+        submitted_by: str,
+        spack_command: str = None,
+        dependencies: List[str] = None,
+        resource_requirements: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Create a new job and return its data as a dictionary."""
+        with self._mutation() as conn:
+            return self._insert_job(
+                conn,
+                package_name=package_name,
+                priority=priority,
+                estimated_time=estimated_time,
+                submitted_by=submitted_by,
+                spack_command=spack_command,
+                dependencies=dependencies,
+                resource_requirements=resource_requirements
+            )
+
+    def create_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several jobs in a single transaction.
+
+        Args:
+            jobs: List of keyword-argument dicts as accepted by create_job
+
+        Returns:
+            List of created job dictionaries, in input order
+
+        Raises:
+            ValueError: If any package is already queued; no jobs are created
+        """
+        with self._mutation() as conn:
+            return [self._insert_job(conn, **job) for job in jobs]
+
+    def _insert_job(
+        self,
+        conn: sqlite3.Connection,
+        package_name: str,
+        priority: JobPriority,
+        estimated_time: float,
+        submitted_by: str,
+        spack_command: str = None,
+        dependencies: List[str] = None,
+        resource_requirements: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Insert a new job inside an open transaction."""
+        # Check if package is already queued or installed
+        existing_job = conn.execute(
+            "SELECT id FROM jobs WHERE package_name = ? AND status IN (?, ?) LIMIT 1",
+            (package_name, JobStatus.PENDING.value, JobStatus.RUNNING.value)
+        ).fetchone()
+
+        if existing_job:
+            raise ValueError(f"Package '{package_name}' is already queued or being installed (Job ID: {existing_job['id']})")
+
+        now = datetime.utcnow().isoformat()
+        cursor = conn.execute(
+            """INSERT INTO jobs (
+                package_name, priority, status, estimated_time, submitted_by, submitted_at,
+                spack_command, dependencies_list, resource_requirements_dict, max_retries, retry_delay
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                package_name,
+                priority.value,
+                JobStatus.PENDING.value,
+                estimated_time,
+                submitted_by,
+                now,
+                spack_command,
+                json.dumps(dependencies or []),
+                json.dumps(resource_requirements or {}),
+                config.DEFAULT_MAX_RETRIES,
+                config.DEFAULT_RETRY_DELAY
+            )
+        )
+        job_id = cursor.lastrowid
+        self._insert_log(conn, job_id, "INFO", f"Job submitted for package '{package_name}'", now)
+
+        return self._fetch_job(conn, job_id)
+
+    def get_job_by_id(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, returning a dictionary."""
+        return self._fetch_job(self._conn(), job_id)
+
+    def get_all_jobs(self, status: Optional[JobStatus] = None) -> List[Dict[str, Any]]:
+        """Get all jobs, optionally filtered by status, returning dictionaries."""
+        # Newest first; within a timestamp the newest (highest) id first,
+        # matching the JSON backend
+        if status is None:
+            rows = self._conn().execute(
+                "SELECT * FROM jobs ORDER BY submitted_at DESC, id DESC"
+            )
+        else:
+            rows = self._conn().execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY submitted_at DESC, id DESC",
+                (status.value,)
+            )
+        return [self._row_to_job(row) for row in rows]
+
+    def get_pending_job_objects(self) -> List[SchedulerJob]:
+        """Get pending jobs as scheduler objects, in get_all_jobs order.
+
+        Only the columns the scheduler uses are read, and only
+        ``submitted_at`` is parsed.
+        """
+        rows = self._conn().execute(
+            "SELECT id, package_name, priority, status, estimated_time, dependencies_list, submitted_at "
+            "FROM jobs WHERE status = ? ORDER BY submitted_at DESC, id DESC",
+            (JobStatus.PENDING.value,)
+        )
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['dependencies_list'] = json.loads(job['dependencies_list'])
+            jobs.append(scheduler_job(job, self._parse_datetime(job['submitted_at'])))
+        return jobs
+
+    def update_job_status(
+        self,
+        job_id: int,
+        status: JobStatus,
+        started_at=None,
+        completed_at=None,
+        actual_time=None,
+        error_message=None
+    ) -> bool:
+        """Update job status and related fields."""
+        assignments = ["status = ?"]
+        values = [status.value]
+        if started_at is not None:
+            assignments.append("started_at = ?")
+            values.append(self._to_text(started_at))
+        if completed_at is not None:
+            assignments.append("completed_at = ?")
+            values.append(self._to_text(completed_at))
+        if actual_time is not None:
+            assignments.append("actual_time = ?")
+            values.append(actual_time)
+        if error_message is not None:
+            assignments.append("error_message = ?")
+            values.append(error_message)
+        values.append(job_id)
+
+        with self._mutation() as conn:
+            cursor = conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", values)
+            if cursor.rowcount == 0:
+                return False
+
+            # Add log entry
+            log_message = f"Job status changed to {status.value}"
+            if error_message:
+                log_message += f": {error_message}"
+            level = "ERROR" if status == JobStatus.FAILED else "INFO"
+            self._insert_log(conn, job_id, level, log_message)
+
+            return True
+
+    def get_job_logs(self, job_id: int) -> List[Dict[str, Any]]:
+        """Get logs for a specific job."""
+        return self.get_job_logs_page(job_id)[0]
+
+    def get_job_logs_page(
+        self,
+        job_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get a range of a job's logs, in timestamp order.
+
+        Args:
+            job_id: ID of the job
+            offset: Number of entries to skip
+            limit: Maximum number of entries to return (all if None)
+
+        Returns:
+            The entries, and the job's total number of entries
+        """
+        conn = self._conn()
+        (total,) = conn.execute("SELECT COUNT(*) FROM logs WHERE job_id = ?", (job_id,)).fetchone()
+        # A negative LIMIT means no limit
+        rows = conn.execute(
+            "SELECT * FROM logs WHERE job_id = ? ORDER BY timestamp, id LIMIT ? OFFSET ?",
+            (job_id, -1 if limit is None else limit, offset)
+        )
+        logs = []
+        for row in rows:
+            log = dict(row)
+            log['timestamp'] = self._parse_datetime(log['timestamp'])
+            logs.append(log)
+        return logs, total
+
+    def add_job_log(self, job_id: int, level: str, message: str) -> bool:
+        """Add a log entry for a specific job."""
+        with self._mutation() as conn:
+            self._insert_log(conn, job_id, level, message)
+            return True
+
+    def add_job_logs(self, job_id: int, level: str, messages: List[str]) -> bool:
+        """Add several log entries for a job in one transaction.
+
+        Args:
+            job_id: ID of the job
+            level: Level of every entry
+            messages: Messages, in order
+
+        Returns:
+            True once the entries are stored
+        """
+        timestamp = datetime.utcnow().isoformat()
+        with self._mutation() as conn:
+            conn.executemany(
+                "INSERT INTO logs (job_id, timestamp, level, message) VALUES (?, ?, ?, ?)",
+                [(job_id, timestamp, level, message) for message in messages]
+            )
+            return True
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get count of jobs by status."""
+        status_counts = {status.value: 0 for status in JobStatus}
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        for status, count in rows:
+            if status in status_counts:
+                status_counts[status] = count
+        return status_counts
+
+    def get_completed_package_names(self) -> set:
+        """Get set of package names that have been completed successfully."""
+        rows = self._conn().execute(
+            "SELECT DISTINCT package_name FROM jobs WHERE status = ?",
+            (JobStatus.COMPLETED.value,)
+        )
+        return {row[0] for row in rows}
+
+    def cleanup_old_jobs(self, keep_days: int) -> int:
+        """Clean up old completed/failed jobs."""
+        cutoff_date = (datetime.utcnow() - timedelta(days=keep_days)).isoformat()
+
+        with self._mutation() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND completed_at IS NOT NULL AND completed_at < ?",
+                (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value, cutoff_date)
+            )
+            deleted_count = cursor.rowcount
+
+            # Also clean up logs for deleted jobs
+            conn.execute("DELETE FROM logs WHERE job_id NOT IN (SELECT id FROM jobs)")
+
+            return deleted_count
+
+    def import_json(self, json_path: str) -> int:
+        """Copy the jobs and logs of a JSON database into this one.
+
+        Used once, when switching an existing install to SQLite. Jobs and
+        log entries keep their IDs. The import is recorded in the ``meta``
+        table in the same transaction, so later calls, even from another
+        process or after jobs have been cleaned up, change nothing. The
+        JSON files are only read.
+
+        Args:
+            json_path: Path of the JSON database
+
+        Returns:
+            Number of jobs imported
+        """
+        if self._json_imported(self._conn()):
+            return 0
+
+        with self._mutation() as conn:
+            if self._json_imported(conn):
+                return 0
+
+            # Databases that took their import before it was recorded
+            # already hold the jobs
+            if conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone():
+                jobs, logs = [], []
+            else:
+                jobs, logs = read_json_database(json_path)
+
+            columns = [row['name'] for row in conn.execute("PRAGMA table_info(jobs)")]
+            insert_job = (
+                f"INSERT INTO jobs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
+            )
+            for job in jobs:
+                row = {
+                    **job,
+                    'dependencies_list': json.dumps(job.get('dependencies_list') or []),
+                    'resource_requirements_dict': json.dumps(job.get('resource_requirements_dict') or {}),
+                    'is_retry': int(bool(job.get('is_retry'))),
+                }
+                conn.execute(insert_job, [self._to_text(row.get(column)) for column in columns])
+
+            # Entries of jobs that were removed are left out
+            job_ids = {job['id'] for job in jobs}
+            conn.executemany(
+                "INSERT INTO logs (id, job_id, timestamp, level, message) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (log.get('id'), log['job_id'], self._to_text(log['timestamp']), log['level'], log['message'])
+                    for log in logs
+                    if log.get('job_id') in job_ids
+                ]
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_imported', ?)",
+                (json_path,)
+            )
+            return len(jobs)
+
+    @staticmethod
+    def _json_imported(conn: sqlite3.Connection) -> bool:
+        """Return whether a JSON database has been imported into this one."""
+        return conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone() is not None
+
+    def create_retry_job(self, original_job_id: int) -> Optional[Dict[str, Any]]:
+        """Create a retry job for a failed job.
+
+        Args:
+            original_job_id: The ID of the original failed job
+
+        Returns:
+            Dictionary of the new retry job, or None if retry not possible
+        """
+        with self._mutation() as conn:
+            original_job = self._fetch_job(conn, original_job_id)
+            if not original_job:
+                return None
+
+            # Check if job is eligible for retry
+            if original_job["status"] != JobStatus.FAILED.value:
+                return None
+
+            # Check if we've exceeded max retries
+            if original_job["retry_count"] >= original_job["max_retries"]:
+                return None
+
+            # Calculate retry delay with exponential backoff
+            retry_count = original_job["retry_count"] + 1
+            retry_delay = original_job["retry_delay"] * (config.RETRY_BACKOFF_FACTOR ** (retry_count - 1))
+            now = datetime.utcnow().isoformat()
+
+            cursor = conn.execute(
+                """INSERT INTO jobs (
+                    package_name, priority, status, estimated_time, submitted_by, submitted_at,
+                    spack_command, dependencies_list, resource_requirements_dict,
+                    retry_count, max_retries, last_retry_at, retry_delay, is_retry, original_job_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)""",
+                (
+                    original_job['package_name'],
+                    original_job['priority'],
+                    JobStatus.PENDING.value,
+                    original_job['estimated_time'],
+                    original_job['submitted_by'],
+                    now,
+                    original_job['spack_command'],
+                    json.dumps(original_job['dependencies_list']),
+                    json.dumps(original_job['resource_requirements_dict']),
+                    retry_count,
+                    original_job['max_retries'],
+                    now,
+                    retry_delay,
+                    original_job['original_job_id'] or original_job_id
+                )
+            )
+            job_id = cursor.lastrowid
+
+            # Update original job to increment retry count
+            conn.execute(
+                "UPDATE jobs SET retry_count = ?, last_retry_at = ? WHERE id = ?",
+                (retry_count, now, original_job_id)
+            )
+
+            # Add log entries
+            self._insert_log(
+                conn, job_id, "INFO",
+                f"Retry job created (attempt {retry_count}/{original_job['max_retries']}) for original job {original_job_id}",
+                now
+            )
+            self._insert_log(
+                conn, original_job_id, "INFO",
+                f"Retry attempt {retry_count} created as job {job_id}, next retry delay: {retry_delay:.1f}s",
+                now
+            )
+
+            return self._fetch_job(conn, job_id)
+
+    def get_jobs_eligible_for_retry(self) -> List[Dict[str, Any]]:
+        """Get failed jobs that are eligible for retry.
+
+        Returns:
+            List of job dictionaries that can be retried
+        """
+        rows = self._conn().execute(
+            "SELECT * FROM jobs WHERE status = ? AND retry_count < max_retries",
+            (JobStatus.FAILED.value,)
+        )
+
+        eligible_jobs = []
+        current_time = datetime.utcnow()
+        for row in rows:
+            job = self._row_to_job(row)
+
+            # Check if enough time has passed since last retry
+            last_retry = job['last_retry_at']
+            if last_retry and (current_time - last_retry).total_seconds() < job["retry_delay"]:
+                continue
+
+            eligible_jobs.append(job)
+
+        return eligible_jobs
+
+    def get_worker_status(self) -> Optional[Dict[str, Any]]:
+        """Get worker status information."""
+        row = self._conn().execute(
+            "SELECT is_active, current_job_id, last_heartbeat, started_at, process_id "
+            "FROM worker_status WHERE id = 1"
+        ).fetchone()
+        if not row:
+            return None
+
+        worker = dict(row)
+        worker['is_active'] = bool(worker['is_active'])
+        worker['started_at'] = self._parse_datetime(worker['started_at'])
+        worker['last_heartbeat'] = self._parse_datetime(worker['last_heartbeat'])
+        return worker
+
+    def update_worker_status(
+        self,
+        is_active: bool,
+        current_job_id: Optional[int] = None,
+        started_at=None,
+        process_id: Optional[int] = None
+    ) -> None:
+        """Update worker status."""
+        with self._mutation() as conn:
+            conn.execute("INSERT OR IGNORE INTO worker_status (id) VALUES (1)")
+
+            if not is_active:
+                conn.execute(
+                    "UPDATE worker_status SET is_active = 0, current_job_id = NULL, last_heartbeat = ?, "
+                    "started_at = NULL, process_id = NULL WHERE id = 1",
+                    (datetime.utcnow().isoformat(),)
+                )
+                return
+
+            conn.execute(
+                "UPDATE worker_status SET is_active = 1, current_job_id = ?, last_heartbeat = ?, "
+                "started_at = COALESCE(?, started_at), process_id = COALESCE(?, process_id) WHERE id = 1",
+                (current_job_id, datetime.utcnow().isoformat(), self._to_text(started_at), process_id)
+            )
+
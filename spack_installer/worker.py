@@ -1,19 +1,24 @@
 """Multi-user worker daemon for executing installation jobs."""
 
 import os
+import re
 import sys
 import time
 import signal
+import selectors
 import subprocess
 import threading
 import shlex
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Union
 from .database import get_db_manager
 from .queue_manager import QueueManager
 from .config import config
 from .auth import authenticate_user, REQUIRED_GROUP
 
+# Words marking an output line as a likely explanation of a failure
+_ERROR_LINE_RE = re.compile(r'error|failed|cannot|unable', re.IGNORECASE)
+
 
 class InstallationWorker:
     """Multi-user worker daemon that executes installation jobs sequentially."""
@@ -30,10 +35,7 @@ class InstallationWorker:
         
         # Use system database path for multi-user mode
         if use_system_database:
-            # Override database path to use system-wide location
-            original_db_path = config.DATABASE_PATH
-            config.DATABASE_PATH = config.get_multi_user_database_path()
-            print(f"Worker using multi-user database: {config.DATABASE_PATH}")
+            print(f"Worker using multi-user database: {config.MULTI_USER_DATABASE_PATH}")
         
         self.queue_manager = QueueManager()
         self.db = get_db_manager()
@@ -41,6 +43,20 @@ class InstallationWorker:
         self.current_job_id = None
         self.current_job_user = None
         self.heartbeat_thread = None
+        self.started_at = None
+        
+        # Last worker status written, as (is_active, current job id,
+        # time.monotonic() of the write), so repeated writes can be skipped
+        self._last_status_write = None
+        
+        # Environment produced by sourcing the spack setup script, captured
+        # once as (script path, environment or None if sourcing it failed)
+        # and reused for every command
+        self._spack_env = None
+        
+        # Command currently run for a job; it leads its own process group
+        self._current_process = None
+        
         self._setup_signal_handlers()
     
     def _setup_signal_handlers(self):
@@ -51,6 +67,13 @@ class InstallationWorker:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         print(f"\nReceived signal {signum}, shutting down gracefully...")
+        
+        # The running command is in its own process group, so terminal
+        # signals no longer reach it; pass the shutdown on to the group
+        process = self._current_process
+        if process is not None:
+            self._signal_process_group(process, signal.SIGTERM)
+        
         self.stop()
     
     def start(self):
@@ -62,6 +85,7 @@ class InstallationWorker:
             self._ensure_system_database_setup()
         
         # Update worker status in database
+        self.started_at = datetime.utcnow()
         self._update_worker_status(True)
         
         self.running = True
@@ -79,7 +103,7 @@ class InstallationWorker:
     
     def _ensure_system_database_setup(self):
         """Ensure the system database directory exists with proper permissions."""
-        db_path = config.get_multi_user_database_path()
+        db_path = config.MULTI_USER_DATABASE_PATH
         db_dir = os.path.dirname(db_path)
         
         # Create directory if it doesn't exist
@@ -165,16 +189,18 @@ class InstallationWorker:
         self.current_job_user = job.get('submitted_by', 'unknown')
         
         try:
-            # Mark job as running
-            if not self.queue_manager.mark_job_running(job_id):
-                print(f"Failed to mark job {job_id} as running")
-                return
-            
-            # Update worker status with current job
-            self._update_worker_status(True, job_id)
-            
-            # Log job start with user information
-            self._log_message(job_id, "INFO", f"Starting installation for user: {self.current_job_user}")
+            # Starting the job is written to the database in one transaction
+            with self.db.batch():
+                # Mark job as running
+                if not self.queue_manager.mark_job_running(job_id):
+                    print(f"Failed to mark job {job_id} as running")
+                    return
+                
+                # Update worker status with current job
+                self._update_worker_status(True, job_id)
+                
+                # Log job start with user information
+                self._log_message(job_id, "INFO", f"Starting installation for user: {self.current_job_user}")
             
             # First, run spack spec to get package information
             spec_success, spec_error = self._run_spack_spec(job)
@@ -182,22 +208,27 @@ class InstallationWorker:
             if not spec_success:
                 # Spec failed, fail the entire job
                 print(f"Package specification failed for {job['package_name']} for user {self.current_job_user}: {spec_error}")
-                self._log_message(job_id, "ERROR", f"Package specification failed, aborting installation: {spec_error}")
-                self.queue_manager.mark_job_completed(job_id, False, f"Spec failed: {spec_error}")
+                with self.db.batch():
+                    self._log_message(job_id, "ERROR", f"Package specification failed, aborting installation: {spec_error}")
+                    self.queue_manager.mark_job_completed(job_id, False, f"Spec failed: {spec_error}")
                 return
             
             # Execute the installation
             success, error_message = self._run_spack_install(job)
             
-            # Mark job as completed
-            self.queue_manager.mark_job_completed(job_id, success, error_message)
+            # Mark job as completed, together with its final log entry
+            with self.db.batch():
+                self.queue_manager.mark_job_completed(job_id, success, error_message)
+                
+                if success:
+                    self._log_message(job_id, "INFO", f"Installation completed successfully for user: {self.current_job_user}")
+                else:
+                    self._log_message(job_id, "ERROR", f"Installation failed for user {self.current_job_user}: {error_message}")
             
             if success:
                 print(f"Successfully installed {job['package_name']} for user {self.current_job_user}")
-                self._log_message(job_id, "INFO", f"Installation completed successfully for user: {self.current_job_user}")
             else:
                 print(f"Failed to install {job['package_name']} for user {self.current_job_user}: {error_message}")
-                self._log_message(job_id, "ERROR", f"Installation failed for user {self.current_job_user}: {error_message}")
                 
         except Exception as e:
             print(f"Error executing job {job_id} for user {self.current_job_user}: {e}")
@@ -221,7 +252,7 @@ class InstallationWorker:
         
         try:
             # Get spack setup script
-            spack_setup_script = config.get_spack_setup_script()
+            spack_setup_script = config.SPACK_SETUP_SCRIPT
             
             if not config.validate_spack_setup():
                 error_msg = f"Spack setup script not found: {spack_setup_script}"
@@ -229,16 +260,14 @@ class InstallationWorker:
                 return False, error_msg
             
             # Build the spack spec command
-            quoted_pkg = self._quote_spack_package(package_name)
-            spec_command = f"spack spec {quoted_pkg}"
-            full_command = f"source {spack_setup_script} && {spec_command}"
+            command = self._spack_command(["spack", "spec", package_name])
             
             # Log the command being executed
             self._log_message(job_id, "INFO", f"Getting package specification: spack spec {package_name}")
             print(f"Running spack spec for {package_name}")
             
             # Run the spec command with streaming (but shorter timeout)
-            success, error_msg = self._run_command_with_streaming(job_id, full_command, 600)
+            success, error_msg = self._run_command_with_streaming(job_id, command, 600, env=self._spack_env_vars())
             
             if success:
                 self._log_message(job_id, "INFO", "Package specification retrieved successfully")
@@ -265,6 +294,8 @@ class InstallationWorker:
         job_id = job['id']
         
         try:
+            env = None
+            
             # Determine the spack command to run
             if job['spack_command']:
                 # Use custom command if provided
@@ -273,18 +304,20 @@ class InstallationWorker:
                 # Check if the custom command already includes sourcing
                 if "source " in spack_command and "setup-env.sh" in spack_command:
                     # Custom command already handles spack setup
-                    full_command = spack_command
+                    command = spack_command
                 else:
                     # Add spack setup to custom command
-                    spack_setup_script = config.get_spack_setup_script()
+                    spack_setup_script = config.SPACK_SETUP_SCRIPT
                     if not config.validate_spack_setup():
                         error_msg = f"Spack setup script not found at: {spack_setup_script}"
                         self._log_message(job_id, "ERROR", error_msg)
                         return False, error_msg
-                    full_command = f"source {spack_setup_script} && {spack_command}"
+                    command = self._spack_command(spack_command)
+                    env = self._spack_env_vars()
+                log_command = spack_command
             else:
                 # Default spack install command
-                spack_setup_script = config.get_spack_setup_script()
+                spack_setup_script = config.SPACK_SETUP_SCRIPT
                 
                 # Validate that the setup script exists
                 if not config.validate_spack_setup():
@@ -292,99 +325,110 @@ class InstallationWorker:
                     self._log_message(job_id, "ERROR", error_msg)
                     return False, error_msg
                 
-                quoted_pkg = self._quote_spack_package(job['package_name'])
-                spack_command = f"spack install {quoted_pkg}"
-                full_command = f"source {spack_setup_script} && {spack_command}"
+                command = self._spack_command(["spack", "install", job['package_name']])
+                env = self._spack_env_vars()
+                # Log the user-friendly version (without quotes) for readability
+                log_command = f"spack install {job['package_name']}"
             
             # Log the command being executed
-            # Log the user-friendly version (without quotes) for readability
-            log_command = full_command.replace(quoted_pkg, job['package_name'])
             self._log_message(job_id, "INFO", f"Executing command: {log_command}")
             print(f"Executing: {log_command}")
             
             # Run the command with real-time output streaming
-            return self._run_command_with_streaming(job_id, full_command, job['estimated_time'])
+            return self._run_command_with_streaming(job_id, command, job['estimated_time'], env=env)
                 
         except Exception as e:
             error_msg = f"Execution error: {str(e)}"
             self._log_message(job_id, "ERROR", error_msg)
             return False, error_msg
     
-    def _run_command_with_streaming(self, job_id: int, command: str, estimated_time: float) -> tuple[bool, Optional[str]]:
+    def _run_command_with_streaming(
+        self,
+        job_id: int,
+        command: Union[str, List[str]],
+        estimated_time: float,
+        env: Optional[Dict[str, str]] = None
+    ) -> tuple[bool, Optional[str]]:
         """Run a command with real-time output streaming and logging.
         
         Args:
             job_id: The job ID for logging
-            command: The command to execute
+            command: Argument list to execute directly, or a bash command line
             estimated_time: Estimated time for timeout calculation
+            env: Environment for the command, or None to inherit the worker's
             
         Returns:
             Tuple of (success, error_message)
         """
         try:
             # Start the process
+            use_shell = isinstance(command, str)
             process = subprocess.Popen(
                 command,
-                shell=True,
-                executable="/bin/bash",
+                shell=use_shell,
+                executable="/bin/bash" if use_shell else None,
+                env=env,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,  # Merge stderr into stdout for unified streaming
-                text=True,
-                bufsize=1,  # Line buffered
-                universal_newlines=True
+                # Lead a new process group, so the compilers and other
+                # processes the command starts can be stopped with it
+                start_new_session=True
             )
+            self._current_process = process
             
-            # Track the process start time for timeout
-            start_time = time.time()
+            # Track the deadline for the timeout
             timeout_seconds = estimated_time * config.DEFAULT_JOB_TIMEOUT_MULTIPLIER
+            deadline = time.monotonic() + timeout_seconds
             
             stdout_lines = []
             
-            # Read output line by line in real-time
-            while True:
-                # Check for timeout
-                elapsed_time = time.time() - start_time
-                if elapsed_time > timeout_seconds:
-                    process.terminate()
+            # Wait for output with select, so each line is logged as soon as
+            # it arrives and the timeout is enforced even while the command
+            # is silent
+            stdout_fd = process.stdout.fileno()
+            os.set_blocking(stdout_fd, False)
+            pending = b""
+            with selectors.DefaultSelector() as selector:
+                selector.register(stdout_fd, selectors.EVENT_READ)
+                while True:
+                    remaining_time = deadline - time.monotonic()
+                    if remaining_time <= 0:
+                        self._signal_process_group(process, signal.SIGTERM)
+                        try:
+                            process.wait(timeout=5)  # Wait up to 5 seconds for graceful termination
+                        except subprocess.TimeoutExpired:
+                            pass
+                        # Force kill whatever is left of the group, including
+                        # children that outlived the command itself
+                        self._signal_process_group(process, signal.SIGKILL)
+                        process.wait()
+                        process.stdout.close()
+                        
+                        timeout_msg = f"Installation timed out after {timeout_seconds:.1f} seconds"
+                        self._log_message(job_id, "ERROR", timeout_msg)
+                        return False, timeout_msg
+                    
+                    if not selector.select(timeout=remaining_time):
+                        continue
+                    
                     try:
-                        process.wait(timeout=5)  # Wait up to 5 seconds for graceful termination
-                    except subprocess.TimeoutExpired:
-                        process.kill()  # Force kill if it doesn't terminate gracefully
+                        chunk = os.read(stdout_fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        # End of output
+                        break
                     
-                    timeout_msg = f"Installation timed out after {timeout_seconds:.1f} seconds"
-                    self._log_message(job_id, "ERROR", timeout_msg)
-                    return False, timeout_msg
-                
-                # Read a line from stdout
-                line = process.stdout.readline()
-                
-                if line:
-                    # Remove trailing newline and log the line immediately
-                    line_content = line.rstrip('\n\r')
-                    if line_content:  # Only log non-empty lines
-                        self._log_message(job_id, "INFO", f"INSTALL: {line_content}")
-                        stdout_lines.append(line_content)
-                        
-                        # Also print to console for immediate feedback with user context
-                        print(f"[Job {job_id}|{self.current_job_user}] {line_content}")
-                
-                # Check if process has finished
-                if process.poll() is not None:
-                    # Process has finished, read any remaining output
-                    remaining_output = process.stdout.read()
-                    if remaining_output:
-                        for remaining_line in remaining_output.strip().split('\n'):
-                            if remaining_line.strip():
-                                self._log_message(job_id, "INFO", f"INSTALL: {remaining_line}")
-                                stdout_lines.append(remaining_line)
-                                print(f"[Job {job_id}|{self.current_job_user}] {remaining_line}")
-                    break
-                
-                # Small sleep to prevent excessive CPU usage
-                time.sleep(0.1)
+                    # All lines of one read are logged in a single call
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    self._record_output_lines(job_id, lines, stdout_lines)
+            
+            # Output without a final newline
+            self._record_output_lines(job_id, [pending], stdout_lines)
+            process.stdout.close()
             
             # Get the return code
-            return_code = process.returncode
+            return_code = process.wait()
             
             # Log the completion
             self._log_message(job_id, "INFO", f"Command completed with exit code: {return_code}")
@@ -405,7 +449,7 @@ class InstallationWorker:
                     # Get last few lines that might contain error information
                     last_lines = stdout_lines[-5:]
                     for line in reversed(last_lines):
-                        if any(keyword in line.lower() for keyword in ['error', 'failed', 'cannot', 'unable']):
+                        if _ERROR_LINE_RE.search(line):
                             # Include first 100 chars of the error line
                             summary_error += f": {line[:100]}"
                             break
@@ -416,6 +460,8 @@ class InstallationWorker:
             error_msg = f"Process execution error: {str(e)}"
             self._log_message(job_id, "ERROR", error_msg)
             return False, error_msg
+        finally:
+            self._current_process = None
     
     def _log_message(self, job_id: int, level: str, message: str):
         """Log a message for a specific job."""
@@ -429,8 +475,23 @@ class InstallationWorker:
             print(f"[{level}] Job {job_id}{user_context}: {message}")
     
     def _update_worker_status(self, is_active: bool, current_job_id: Optional[int] = None):
-        """Update worker status in the database."""
-        started_at = datetime.utcnow() if is_active else None
+        """Update worker status in the database.
+        
+        A write that would store the same active state as one made less
+        than half a heartbeat interval ago is skipped; the stored heartbeat
+        is still recent enough, and each write costs a database commit.
+        """
+        now = time.monotonic()
+        last = self._last_status_write
+        if (
+            is_active
+            and last is not None
+            and last[:2] == (is_active, current_job_id)
+            and now - last[2] < config.WORKER_HEARTBEAT_INTERVAL / 2
+        ):
+            return
+        
+        started_at = self.started_at if is_active else None
         process_id = os.getpid() if is_active else None
         
         self.db.update_worker_status(
@@ -439,6 +500,7 @@ class InstallationWorker:
             started_at=started_at,
             process_id=process_id
         )
+        self._last_status_write = (is_active, current_job_id, now)
     
     def _heartbeat_loop(self):
         """Heartbeat loop to update worker status."""
@@ -450,6 +512,110 @@ class InstallationWorker:
                 print(f"Heartbeat error: {e}")
                 time.sleep(config.WORKER_HEARTBEAT_INTERVAL)
     
+    def _signal_process_group(self, process: subprocess.Popen, signum: int):
+        """Send a signal to every process in a command's process group.
+        
+        Args:
+            process: Command started as the leader of a new process group
+            signum: Signal to send
+        """
+        try:
+            # The group id equals the leader's pid, even after it has exited
+            os.killpg(process.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            # The whole group is gone already
+            pass
+    
+    def _record_output_lines(self, job_id: int, lines: List[bytes], stdout_lines: List[str]):
+        """Log and print lines of command output, skipping empty lines.
+        
+        The lines are written to the job log with a single database call,
+        rather than one per line.
+        
+        Args:
+            job_id: The job ID for logging
+            lines: The lines, without their newlines
+            stdout_lines: Collected output, to which the lines are appended
+        """
+        messages = []
+        for line in lines:
+            line_content = line.decode(errors="replace").rstrip('\r')
+            if not line_content:
+                continue
+            
+            messages.append(f"INSTALL: {line_content}")
+            stdout_lines.append(line_content)
+            
+            # Also print to console for immediate feedback with user context
+            print(f"[Job {job_id}|{self.current_job_user}] {line_content}")
+        
+        if not messages:
+            return
+        try:
+            self.db.add_job_logs(job_id, "INFO", messages)
+        except Exception as e:
+            # The lines were already printed to the console
+            print(f"Failed to log messages: {e}")
+    
+    def _spack_env_vars(self) -> Optional[Dict[str, str]]:
+        """Return the environment the spack setup script produces.
+        
+        Sourcing the setup script is slow, so it is done once, in a throwaway
+        bash, and the resulting environment is reused for every command. A
+        failed capture is remembered as well, until the script path changes.
+        
+        Returns:
+            The environment, or None if it could not be captured, in which
+            case commands source the setup script themselves
+        """
+        spack_setup_script = config.SPACK_SETUP_SCRIPT
+        if self._spack_env is not None and self._spack_env[0] == spack_setup_script:
+            return self._spack_env[1]
+        
+        try:
+            output = subprocess.run(
+                ["/bin/bash", "-c", f"source {shlex.quote(spack_setup_script)} >/dev/null 2>&1 && env -0"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+                timeout=300
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Could not capture the spack environment, sourcing it per command: {e}")
+            # Remember the failure too, so a broken setup script is not
+            # sourced again, with its long timeout, before every command
+            self._spack_env = (spack_setup_script, None)
+            return None
+        
+        env = {}
+        for entry in output.decode(errors="surrogateescape").split("\0"):
+            name, sep, value = entry.partition("=")
+            if sep and name:
+                env[name] = value
+        self._spack_env = (spack_setup_script, env)
+        return env
+    
+    def _spack_command(self, command: Union[str, List[str]]) -> Union[str, List[str]]:
+        """Prepare a spack command to run in the spack environment.
+        
+        With the environment captured (see _spack_env_vars), an argument list
+        runs directly and a command line runs in bash as is. Otherwise the
+        command is turned into a bash command line that first sources the
+        setup script.
+        
+        Args:
+            command: Argument list, or a bash command line
+            
+        Returns:
+            The command to pass to _run_command_with_streaming
+        """
+        if self._spack_env_vars() is not None:
+            return command
+        
+        if not isinstance(command, str):
+            command = " ".join(self._quote_spack_package(arg) for arg in command)
+        return f"source {config.SPACK_SETUP_SCRIPT} && {command}"
+    
     def _quote_spack_package(self, package_name: str) -> str:
         """Properly quote a package name for use in spack commands.
         
@@ -472,18 +638,19 @@ class InstallationWorker:
             return f"'{package_name}'"
 
 
-def start_worker(use_system_database: bool = True):
+def start_worker(use_system_database: bool = True, check_interval: float = None):
     """Start the worker daemon.
     
     Args:
         use_system_database: Whether to use system-wide database for multi-user support
+        check_interval: Seconds between queue checks (default: WORKER_CHECK_INTERVAL)
     """
     # First authenticate the user
     if not authenticate_user():
         print(f"Error: Only users in the '{REQUIRED_GROUP}' group with proper database access can start the worker.")
         sys.exit(1)
         
-    worker = InstallationWorker(use_system_database=use_system_database)
+    worker = InstallationWorker(check_interval=check_interval, use_system_database=use_system_database)
     
     # Check if another worker is already running
     if worker.is_running():
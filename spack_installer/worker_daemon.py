@@ -13,18 +13,12 @@ import signal
 import logging
 import socket
 import threading
+import time
 import json
+import sqlite3
 import socketserver
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
-
-# Custom JSON encoder to handle datetime objects
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+from typing import Dict, Any, Optional, Iterator
 
 # Add the package to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -32,69 +26,112 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from spack_installer.worker import InstallationWorker
 from spack_installer.config import config
 from spack_installer.queue_manager import QueueManager
-from spack_installer.models import JobPriority
-from spack_installer.database import get_db_manager
+from spack_installer.enums import JobPriority
+from spack_installer.database import get_db_manager, open_sqlite_database, sqlite_path_for
+from spack_installer.protocol import encode, decode, send_message, recv_message
 
-# Global worker instance and server instance
+# Global worker instance and server instances
 _worker_instance = None
-_server_instance = None
+_server_instances = []
+
+# TCP listeners bound to the server port, each with its own accept queue
+# the kernel balances connections across. Requires SO_REUSEPORT.
+TCP_LISTENER_COUNT = (os.cpu_count() or 1) if hasattr(socket, "SO_REUSEPORT") else 1
+
+# Seconds shutdown waits for requests in progress to be answered
+SHUTDOWN_DRAIN_TIMEOUT = 30.0
+
+
+class RequestError(Exception):
+    """A request failed; the message is returned to the client."""
 
 
 class SpackJobHandler(socketserver.BaseRequestHandler):
     """Request handler for processing job submission requests via socket."""
     
-    def __init__(self, *args, **kwargs):
-        self.queue_manager = QueueManager()
-        super().__init__(*args, **kwargs)
+    # Seconds an open client connection may stay idle between requests
+    idle_timeout = 300.0
+    
+    def setup(self):
+        self.server.track_connection(self.request, True)
+    
+    def finish(self):
+        self.server.track_connection(self.request, False)
     
     def handle(self):
-        """Handle incoming socket requests."""
+        """Handle incoming socket requests.
+        
+        A connection may carry several length-prefixed requests; they are
+        answered in order until the client closes the connection or it
+        stays idle longer than ``idle_timeout``.
+        """
+        self.request.settimeout(self.idle_timeout)
+        if self.request.family in (socket.AF_INET, socket.AF_INET6):
+            # Don't hold back small responses or log pages waiting for ACKs
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            try:
+                data = recv_message(self.request)
+            except (ConnectionError, OSError):
+                break
+            if data is None:
+                break
+            self._handle_message(data)
+    
+    def _handle_message(self, data: bytes):
+        """Parse and dispatch a single request."""
         try:
-            # Receive request data
-            data = b''
-            while True:
-                chunk = self.request.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-            
             if not data:
                 self._send_error("No data received")
                 return
             
             # Parse request
             try:
-                request = json.loads(data.decode('utf-8'))
+                request = decode(data)
             except json.JSONDecodeError as e:
                 self._send_error(f"Invalid JSON: {e}")
                 return
             
-            # Process request
-            action = request.get('action')
-            if action == 'submit_job':
-                self._handle_submit_job(request.get('params', {}))
-            elif action == 'get_status':
-                self._handle_get_status(request.get('params', {}))
-            elif action == 'get_jobs':
-                self._handle_get_jobs(request.get('params', {}))
-            elif action == 'cancel_job':
-                self._handle_cancel_job(request.get('params', {}))
-            elif action == 'get_job_logs':
-                self._handle_get_job_logs(request.get('params', {}))
+            stream = self._STREAM_ACTIONS.get(request.get('action'))
+            if stream is not None:
+                self._send_stream(stream(self, request.get('params', {})))
             else:
-                self._send_error(f"Unknown action: {action}")
+                self._send_json(self._process_request(request))
                 
         except Exception as e:
             logging.exception(f"Error handling request: {e}")
             self._send_error(f"Server error: {e}")
     
-    def _send_response(self, data: Dict[str, Any]):
-        """Send successful response."""
-        response = {
-            'success': True,
-            'data': data
-        }
-        self._send_json(response)
+    def _process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single request and build its response envelope."""
+        action = request.get('action')
+        params = request.get('params', {})
+        
+        if action == 'batch':
+            # Run each sub-request in order over this one round trip
+            results = [self._process_request(sub_request) for sub_request in params.get('requests', [])]
+            return {'success': True, 'data': {'results': results}}
+        
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return {'success': False, 'error': f"Unknown action: {action}"}
+        
+        try:
+            return {'success': True, 'data': handler(self, params)}
+        except RequestError as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _send_stream(self, pages: Iterator[Dict[str, Any]]):
+        """Send each page of a streaming response as its own message.
+        
+        Every page carries a 'more' flag; the client reads until a page
+        without it or an error response.
+        """
+        try:
+            for page in pages:
+                self._send_json({'success': True, 'data': page})
+        except RequestError as e:
+            self._send_error(str(e))
     
     def _send_error(self, message: str):
         """Send error response."""
@@ -107,15 +144,14 @@ class SpackJobHandler(socketserver.BaseRequestHandler):
     def _send_json(self, data: Dict[str, Any]):
         """Send JSON response."""
         try:
-            response_json = json.dumps(data, cls=DateTimeEncoder).encode('utf-8')
-            self.request.sendall(response_json)
+            send_message(self.request, encode(data))
         except (BrokenPipeError, ConnectionResetError):
             # Client disconnected, ignore silently
             pass
         except Exception as e:
             logging.exception(f"Error sending response: {e}")
     
-    def _handle_submit_job(self, params: Dict[str, Any]):
+    def _handle_submit_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle job submission."""
         try:
             package_name = params.get('package_name')
@@ -126,18 +162,16 @@ class SpackJobHandler(socketserver.BaseRequestHandler):
             submitted_by = params.get('submitted_by')  # Get the username from client
             
             if not package_name:
-                self._send_error("Missing package_name parameter")
-                return
+                raise RequestError("Missing package_name parameter")
             
             # Parse priority
             try:
                 job_priority = JobPriority(priority.lower())
             except ValueError:
-                self._send_error(f"Invalid priority: {priority}")
-                return
+                raise RequestError(f"Invalid priority: {priority}")
             
             # Submit job with the provided username
-            job_info = self.queue_manager.submit_job(
+            return self.server.queue_manager.submit_job(
                 package_name=package_name,
                 priority=job_priority,
                 dependencies=dependencies,
@@ -146,83 +180,198 @@ class SpackJobHandler(socketserver.BaseRequestHandler):
                 submitted_by=submitted_by
             )
             
-            self._send_response(job_info)
-            
+        except RequestError:
+            raise
         except Exception as e:
             logging.exception(f"Error submitting job: {e}")
-            self._send_error(f"Error submitting job: {e}")
+            raise RequestError(f"Error submitting job: {e}")
     
-    def _handle_get_status(self, params: Dict[str, Any]):
+    def _handle_get_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle status request."""
         try:
-            print("DEBUG: Handling get_status request")
-            status = self.queue_manager.get_queue_status()
-            print(f"DEBUG: Got status: {status}")
-            self._send_response(status)
-            print("DEBUG: Sent response")
+            return self.server.queue_manager.get_queue_status()
         except Exception as e:
-            print(f"DEBUG: Error in get_status: {e}")
             logging.exception(f"Error getting status: {e}")
-            self._send_error(f"Error getting status: {e}")
+            raise RequestError(f"Error getting status: {e}")
     
-    def _handle_get_jobs(self, params: Dict[str, Any]):
+    def _handle_get_jobs(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get jobs request."""
         try:
             filter_status = params.get('status')
             if filter_status:
-                from spack_installer.models import JobStatus
-                jobs = self.queue_manager.get_all_jobs(JobStatus(filter_status))
+                from spack_installer.enums import JobStatus
+                jobs = self.server.queue_manager.get_all_jobs(JobStatus(filter_status))
             else:
-                jobs = self.queue_manager.get_all_jobs()
-            self._send_response({'jobs': jobs})
+                jobs = self.server.queue_manager.get_all_jobs()
+            return {'jobs': jobs}
         except Exception as e:
             logging.exception(f"Error getting jobs: {e}")
-            self._send_error(f"Error getting jobs: {e}")
+            raise RequestError(f"Error getting jobs: {e}")
     
-    def _handle_cancel_job(self, params: Dict[str, Any]):
+    def _handle_get_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle get job request."""
+        job_id = params.get('job_id')
+        if not job_id:
+            raise RequestError("Missing job_id parameter")
+        
+        try:
+            return {'job': self.server.queue_manager.get_job(job_id)}
+        except Exception as e:
+            logging.exception(f"Error getting job: {e}")
+            raise RequestError(f"Error getting job: {e}")
+    
+    def _handle_cancel_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle job cancellation."""
+        job_id = params.get('job_id')
+        if not job_id:
+            raise RequestError("Missing job_id parameter")
+        
         try:
-            job_id = params.get('job_id')
-            if not job_id:
-                self._send_error("Missing job_id parameter")
-                return
-            
-            success = self.queue_manager.cancel_job(job_id)
-            self._send_response({'cancelled': success})
+            return {'cancelled': self.server.queue_manager.cancel_job(job_id)}
         except Exception as e:
             logging.exception(f"Error cancelling job: {e}")
-            self._send_error(f"Error cancelling job: {e}")
+            raise RequestError(f"Error cancelling job: {e}")
+    
+    def _handle_create_retry_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle retry job creation."""
+        job_id = params.get('job_id')
+        if not job_id:
+            raise RequestError("Missing job_id parameter")
+        
+        try:
+            return {'job': self.server.queue_manager.create_retry_job(job_id)}
+        except Exception as e:
+            logging.exception(f"Error creating retry job: {e}")
+            raise RequestError(f"Error creating retry job: {e}")
     
-    def _handle_get_job_logs(self, params: Dict[str, Any]):
+    def _handle_get_job_logs(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get job logs request."""
+        job_id = params.get('job_id')
+        if not job_id:
+            raise RequestError("Missing job_id parameter")
+        
         try:
-            job_id = params.get('job_id')
-            if not job_id:
-                self._send_error("Missing job_id parameter")
-                return
-            
-            logs = self.queue_manager.get_job_logs(job_id)
-            self._send_response({'logs': logs})
+            return {'logs': self.server.queue_manager.get_job_logs(job_id)}
+        except Exception as e:
+            logging.exception(f"Error getting job logs: {e}")
+            raise RequestError(f"Error getting job logs: {e}")
+    
+    def _stream_job_logs(self, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Handle a streaming job logs request."""
+        job_id = params.get('job_id')
+        if not job_id:
+            raise RequestError("Missing job_id parameter")
+        
+        try:
+            yield from self.server.queue_manager.iter_job_log_pages(
+                job_id,
+                offset=params.get('offset', 0),
+                tail=params.get('tail')
+            )
         except Exception as e:
             logging.exception(f"Error getting job logs: {e}")
-            self._send_error(f"Error getting job logs: {e}")
+            raise RequestError(f"Error getting job logs: {e}")
+    
+    # Request action name -> handler method
+    _ACTIONS = {
+        'submit_job': _handle_submit_job,
+        'get_status': _handle_get_status,
+        'get_jobs': _handle_get_jobs,
+        'get_job': _handle_get_job,
+        'cancel_job': _handle_cancel_job,
+        'create_retry_job': _handle_create_retry_job,
+        'get_job_logs': _handle_get_job_logs,
+    }
+    
+    # Actions answered with a sequence of messages rather than one
+    _STREAM_ACTIONS = {
+        'get_job_logs_stream': _stream_job_logs,
+    }
+
+
+class _DrainingMixIn:
+    """Tracks open connections so shutdown can let their requests finish."""
+    
+    def __init__(self, *args, **kwargs):
+        self._connections = set()
+        self._connections_changed = threading.Condition()
+        self._draining = False
+        super().__init__(*args, **kwargs)
+    
+    def track_connection(self, sock: socket.socket, is_open: bool):
+        """Record a connection being opened or closed by its handler.
+        
+        A connection opened once draining has started, such as one accepted
+        just before shutdown, has reading shut down straight away, so its
+        handler ends instead of waiting for a request.
+        """
+        with self._connections_changed:
+            if is_open:
+                self._connections.add(sock)
+                if self._draining:
+                    self._shutdown_read(sock)
+            else:
+                self._connections.discard(sock)
+                self._connections_changed.notify_all()
+    
+    def drain(self, timeout: float) -> bool:
+        """Wait for the open connections to finish their current request.
+        
+        Reading is shut down on every connection, so a handler waiting for
+        its next request sees the client close, while one still working on
+        a request can send its response before it does.
+        
+        Args:
+            timeout: Most seconds to wait
+            
+        Returns:
+            True if every connection finished in time
+        """
+        with self._connections_changed:
+            self._draining = True
+            for sock in self._connections:
+                self._shutdown_read(sock)
+            return self._connections_changed.wait_for(lambda: not self._connections, timeout)
+    
+    @staticmethod
+    def _shutdown_read(sock: socket.socket):
+        """Shut down reading on a connection, ignoring one already closed."""
+        try:
+            sock.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
 
 
-class ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+class ThreadedTCPServer(_DrainingMixIn, socketserver.ThreadingMixIn, socketserver.TCPServer):
     """Threaded TCP server for handling multiple connections."""
     allow_reuse_address = True
     daemon_threads = True
+    # Accept backlog; the default of 5 drops connections in bursts
+    request_queue_size = 128
+    
+    # Let several listeners bind the same port (see TCP_LISTENER_COUNT)
+    reuse_port = False
+    
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
 
 
-class ThreadedUnixStreamServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+class ThreadedUnixStreamServer(_DrainingMixIn, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
     """Threaded Unix socket server for handling multiple connections."""
     allow_reuse_address = True
     daemon_threads = True
+    request_queue_size = 128
 
 
 def start_socket_server():
-    """Start the socket server for handling client requests."""
-    global _server_instance
+    """Start the socket server for handling client requests.
+    
+    A TCP server runs TCP_LISTENER_COUNT listeners on the same port, each
+    accepting connections on its own thread.
+    """
+    global _server_instances
     
     try:
         if config.USE_UNIX_SOCKET:
@@ -235,23 +384,50 @@ def start_socket_server():
                 os.unlink(config.SERVER_SOCKET_PATH)
             
             # Create Unix socket server
-            _server_instance = ThreadedUnixStreamServer(
+            servers = [ThreadedUnixStreamServer(
                 config.SERVER_SOCKET_PATH, 
                 SpackJobHandler
-            )
+            )]
             logging.info(f"Starting Unix socket server on {config.SERVER_SOCKET_PATH}")
         else:
-            # Create TCP server
-            _server_instance = ThreadedTCPServer(
-                (config.SERVER_HOST, config.SERVER_PORT),
-                SpackJobHandler
+            # Create TCP servers; later listeners bind the port the first
+            # one got, which matters when the configured port is 0
+            servers = []
+            address = (config.SERVER_HOST, config.SERVER_PORT)
+            try:
+                for _ in range(TCP_LISTENER_COUNT):
+                    server = ThreadedTCPServer(address, SpackJobHandler, bind_and_activate=False)
+                    server.reuse_port = TCP_LISTENER_COUNT > 1
+                    servers.append(server)
+                    server.server_bind()
+                    server.server_activate()
+                    address = server.server_address
+            except BaseException:
+                for server in servers:
+                    server.server_close()
+                raise
+            logging.info(
+                f"Starting TCP server on {config.SERVER_HOST}:{address[1]} "
+                f"with {len(servers)} listener(s)"
             )
-            logging.info(f"Starting TCP server on {config.SERVER_HOST}:{config.SERVER_PORT}")
         
-        # Start server in a separate thread
-        server_thread = threading.Thread(target=_server_instance.serve_forever)
-        server_thread.daemon = True
-        server_thread.start()
+        # All connections share one queue manager, so its read caches stay
+        # warm across requests; its cache entries are replaced whole, which
+        # keeps them consistent under concurrent handler threads
+        queue_manager = QueueManager()
+        for server in servers:
+            server.queue_manager = queue_manager
+        
+        # Start each server in a separate thread. Several TCP listeners are
+        # spread over the CPUs the daemon may use, one each; on Linux the
+        # handler threads a listener starts inherit its CPU.
+        cpus = _allowed_cpus() if len(servers) > 1 else []
+        for index, server in enumerate(servers):
+            cpu = cpus[index % len(cpus)] if cpus else None
+            server_thread = threading.Thread(target=_serve_on_cpu, args=(server, cpu))
+            server_thread.daemon = True
+            server_thread.start()
+        _server_instances = servers
         
         logging.info("Socket server started successfully")
         return True
@@ -261,21 +437,56 @@ def start_socket_server():
         return False
 
 
+def _allowed_cpus() -> list:
+    """Return the CPUs this process may run on, or [] if that is unknown."""
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except OSError:
+        return []
+
+
+def _serve_on_cpu(server: socketserver.BaseServer, cpu: Optional[int]):
+    """Pin the calling thread to ``cpu``, if given, then run the server.
+    
+    Keeping a listener and the handlers it starts on one CPU keeps the
+    connection's data in that CPU's caches. Pinning is best effort.
+    """
+    if cpu is not None:
+        try:
+            # On Linux, pid 0 applies the mask to the calling thread only
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            logging.warning(f"Could not pin socket listener to CPU {cpu}: {e}")
+    server.serve_forever()
+
+
 def stop_socket_server():
-    """Stop the socket server."""
-    global _server_instance
+    """Stop the socket server.
+    
+    New connections are refused first; requests already being handled
+    get up to SHUTDOWN_DRAIN_TIMEOUT seconds to be answered, so they are
+    not cut off halfway through a database write.
+    """
+    global _server_instances
     
-    if _server_instance:
+    if _server_instances:
         try:
             logging.info("Shutting down socket server...")
-            _server_instance.shutdown()
-            _server_instance.server_close()
+            for server in _server_instances:
+                server.shutdown()
+            deadline = time.monotonic() + SHUTDOWN_DRAIN_TIMEOUT
+            for server in _server_instances:
+                if not server.drain(max(deadline - time.monotonic(), 0.0)):
+                    logging.warning("Socket server stopped with requests still in progress")
+                server.server_close()
             
             # Clean up Unix socket file
             if config.USE_UNIX_SOCKET and os.path.exists(config.SERVER_SOCKET_PATH):
                 os.unlink(config.SERVER_SOCKET_PATH)
             
-            _server_instance = None
+            _server_instances = []
             logging.info("Socket server stopped successfully")
             return True
         except Exception as e:
@@ -285,7 +496,11 @@ def stop_socket_server():
 
 
 def daemonize():
-    """Properly daemonize the process."""
+    """Properly daemonize the process.
+    
+    Not needed under systemd, which starts the daemon in the foreground
+    and is told it is ready through notify_systemd().
+    """
     try:
         # First fork
         pid = os.fork()
@@ -316,11 +531,38 @@ def daemonize():
     sys.stderr.flush()
     
     # Redirect stdin, stdout, stderr to /dev/null
-    with open('/dev/null', 'r') as f:
-        os.dup2(f.fileno(), sys.stdin.fileno())
-    with open('/dev/null', 'w') as f:
-        os.dup2(f.fileno(), sys.stdout.fileno())
-        os.dup2(f.fileno(), sys.stderr.fileno())
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for stream in (sys.stdin, sys.stdout, sys.stderr):
+        os.dup2(devnull, stream.fileno())
+    os.close(devnull)
+
+
+def notify_systemd(state: str) -> bool:
+    """Send a status update to systemd, as sd_notify(3) does.
+    
+    Services of ``Type=notify`` report ``READY=1`` once they accept
+    requests. Outside systemd, NOTIFY_SOCKET is unset and this does nothing.
+    
+    Args:
+        state: Newline-separated assignments, e.g. "READY=1"
+        
+    Returns:
+        True if the message was sent
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        # Abstract namespace socket
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode())
+    except OSError as e:
+        logging.warning(f"Could not notify systemd: {e}")
+        return False
+    return True
 
 
 def start_worker_server(args=None):
@@ -335,6 +577,9 @@ def start_worker_server(args=None):
             log_level=getattr(args, 'log_level', 'INFO'),
             log_file=getattr(args, 'log_file', None)
         )
+    elif os.environ.get("NOTIFY_SOCKET"):
+        # Started in the foreground by systemd; log to the journal
+        setup_logging(log_level=getattr(args, 'log_level', 'INFO') if args else 'INFO')
     
     logging.info("Starting Spack Installer Worker Server...")
     
@@ -364,6 +609,9 @@ def start_worker_server(args=None):
         else:
             logging.info(f"Server address: {config.SERVER_HOST}:{config.SERVER_PORT}")
         
+        # Requests are being served and the worker is about to run
+        notify_systemd("READY=1")
+        
         # Start the worker
         _worker_instance.start()
         
@@ -372,6 +620,7 @@ def start_worker_server(args=None):
     except Exception as e:
         logging.exception(f"Worker error: {e}")
     finally:
+        notify_systemd("STOPPING=1")
         stop_socket_server()
         logging.info("Worker server stopped")
 
@@ -405,9 +654,16 @@ def setup_logging(log_level: str = "INFO", log_file: str = None):
             print(f"Warning: Cannot write to log file: {log_file}")
 
 
-def ensure_system_database():
-    """Ensure system database directory exists with proper permissions."""
-    db_path = config.get_multi_user_database_path()
+def ensure_system_database() -> str:
+    """Ensure system database directory exists with proper permissions.
+    
+    With the SQLite backend the database is created in WAL mode, importing
+    the jobs of an existing JSON database on first run.
+    
+    Returns:
+        Path of the database file
+    """
+    db_path = config.MULTI_USER_DATABASE_PATH
     db_dir = os.path.dirname(db_path)
     
     # Create directory if it doesn't exist
@@ -420,12 +676,15 @@ def ensure_system_database():
             print("Please run this script with appropriate permissions or manually create the directory:")
             sys.exit(1)
     
+    if config.get_database_type() == "sqlite":
+        return _ensure_sqlite_database(db_path)
+    
     # Ensure database file has proper permissions
     if not os.path.exists(db_path):
         try:
             # Create empty database file
             with open(db_path, 'w') as f:
-                f.write('{"jobs": [], "logs": [], "worker_status": null, "next_job_id": 1}')
+                f.write('{"jobs": [], "worker_status": null, "next_job_id": 1}')
             # Set permissions so all users can read/write
             os.chmod(db_path, 0o666)
             print(f"Created system database file: {db_path}")
@@ -433,6 +692,23 @@ def ensure_system_database():
             print(f"Error: Cannot create database file: {db_path}")
             print("Please ensure the directory has write permissions for this user")
             sys.exit(1)
+    return db_path
+
+
+def _ensure_sqlite_database(json_path: str) -> str:
+    """Create the SQLite system database next to ``json_path`` if needed."""
+    db_path = sqlite_path_for(json_path)
+    if not os.path.exists(db_path):
+        try:
+            open_sqlite_database(json_path)
+            # Set permissions so all users can read/write
+            os.chmod(db_path, 0o666)
+            print(f"Created system database file: {db_path}")
+        except (PermissionError, sqlite3.OperationalError) as e:
+            print(f"Error: Cannot create database file: {db_path} ({e})")
+            print("Please ensure the directory has write permissions for this user")
+            sys.exit(1)
+    return db_path
 
 
 def main():
@@ -486,23 +762,22 @@ def main():
     
     # Check Spack configuration
     if config.validate_spack_setup():
-        print(f"✓ Spack setup script found: {config.get_spack_setup_script()}")
+        print(f"✓ Spack setup script found: {config.SPACK_SETUP_SCRIPT}")
     else:
-        print(f"✗ Spack setup script not found: {config.get_spack_setup_script()}")
+        print(f"✗ Spack setup script not found: {config.SPACK_SETUP_SCRIPT}")
         print("  Please set SPACK_SETUP_SCRIPT environment variable")
         if not args.validate_setup:
             print("  Warning: Worker will skip spack commands if setup script is missing")
     
     # Ensure system database setup
     try:
-        ensure_system_database()
-        print(f"✓ System database ready: {config.get_multi_user_database_path()}")
+        db_path = ensure_system_database()
+        print(f"✓ System database ready: {db_path}")
     except Exception as e:
         print(f"✗ Database setup failed: {e}")
         sys.exit(1)
     
     # Check permissions
-    db_path = config.get_multi_user_database_path()
     if os.access(db_path, os.R_OK | os.W_OK):
         print("✓ Database file is readable and writable")
     else:
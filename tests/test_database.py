@@ -0,0 +1,31 @@
+"""Tests for the JSON database and its import into SQLite."""
+
+import json
+from datetime import datetime, timedelta
+
+from spack_installer.database import JSONDatabase, open_sqlite_database
+from spack_installer.enums import JobPriority, JobStatus
+
+
+def test_sqlite_import_after_cleanup_dropped_last_log(tmp_path):
+    json_path = str(tmp_path / "jobs.json")
+    db = JSONDatabase(json_path)
+    kept = db.create_job("zlib", JobPriority.HIGH, 1.0, "user")
+    dropped = db.create_job("cmake", JobPriority.LOW, 1.0, "user")
+    db.add_job_log(kept["id"], "INFO", "queued")
+    db.add_job_log(dropped["id"], "INFO", "done")
+    db.update_job_status(
+        dropped["id"],
+        JobStatus.COMPLETED,
+        completed_at=datetime.now() - timedelta(days=30)
+    )
+    assert db.cleanup_old_jobs(7) == 1
+    
+    # The dropped job owned the last entry, so an id marker replaced it
+    with open(db.log_path) as f:
+        last = json.loads(f.readlines()[-1])
+    assert last["job_id"] is None
+    
+    sqlite_db = open_sqlite_database(json_path)
+    assert [job["id"] for job in sqlite_db.get_all_jobs()] == [kept["id"]]
+    assert sqlite_db.get_job_logs(kept["id"]) == db.get_job_logs(kept["id"])
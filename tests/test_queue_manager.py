@@ -0,0 +1,52 @@
+"""Tests for the queue manager's cached reads."""
+
+import threading
+
+import pytest
+
+from spack_installer.config import config
+from spack_installer.database import reset_db_manager
+from spack_installer.enums import JobPriority
+from spack_installer.queue_manager import QueueManager
+
+
+@pytest.fixture
+def queue_manager(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPACK_INSTALLER_DB_TYPE", "json")
+    monkeypatch.setenv("SPACK_INSTALLER_DB_PATH", str(tmp_path / "jobs.json"))
+    config.reload()
+    reset_db_manager()
+    yield QueueManager()
+    reset_db_manager()
+    monkeypatch.undo()
+    config.reload()
+
+
+def test_status_read_during_write_does_not_hide_it(queue_manager):
+    db = queue_manager.db
+    assert queue_manager.get_queue_status()["total_pending"] == 0
+    
+    # Hold the write between its persist and the publish of its data
+    persisting = threading.Event()
+    release = threading.Event()
+    persist = db._persist
+    
+    def paused_persist(*args):
+        persisting.set()
+        release.wait(10)
+        persist(*args)
+    
+    db._persist = paused_persist
+    writer = threading.Thread(
+        target=db.create_job, args=("zlib", JobPriority.HIGH, 1.0, "user")
+    )
+    writer.start()
+    try:
+        assert persisting.wait(10)
+        # A read racing the write caches the data from before it
+        assert queue_manager.get_queue_status()["total_pending"] == 0
+    finally:
+        release.set()
+        writer.join(10)
+    
+    assert queue_manager.get_queue_status()["total_pending"] == 1